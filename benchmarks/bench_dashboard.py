@@ -0,0 +1,293 @@
+"""Benchmark das páginas do dashboard executadas sem navegador (Streamlit AppTest).
+
+Gera um banco SQLite sintético no formato produzido pelo ETL, executa as páginas
+com combinações representativas de filtros e registra, por cenário: tempo da
+primeira carga (cache vazio), latência de cada rerun, pico de memória alocada
+e tamanho do conteúdo enviado ao navegador.
+
+Uso: python -m benchmarks.bench_dashboard --escalas 1 10 --repeticoes 3
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+import psutil
+from sqlalchemy import create_engine
+
+from benchmarks.dados_sinteticos import gerar_dados
+from etl.anomalias import calcular_anomalias
+from etl.carga import registrar_versao_dados
+from etl.fornecedores import criar_dimensao_fornecedores
+from etl.series import calcular_series_mensais
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASTA_DASHBOARD = os.path.join(RAIZ, "dashboard")
+
+
+def gerar_banco(caminho, deputados, despesas_por_deputado, semente=0):
+    """Cria um banco SQLite com as mesmas tabelas e view que o ETL grava."""
+    dados = gerar_dados(deputados=deputados, despesas_por_deputado=despesas_por_deputado, semente=semente)
+
+    df_deputados = pd.DataFrame(dados["deputados"])
+    detalhes = list(dados["detalhes"].values())
+    df_detalhado = pd.DataFrame([
+        {chave: valor for chave, valor in detalhe.items() if chave not in ("ultimoStatus", "redeSocial", "urlWebsite")}
+        for detalhe in detalhes
+    ])
+    df_status = pd.DataFrame([
+        dict({chave: valor for chave, valor in detalhe["ultimoStatus"].items() if chave != "gabinete"}, id_deputado=detalhe["id"])
+        for detalhe in detalhes
+    ])
+    df_gabinete = pd.DataFrame([
+        dict(detalhe["ultimoStatus"]["gabinete"], id_deputado=detalhe["id"])
+        for detalhe in detalhes
+    ])
+    df_gastos = pd.DataFrame([
+        dict(despesa, id_deputado=id_deputado)
+        for id_deputado, despesas in dados["despesas"].items()
+        for despesa in despesas
+    ])
+    df_fornecedores, df_gastos, df_totais = criar_dimensao_fornecedores(df_gastos)
+
+    # Mesmas colunas da view deputados_completo usada pelo dashboard
+    df_completo = (df_deputados[["id", "nome", "siglaPartido", "siglaUf", "urlFoto"]]
+                   .rename(columns={"nome": "nomeCampanha"})
+                   .merge(df_detalhado[["id", "nomeCivil", "cpf", "sexo", "dataNascimento", "dataFalecimento",
+                                        "ufNascimento", "municipioNascimento", "escolaridade"]], on="id")
+                   .merge(df_status[["id_deputado", "siglaPartido", "situacao", "condicaoEleitoral", "data"]]
+                          .rename(columns={"siglaPartido": "ultimoPartido", "data": "ultimoStatus"}),
+                          left_on="id", right_on="id_deputado")
+                   .merge(df_gabinete[["id_deputado", "predio", "sala", "andar", "telefone", "email"]]
+                          .rename(columns={"predio": "Prédio", "sala": "Sala", "andar": "Andar",
+                                           "telefone": "Telefone", "email": "Email"}),
+                          on="id_deputado")
+                   .drop(columns=["id_deputado"]))
+
+    engine = create_engine(f"sqlite:///{caminho}")
+    for nome, df in list(calcular_anomalias(df_gastos).items()) + [
+        ("deputados", df_deputados),
+        ("deputados_detalhado", df_detalhado),
+        ("deputados_ultimo_status", df_status),
+        ("deputados_ultimo_gabinete", df_gabinete),
+        ("deputados_despesas", df_gastos),
+        ("dim_fornecedores", df_fornecedores),
+        ("fornecedores_totais", df_totais),
+        ("series_mensais", calcular_series_mensais(df_gastos, df_deputados)),
+        ("deputados_completo", df_completo),
+    ]:
+        df.to_sql(name=nome, con=engine, if_exists="replace", index=False, chunksize=50000)
+    registrar_versao_dados(engine, ["sintetico"])
+    engine.dispose()
+    return len(df_gastos)
+
+def _widget(at, tipo, rotulo):
+    widget = next((widget for widget in getattr(at, tipo) if widget.label == rotulo), None)
+    if widget is None:
+        raise LookupError(f"Widget '{rotulo}' não encontrado na página")
+    return widget
+
+def _opcao(widget, posicao):
+    # Os filtros da página de despesas exibem a quantidade de despesas de cada opção: "MDB (1,234)"
+    return re.sub(r" \([\d,]+\)$", "", widget.options[posicao])
+
+# Combinações representativas de filtros da página de despesas
+def _filtro_partido(at):
+    widget = _widget(at, "selectbox", "Escolha um partido")
+    widget.set_value(_opcao(widget, 1))
+
+def _filtro_mes(at):
+    _widget(at, "selectbox", "Escolha um mês").set_value("Março")
+
+def _filtro_deputado(at):
+    widget = _widget(at, "selectbox", "Escolha um deputado")
+    widget.set_value(_opcao(widget, 1))
+
+def _filtro_tipo(at):
+    widget = _widget(at, "multiselect", "Selecione tipo(s) de despesa")
+    widget.set_value([_opcao(widget, 0)])
+
+def _filtro_valor(at):
+    _widget(at, "slider", "Filtrar por valor (R$)").set_value((100.0, 5000.0))
+
+def _filtro_combinado(at):
+    _filtro_partido(at)
+    _filtro_mes(at)
+    _filtro_tipo(at)
+
+def _ordenar_tipo(at):
+    _widget(at, "selectbox", "Ordenar por").set_value("tipoDespesa")
+
+def _deputado_detalhe(at):
+    widget = _widget(at, "selectbox", "Escolha um deputado para visualizar mais sobre ele")
+    widget.set_value(widget.options[-1])
+
+def _anomalias_tipo(at):
+    widget = _widget(at, "selectbox", "Tipo de despesa")
+    widget.set_value(widget.options[1])
+
+PAGINAS = {
+    "despesas": ("4_*_Despesas.py", [
+        ("partido", _filtro_partido),
+        ("mes", _filtro_mes),
+        ("deputado", _filtro_deputado),
+        ("tipo_despesa", _filtro_tipo),
+        ("valor", _filtro_valor),
+        ("partido_mes_tipo", _filtro_combinado),
+        ("ordenar_tipo", _ordenar_tipo),
+    ]),
+    "deputados": ("5_*_Deputados.py", [
+        ("deputado", _deputado_detalhe),
+    ]),
+    "anomalias": ("6_*_Anomalias.py", [
+        ("partido", _filtro_partido),
+        ("tipo_despesa", _anomalias_tipo),
+    ]),
+}
+
+def tamanho_conteudo(no):
+    """Soma o tamanho serializado (protobuf) de todos os elementos da página."""
+    total = 0
+    proto = getattr(no, "proto", None)
+    if proto is not None and hasattr(proto, "ByteSize"):
+        total += proto.ByteSize()
+    for filho in getattr(no, "children", {}).values():
+        total += tamanho_conteudo(filho)
+    return total
+
+def executar_medindo(at):
+    """Executa a página uma vez e devolve tempo, pico de memória alocada e tamanho do conteúdo."""
+    tracemalloc.reset_peak()
+    inicio = time.perf_counter()
+    at.run()
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    return {
+        "tempo_s": duracao,
+        "pico_memoria_mb": pico / 1024 ** 2,
+        "conteudo_kb": tamanho_conteudo(at._tree) / 1024,
+        "erros": [str(excecao.value) for excecao in at.exception]
+    }
+
+def _resumir(medicoes):
+    return {
+        "tempo_s": round(statistics.median(m["tempo_s"] for m in medicoes), 4),
+        "tempo_max_s": round(max(m["tempo_s"] for m in medicoes), 4),
+        "pico_memoria_mb": round(max(m["pico_memoria_mb"] for m in medicoes), 1),
+        "conteudo_kb": round(statistics.median(m["conteudo_kb"] for m in medicoes), 1),
+        "erros": sorted({erro for m in medicoes for erro in m["erros"]})
+    }
+
+def medir_pagina(arquivo, cenarios, repeticoes, timeout):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    resultado = {"carga_fria": [], "cenarios": {}}
+    for _ in range(repeticoes):
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        at = AppTest.from_file(arquivo, default_timeout=timeout)
+        resultado["carga_fria"].append(executar_medindo(at))
+
+    # Reruns com o cache já aquecido, partindo sempre da página sem filtros
+    for nome, aplicar in [("sem_filtros", None)] + cenarios:
+        medicoes = []
+        for _ in range(repeticoes):
+            at = AppTest.from_file(arquivo, default_timeout=timeout)
+            at.run()
+            if aplicar is not None:
+                if at.exception:
+                    # Página quebrou antes de exibir os filtros; o erro já aparece na carga fria
+                    break
+                aplicar(at)
+            medicoes.append(executar_medindo(at))
+        if medicoes:
+            resultado["cenarios"][nome] = _resumir(medicoes)
+
+    resultado["carga_fria"] = _resumir(resultado["carga_fria"])
+    return resultado
+
+def comparar(relatorio, base, tolerancia):
+    """Lista os cenários cujo tempo piorou mais que a tolerância em relação ao relatório base."""
+    regressoes = []
+    for escala, paginas in relatorio["escalas"].items():
+        for pagina, medidas in paginas.items():
+            anterior = base.get("escalas", {}).get(escala, {}).get(pagina)
+            if not anterior or "carga_fria" not in medidas:
+                continue
+            pares = [("carga_fria", medidas["carga_fria"], anterior.get("carga_fria"))]
+            pares += [(nome, atual, anterior.get("cenarios", {}).get(nome)) for nome, atual in medidas["cenarios"].items()]
+            for nome, atual, antes in pares:
+                if antes and atual["tempo_s"] > antes["tempo_s"] * (1 + tolerancia):
+                    regressoes.append(f"escala {escala} / {pagina} / {nome}: {antes['tempo_s']}s -> {atual['tempo_s']}s")
+    return regressoes
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das páginas do dashboard")
+    parser.add_argument("--paginas", nargs="+", default=list(PAGINAS), choices=list(PAGINAS))
+    parser.add_argument("--deputados", type=int, default=513, help="Deputados na escala 1")
+    parser.add_argument("--despesas-por-deputado", type=int, default=400, help="Despesas por deputado na escala 1")
+    parser.add_argument("--escalas", type=float, nargs="+", default=[1.0], help="Multiplicadores do volume de despesas")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=600, help="Tempo máximo de cada execução da página, em segundos")
+    parser.add_argument("--pasta", default=os.path.join(tempfile.gettempdir(), "bench_dashboard"),
+                        help="Pasta dos bancos sintéticos (reaproveitados entre execuções)")
+    parser.add_argument("--compartilhado", action="store_true",
+                        help="Mede as páginas no modo de snapshot compartilhado (SNAPSHOT_COMPARTILHADO_ENV=1)")
+    parser.add_argument("--saida", help="Arquivo JSON onde o relatório será salvo")
+    parser.add_argument("--comparar", help="Relatório JSON anterior para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Piora relativa aceita na comparação")
+    args = parser.parse_args()
+
+    os.makedirs(args.pasta, exist_ok=True)
+    # Snapshot do dashboard junto dos bancos sintéticos (a carga fria passa a medir a leitura do snapshot)
+    os.environ.setdefault("SNAPSHOT_PATH_ENV", os.path.join(args.pasta, "snapshot"))
+    if args.compartilhado:
+        # Definida antes de as páginas importarem o módulo snapshot
+        os.environ["SNAPSHOT_COMPARTILHADO_ENV"] = "1"
+    os.chdir(PASTA_DASHBOARD)
+    sys.path.insert(0, PASTA_DASHBOARD)
+    tracemalloc.start()
+
+    relatorio = {"escalas": {}}
+    for escala in args.escalas:
+        despesas_por_deputado = int(args.despesas_por_deputado * escala)
+        caminho = os.path.join(args.pasta, f"dashboard_{args.deputados}_{despesas_por_deputado}.db")
+        if not os.path.exists(caminho):
+            print(f"Gerando banco sintético {caminho}...", file=sys.stderr)
+            gerar_banco(caminho, args.deputados, despesas_por_deputado)
+        os.environ["DB_URL_ENV"] = f"sqlite:///{caminho}"
+
+        medidas = {}
+        for pagina in args.paginas:
+            padrao, cenarios = PAGINAS[pagina]
+            arquivo = glob.glob(os.path.join(PASTA_DASHBOARD, "pages", padrao))[0]
+            print(f"Escala {escala}: medindo página {pagina}...", file=sys.stderr)
+            try:
+                medidas[pagina] = medir_pagina(arquivo, cenarios, args.repeticoes, args.timeout)
+            except Exception as e:
+                medidas[pagina] = {"erro": f"{type(e).__name__}: {e}"}
+        medidas["rss_processo_mb"] = round(psutil.Process().memory_info().rss / 1024 ** 2, 1)
+        relatorio["escalas"][str(escala)] = medidas
+
+    print(json.dumps(relatorio, indent=2, ensure_ascii=False))
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            regressoes = comparar(relatorio, json.load(arquivo), args.tolerancia)
+        if regressoes:
+            print("Regressões encontradas:\n" + "\n".join(regressoes), file=sys.stderr)
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
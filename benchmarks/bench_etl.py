@@ -0,0 +1,195 @@
+"""Benchmark offline do ETL contra o servidor local de fixtures.
+
+Executa o ETL em um subprocesso apontando para o servidor local e para um
+banco SQLite descartável, e reporta por etapa: requisições/s, linhas/s,
+bytes baixados e o pico de memória (RSS) do processo.
+
+Uso: python -m benchmarks.bench_etl --sintetico --escala 0.5 --latencia 0.01
+"""
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import psutil
+
+from benchmarks.dados_sinteticos import gerar_dados
+from benchmarks.servidor_api import ServidorApi, carregar_fixtures
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Etapas do ETL na ordem em que acontecem, com a rota da API e a tabela que produzem
+ETAPAS = [
+    ("deputados", "deputados", "deputados"),
+    ("detalhes", "detalhes", "deputados_detalhado"),
+    ("despesas", "despesas", "deputados_despesas"),
+]
+
+def comando_etl(paralelo=1):
+    """Comando usado para executar o ETL completo."""
+    return [sys.executable, "-m", "etl", "todos", "--paralelo", str(paralelo)]
+
+def medir_pico_rss(processo, resultado, intervalo=0.05):
+    """Acompanha o RSS do processo (e filhos) até ele terminar, guardando o maior valor."""
+    pico = 0
+    try:
+        monitorado = psutil.Process(processo.pid)
+        while processo.poll() is None:
+            try:
+                rss = monitorado.memory_info().rss
+                rss += sum(filho.memory_info().rss for filho in monitorado.children(recursive=True))
+                pico = max(pico, rss)
+            except psutil.Error:
+                pass
+            time.sleep(intervalo)
+    except psutil.NoSuchProcess:
+        pass
+    resultado["pico_rss"] = pico
+
+def contar_linhas(caminho_banco, tabela):
+    try:
+        with sqlite3.connect(caminho_banco) as conexao:
+            return conexao.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+    except sqlite3.Error:
+        return 0
+
+def resumir_etapas(registros, fim_processo, caminho_banco):
+    """Monta as métricas por etapa a partir do registro de requisições do servidor."""
+    inicios = {}
+    for registro in registros:
+        inicios[registro["rota"]] = min(inicios.get(registro["rota"], registro["inicio"]), registro["inicio"])
+
+    etapas = {}
+    ordem = [etapa for etapa in ETAPAS if etapa[1] in inicios]
+    for posicao, (nome, rota, tabela) in enumerate(ordem):
+        inicio = inicios[rota]
+        fim = inicios[ordem[posicao + 1][1]] if posicao + 1 < len(ordem) else fim_processo
+        da_rota = [registro for registro in registros if registro["rota"] == rota]
+        duracao = max(fim - inicio, 1e-9)
+        linhas = contar_linhas(caminho_banco, tabela)
+        etapas[nome] = {
+            "duracao_s": round(duracao, 4),
+            "requisicoes": len(da_rota),
+            "erros": sum(1 for registro in da_rota if registro["status"] >= 400),
+            "bytes": sum(registro["bytes"] for registro in da_rota),
+            "requisicoes_por_s": round(len(da_rota) / duracao, 2),
+            "linhas": linhas,
+            "linhas_por_s": round(linhas / duracao, 2)
+        }
+    return etapas
+
+def executar(dados, latencia=0.0, taxa_erro=0.0, semente=0, pasta=None, paralelo=1):
+    """Executa o ETL uma vez contra o servidor local e devolve o relatório."""
+    pasta = pasta or tempfile.mkdtemp(prefix="bench_etl_")
+    caminho_banco = os.path.join(pasta, "database.db")
+
+    with ServidorApi(dados, latencia=latencia, taxa_erro=taxa_erro, semente=semente) as servidor:
+        ambiente = dict(
+            os.environ,
+            PYTHONPATH=os.pathsep.join(filter(None, [RAIZ, os.environ.get("PYTHONPATH")])),
+            API_URL_ENV=servidor.url_base,
+            DB_URL_ENV=f"sqlite:///{caminho_banco}",
+            PATH_LOGS=os.path.join(pasta, "logs")
+        )
+
+        inicio = time.time()
+        with open(os.path.join(pasta, "etl.out"), "w", encoding="utf-8") as saida:
+            processo = subprocess.Popen(comando_etl(paralelo), cwd=pasta, env=ambiente, stdout=saida, stderr=subprocess.STDOUT)
+            memoria = {}
+            monitor = threading.Thread(target=medir_pico_rss, args=(processo, memoria))
+            monitor.start()
+            codigo = processo.wait()
+            monitor.join()
+        fim = time.time()
+        registros = list(servidor.registros)
+
+    etapas = resumir_etapas(registros, fim, caminho_banco)
+
+    # Relatório de métricas gravado pelo próprio ETL (tempos por fase, retentativas, latências)
+    metricas_etl = {}
+    caminho_metricas = os.path.join(pasta, "logs", "metricas_etl.json")
+    if os.path.exists(caminho_metricas):
+        with open(caminho_metricas, encoding="utf-8") as arquivo:
+            metricas_etl = json.load(arquivo)
+    etapas_api = [nome for nome, _, _ in ETAPAS if nome in etapas]
+    inicio_escrita = max((registro["fim"] for registro in registros), default=inicio)
+
+    return {
+        "codigo_saida": codigo,
+        "tempo_total_s": round(fim - inicio, 4),
+        "escrita_final_s": round(fim - inicio_escrita, 4),
+        "pico_rss_mb": round(memoria.get("pico_rss", 0) / 1024 ** 2, 1),
+        "requisicoes": len(registros),
+        "bytes": sum(registro["bytes"] for registro in registros),
+        "etapas": {nome: etapas[nome] for nome in etapas_api},
+        "metricas_etl": metricas_etl,
+        "pasta": pasta
+    }
+
+def comparar(relatorio, base, tolerancia):
+    """Lista as métricas que pioraram mais que a tolerância em relação ao relatório base."""
+    regressoes = []
+    for nome, etapa in relatorio["etapas"].items():
+        anterior = base.get("etapas", {}).get(nome)
+        if anterior and etapa["duracao_s"] > anterior["duracao_s"] * (1 + tolerancia):
+            regressoes.append(f"{nome}: {anterior['duracao_s']}s -> {etapa['duracao_s']}s")
+    if base.get("pico_rss_mb") and relatorio["pico_rss_mb"] > base["pico_rss_mb"] * (1 + tolerancia):
+        regressoes.append(f"pico_rss_mb: {base['pico_rss_mb']} -> {relatorio['pico_rss_mb']}")
+    return regressoes
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline do ETL")
+    parser.add_argument("--sintetico", action="store_true", help="Usar dados sintéticos em vez das fixtures gravadas")
+    parser.add_argument("--deputados", type=int, default=100)
+    parser.add_argument("--despesas-por-deputado", type=int, default=250)
+    parser.add_argument("--escala", type=float, default=1.0, help="Multiplica o volume dos dados sintéticos")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Atraso por requisição, em segundos")
+    parser.add_argument("--taxa-erro", type=float, default=0.0, help="Fração das requisições que respondem 503")
+    parser.add_argument("--paralelo", type=int, default=1, help="Requisições simultâneas do ETL por etapa")
+    parser.add_argument("--semente", type=int, default=0, help="Semente dos dados sintéticos e da injeção de erros")
+    parser.add_argument("--saida", help="Arquivo JSON onde o relatório será salvo")
+    parser.add_argument("--comparar", help="Relatório JSON anterior para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Piora relativa aceita na comparação")
+    args = parser.parse_args()
+
+    if args.sintetico:
+        dados = gerar_dados(
+            deputados=int(args.deputados * args.escala),
+            despesas_por_deputado=int(args.despesas_por_deputado * args.escala),
+            semente=args.semente
+        )
+    else:
+        dados = carregar_fixtures()
+
+    relatorio = executar(dados, latencia=args.latencia, taxa_erro=args.taxa_erro, semente=args.semente, paralelo=args.paralelo)
+    relatorio["cenario"] = {
+        "sintetico": args.sintetico,
+        "deputados": len(dados["deputados"]),
+        "despesas": sum(len(lista) for lista in dados["despesas"].values()),
+        "latencia": args.latencia,
+        "taxa_erro": args.taxa_erro,
+        "paralelo": args.paralelo
+    }
+
+    print(json.dumps(relatorio, indent=2, ensure_ascii=False))
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            regressoes = comparar(relatorio, json.load(arquivo), args.tolerancia)
+        if regressoes:
+            print("Regressões encontradas:\n" + "\n".join(regressoes), file=sys.stderr)
+            sys.exit(1)
+
+    if relatorio["codigo_saida"] != 0:
+        sys.exit(relatorio["codigo_saida"])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Geração de dados sintéticos no formato da API de Dados Abertos da Câmara (v2)."""
+import random
+
+PARTIDOS = ["PT", "PL", "UNIÃO", "PP", "MDB", "PSD", "REPUBLICANOS", "PDT", "PSB", "PSDB", "PSOL", "NOVO", "PODE", "AVANTE", "PCdoB"]
+UFS = ["SP", "RJ", "MG", "BA", "RS", "PR", "PE", "CE", "PA", "MA", "SC", "GO", "PB", "ES", "AM"]
+ESCOLARIDADES = ["Superior", "Pós-Graduação", "Mestrado", "Doutorado", "Ensino Médio", "Superior Incompleto"]
+TIPOS_DESPESA = [
+    "MANUTENÇÃO DE ESCRITÓRIO DE APOIO À ATIVIDADE PARLAMENTAR",
+    "COMBUSTÍVEIS E LUBRIFICANTES.",
+    "PASSAGEM AÉREA - SIGEPA",
+    "DIVULGAÇÃO DA ATIVIDADE PARLAMENTAR.",
+    "TELEFONIA",
+    "LOCAÇÃO OU FRETAMENTO DE VEÍCULOS AUTOMOTORES",
+    "CONSULTORIAS, PESQUISAS E TRABALHOS TÉCNICOS.",
+    "HOSPEDAGEM ,EXCETO DO PARLAMENTAR NO DISTRITO FEDERAL.",
+    "SERVIÇOS POSTAIS",
+    "FORNECIMENTO DE ALIMENTAÇÃO DO PARLAMENTAR",
+]
+
+def _cnpj(numero):
+    return f"{numero:014d}"
+
+def _cnpj_formatado(documento):
+    return f"{documento[:2]}.{documento[2:5]}.{documento[5:8]}/{documento[8:12]}-{documento[12:]}"
+
+def gerar_fornecedores(quantidade, rng):
+    fornecedores = []
+    for i in range(quantidade):
+        nome = f"FORNECEDOR EXEMPLO {i} LTDA"
+        if i % 10 == 9:
+            # Fornecedores sem documento (ex.: empresas no exterior)
+            fornecedores.append(("", nome))
+        elif i % 7 == 6:
+            fornecedores.append((f"{rng.randrange(10 ** 10, 10 ** 11):011d}", f"PESSOA EXEMPLO {i}"))
+        else:
+            fornecedores.append((_cnpj(10 ** 13 + i * 7919), nome))
+    return fornecedores
+
+def gerar_dados(deputados=513, despesas_por_deputado=250, ano=2022, fornecedores=None, semente=0):
+    """Gera listas no formato dos endpoints /deputados, /deputados/{id} e /deputados/{id}/despesas.
+
+    Retorna um dicionário com as chaves "deputados" (lista), "detalhes" ({id: dados})
+    e "despesas" ({id: lista}).
+    """
+    rng = random.Random(semente)
+    lista_fornecedores = gerar_fornecedores(fornecedores or max(50, deputados * 4), rng)
+
+    lista_deputados = []
+    detalhes = {}
+    despesas = {}
+    cod_documento = 7000000
+
+    for indice in range(deputados):
+        id_deputado = 200000 + indice
+        partido = rng.choice(PARTIDOS)
+        uf = rng.choice(UFS)
+        nome = f"Deputado Exemplo {indice}"
+        uri = f"https://dadosabertos.camara.leg.br/api/v2/deputados/{id_deputado}"
+
+        lista_deputados.append({
+            "id": id_deputado,
+            "uri": uri,
+            "nome": nome,
+            "siglaPartido": partido,
+            "uriPartido": f"https://dadosabertos.camara.leg.br/api/v2/partidos/{partido}",
+            "siglaUf": uf,
+            "idLegislatura": 56,
+            "urlFoto": f"https://www.camara.leg.br/internet/deputado/bandep/{id_deputado}.jpg",
+            "email": None
+        })
+
+        em_exercicio = rng.random() < 0.8
+        detalhes[id_deputado] = {
+            "id": id_deputado,
+            "uri": uri,
+            "nomeCivil": f"{nome} da Silva",
+            "ultimoStatus": {
+                "id": id_deputado,
+                "uri": uri,
+                "nome": nome,
+                "siglaPartido": partido,
+                "uriPartido": f"https://dadosabertos.camara.leg.br/api/v2/partidos/{partido}",
+                "siglaUf": uf,
+                "idLegislatura": 57 if em_exercicio else 56,
+                "urlFoto": f"https://www.camara.leg.br/internet/deputado/bandep/{id_deputado}.jpg",
+                "email": f"dep.exemplo{indice}@camara.leg.br" if em_exercicio else None,
+                "data": f"{ano + 1}-02-01",
+                "nomeEleitoral": nome,
+                "gabinete": {
+                    "nome": str(rng.randrange(100, 999)) if em_exercicio else None,
+                    "predio": str(rng.choice([4, 5])) if em_exercicio else None,
+                    "sala": str(rng.randrange(100, 999)) if em_exercicio else None,
+                    "andar": str(rng.randrange(1, 9)) if em_exercicio else None,
+                    "telefone": f"3215-{rng.randrange(1000, 9999)}" if em_exercicio else None,
+                    "email": f"dep.exemplo{indice}@camara.leg.br" if em_exercicio else None
+                },
+                "situacao": "Exercício" if em_exercicio else "Fim de Mandato",
+                "condicaoEleitoral": "Titular",
+                "descricaoStatus": None
+            },
+            "cpf": f"{rng.randrange(10 ** 10, 10 ** 11):011d}",
+            "sexo": rng.choice(["M", "M", "M", "F"]),
+            "urlWebsite": None,
+            "redeSocial": [],
+            "dataNascimento": f"{rng.randrange(1945, 1995)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+            "dataFalecimento": None,
+            "ufNascimento": rng.choice(UFS),
+            "municipioNascimento": "Município Exemplo",
+            "escolaridade": rng.choice(ESCOLARIDADES)
+        }
+
+        despesas_deputado = []
+        for _ in range(rng.randrange(despesas_por_deputado // 2, despesas_por_deputado * 3 // 2 + 1)):
+            documento, nome_fornecedor = rng.choice(lista_fornecedores)
+            mes = rng.randrange(1, 13)
+            valor = round(rng.lognormvariate(6, 1.2), 2)
+            if rng.random() < 0.01:
+                valor = -valor
+
+            # Variações de grafia e de formatação do mesmo fornecedor
+            if rng.random() < 0.1:
+                nome_fornecedor = nome_fornecedor.title()
+            if len(documento) == 14 and rng.random() < 0.1:
+                documento = _cnpj_formatado(documento)
+
+            cod_documento += 1
+            despesas_deputado.append({
+                "ano": ano,
+                "mes": mes,
+                "tipoDespesa": rng.choice(TIPOS_DESPESA),
+                "codDocumento": cod_documento,
+                "tipoDocumento": "Nota Fiscal Eletrônica",
+                "codTipoDocumento": 4,
+                "dataDocumento": f"{ano}-{mes:02d}-{rng.randrange(1, 29):02d}T00:00:00",
+                "numDocumento": str(rng.randrange(1, 99999)),
+                "valorDocumento": valor,
+                "urlDocumento": f"https://www.camara.leg.br/cota-parlamentar/nota-fiscal-eletronica?ideDocumentoFiscal={cod_documento}",
+                "nomeFornecedor": nome_fornecedor,
+                "cnpjCpfFornecedor": documento,
+                "valorLiquido": valor,
+                "valorGlosa": 0.0,
+                "numRessarcimento": "",
+                "codLote": rng.randrange(1000000, 9999999),
+                "parcela": 0
+            })
+
+        despesas_deputado.sort(key=lambda despesa: (despesa["ano"], despesa["mes"]))
+        despesas[id_deputado] = despesas_deputado
+
+    return {"deputados": lista_deputados, "detalhes": detalhes, "despesas": despesas}
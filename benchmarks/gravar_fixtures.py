@@ -0,0 +1,58 @@
+"""Grava respostas reais da API da Câmara para uso no servidor local de benchmark.
+
+Uso: python -m benchmarks.gravar_fixtures --deputados 5 --ano 2022
+"""
+import argparse
+import json
+import os
+
+import requests
+
+from benchmarks.servidor_api import PASTA_FIXTURES
+
+URL_BASE = "https://dadosabertos.camara.leg.br/api/v2"
+
+def buscar_paginas(url, params=None):
+    """Percorre todas as páginas de um endpoint e devolve a lista de itens de `dados`."""
+    itens = []
+    while url:
+        response = requests.get(url, params=params, timeout=60)
+        response.raise_for_status()
+        corpo = response.json()
+        itens.extend(corpo["dados"])
+        url = next((link["href"] for link in corpo["links"] if link["rel"] == "next"), None)
+        params = None
+    return itens
+
+def main():
+    parser = argparse.ArgumentParser(description="Grava fixtures da API de Dados Abertos da Câmara")
+    parser.add_argument("--deputados", type=int, default=5, help="Quantidade de deputados gravados")
+    parser.add_argument("--ano", type=int, default=2022)
+    parser.add_argument("--legislatura", type=int, default=56)
+    parser.add_argument("--pasta", default=PASTA_FIXTURES)
+    args = parser.parse_args()
+
+    deputados = buscar_paginas(f"{URL_BASE}/deputados", {"idLegislatura": args.legislatura})[:args.deputados]
+
+    detalhes = {}
+    despesas = {}
+    for deputado in deputados:
+        id_deputado = deputado["id"]
+        response = requests.get(f"{URL_BASE}/deputados/{id_deputado}", timeout=60)
+        response.raise_for_status()
+        detalhes[id_deputado] = response.json()["dados"]
+        despesas[id_deputado] = buscar_paginas(
+            f"{URL_BASE}/deputados/{id_deputado}/despesas",
+            {"ano": args.ano, "idLegislatura": args.legislatura, "itens": 100}
+        )
+
+    os.makedirs(args.pasta, exist_ok=True)
+    for nome, conteudo in [("deputados", deputados), ("deputados_detalhes", detalhes), ("despesas", despesas)]:
+        with open(os.path.join(args.pasta, f"{nome}.json"), "w", encoding="utf-8") as arquivo:
+            json.dump(conteudo, arquivo, ensure_ascii=False, indent=1)
+
+    print(f"Fixtures gravadas em {args.pasta}: {len(deputados)} deputados, "
+          f"{sum(len(lista) for lista in despesas.values())} despesas")
+
+if __name__ == "__main__":
+    main()
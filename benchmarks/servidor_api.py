@@ -0,0 +1,207 @@
+"""Servidor local que substitui a API de Dados Abertos da Câmara nos benchmarks.
+
+Responde /deputados, /deputados/{id} e /deputados/{id}/despesas a partir de
+fixtures gravadas (ou de dados sintéticos), com paginação por `links`,
+latência configurável e injeção de erros.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from benchmarks.dados_sinteticos import gerar_dados
+
+PASTA_FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# Limites de paginação da API real
+ITENS_PADRAO = 15
+ITENS_MAXIMO = 100
+
+ROTA_DEPUTADOS = re.compile(r"^/api/v2/deputados/?$")
+ROTA_DETALHE = re.compile(r"^/api/v2/deputados/(\d+)/?$")
+ROTA_DESPESAS = re.compile(r"^/api/v2/deputados/(\d+)/despesas/?$")
+
+def carregar_fixtures(pasta=PASTA_FIXTURES):
+    """Lê as respostas gravadas por gravar_fixtures.py."""
+    with open(os.path.join(pasta, "deputados.json"), encoding="utf-8") as arquivo:
+        deputados = json.load(arquivo)
+    with open(os.path.join(pasta, "deputados_detalhes.json"), encoding="utf-8") as arquivo:
+        detalhes = {int(id_deputado): dados for id_deputado, dados in json.load(arquivo).items()}
+    with open(os.path.join(pasta, "despesas.json"), encoding="utf-8") as arquivo:
+        despesas = {int(id_deputado): dados for id_deputado, dados in json.load(arquivo).items()}
+    return {"deputados": deputados, "detalhes": detalhes, "despesas": despesas}
+
+class ServidorApi:
+    """Servidor HTTP em thread própria que registra cada requisição atendida."""
+
+    def __init__(self, dados, latencia=0.0, taxa_erro=0.0, semente=0, porta=0):
+        self.dados = dados
+        self.latencia = latencia
+        self.taxa_erro = taxa_erro
+        self.registros = []
+        self._rng = random.Random(semente)
+        self._trava = threading.Lock()
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", porta), self._criar_handler())
+        self._servidor.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url_base(self):
+        host, porta = self._servidor.server_address[:2]
+        return f"http://{host}:{porta}/api/v2"
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *args):
+        self.parar()
+
+    def _registrar(self, rota, status, tamanho, inicio):
+        with self._trava:
+            self.registros.append({
+                "rota": rota,
+                "status": status,
+                "bytes": tamanho,
+                "inicio": inicio,
+                "fim": time.time()
+            })
+
+    def _sortear_erro(self):
+        with self._trava:
+            return self.taxa_erro > 0 and self._rng.random() < self.taxa_erro
+
+    def _criar_handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _responder(self, rota, status, corpo, inicio):
+                conteudo = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(conteudo)))
+                self.end_headers()
+                self.wfile.write(conteudo)
+                servidor._registrar(rota, status, len(conteudo), inicio)
+
+            def do_GET(self):
+                inicio = time.time()
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+
+                if servidor.latencia:
+                    time.sleep(servidor.latencia)
+
+                if ROTA_DESPESAS.match(url.path):
+                    rota = "despesas"
+                elif ROTA_DETALHE.match(url.path):
+                    rota = "detalhes"
+                elif ROTA_DEPUTADOS.match(url.path):
+                    rota = "deputados"
+                else:
+                    self._responder("desconhecida", 404, {"status": 404, "title": "Recurso não encontrado"}, inicio)
+                    return
+
+                if servidor._sortear_erro():
+                    self._responder(rota, 503, {"status": 503, "title": "Serviço indisponível"}, inicio)
+                    return
+
+                if rota == "deputados":
+                    itens = servidor.dados["deputados"]
+                    if "id" in params:
+                        ids = {int(valor) for valor in params["id"]}
+                        itens = [deputado for deputado in itens if deputado["id"] in ids]
+                    # A lista de deputados só é paginada quando `itens` é informado
+                    tamanho_padrao = len(itens) or 1
+                    self._responder(rota, 200, self._paginar(url, params, itens, tamanho_padrao), inicio)
+                elif rota == "detalhes":
+                    id_deputado = int(ROTA_DETALHE.match(url.path).group(1))
+                    dados = servidor.dados["detalhes"].get(id_deputado)
+                    if dados is None:
+                        self._responder(rota, 404, {"status": 404, "title": "Deputado não encontrado"}, inicio)
+                        return
+                    corpo = {"dados": dados, "links": [{"rel": "self", "href": self._url(url, params)}]}
+                    self._responder(rota, 200, corpo, inicio)
+                else:
+                    id_deputado = int(ROTA_DESPESAS.match(url.path).group(1))
+                    itens = servidor.dados["despesas"].get(id_deputado, [])
+                    if "ano" in params:
+                        anos = {int(valor) for valor in params["ano"]}
+                        itens = [despesa for despesa in itens if despesa["ano"] in anos]
+                    if "mes" in params:
+                        meses = {int(valor) for valor in params["mes"]}
+                        itens = [despesa for despesa in itens if despesa["mes"] in meses]
+                    self._responder(rota, 200, self._paginar(url, params, itens, ITENS_PADRAO), inicio)
+
+            def _url(self, url, params):
+                host, porta = servidor._servidor.server_address[:2]
+                return f"http://{host}:{porta}{url.path}?{urlencode(params, doseq=True)}"
+
+            def _paginar(self, url, params, itens, tamanho_padrao):
+                if "itens" in params:
+                    tamanho = max(1, min(int(params["itens"][0]), ITENS_MAXIMO))
+                else:
+                    tamanho = tamanho_padrao
+                pagina = int(params.get("pagina", ["1"])[0])
+                ultima = max(1, -(-len(itens) // tamanho))
+
+                def link(rel, numero):
+                    novos = dict(params, pagina=[str(numero)], itens=[str(tamanho)])
+                    return {"rel": rel, "href": self._url(url, novos)}
+
+                links = [link("self", pagina), link("first", 1)]
+                if pagina < ultima:
+                    links.append(link("next", pagina + 1))
+                links.append(link("last", ultima))
+
+                inicio = (pagina - 1) * tamanho
+                return {"dados": itens[inicio:inicio + tamanho], "links": links}
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local com respostas da API da Câmara")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--latencia", type=float, default=0.0, help="Atraso por requisição, em segundos")
+    parser.add_argument("--taxa-erro", type=float, default=0.0, help="Fração das requisições que respondem 503")
+    parser.add_argument("--sintetico", action="store_true", help="Usar dados sintéticos em vez das fixtures gravadas")
+    parser.add_argument("--deputados", type=int, default=513)
+    parser.add_argument("--despesas-por-deputado", type=int, default=250)
+    parser.add_argument("--escala", type=float, default=1.0, help="Multiplica o volume dos dados sintéticos")
+    args = parser.parse_args()
+
+    if args.sintetico:
+        dados = gerar_dados(
+            deputados=int(args.deputados * args.escala),
+            despesas_por_deputado=int(args.despesas_por_deputado * args.escala)
+        )
+    else:
+        dados = carregar_fixtures()
+
+    servidor = ServidorApi(dados, latencia=args.latencia, taxa_erro=args.taxa_erro, porta=args.porta)
+    print(f"Servindo em {servidor.url_base} (Ctrl+C para encerrar)")
+    servidor.iniciar()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        servidor.parar()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import os
+from functools import lru_cache
+from urllib.parse import quote_plus
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import NullPool
+from dotenv import load_dotenv
+import logging
+
+# Carregar variáveis de ambiente do .env
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+
+# Banco SQLite local gerado pelo ETL: o mesmo caminho absoluto resolvido em etl/config.py
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SQLITE_PATH = os.path.abspath(os.getenv("SQLITE_PATH_ENV") or os.path.join(RAIZ_PROJETO, "database.db"))
+
+# Memória mapeada (bytes) e cache de páginas (KiB) de cada conexão de leitura
+SQLITE_MMAP = int(os.getenv("SQLITE_MMAP_ENV") or 256 * 1024 * 1024)
+SQLITE_CACHE_KB = int(os.getenv("SQLITE_CACHE_KB_ENV") or 64 * 1024)
+
+# Conexões de leitura mantidas abertas no pool (uma por sessão atendida ao mesmo tempo)
+SQLITE_POOL = int(os.getenv("SQLITE_POOL_ENV") or "8")
+
+def get_env_var(name):
+    value = os.getenv(name)
+    
+    if value is None:
+        raise ValueError(f"A variável de ambiente '{name}' não está definida.")
+    
+    if not value.strip():
+        raise ValueError(f"A variável de ambiente '{name}' está vazia.")
+    
+    return value
+
+def _pragmas_leitura(dbapi_connection, connection_record):
+    # journal_mode é definido pelo ETL (WAL); a conexão de leitura só ajusta memória e espera por bloqueios
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP}")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KB}")
+    cursor.execute("PRAGMA busy_timeout=30000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+@lru_cache(maxsize=None)
+def _engine_sqlite(url):
+    """Engine SQLite com pool de conexões de leitura, reaproveitada por todos os carregadores e sessões."""
+    engine = create_engine(
+        url,
+        pool_size=SQLITE_POOL,
+        max_overflow=SQLITE_POOL,
+        connect_args={"check_same_thread": False}
+    )
+    event.listen(engine, "connect", _pragmas_leitura)
+    return engine
+
+@lru_cache(maxsize=None)
+def _engine_mysql(url):
+    return create_engine(url, pool_pre_ping=True)
+
+def criar_engine():
+    """Cria a engine do banco de dados usada pelos carregadores do dashboard.
+
+    As engines de SQLite e MySQL são guardadas por URL, para que as conexões do pool sejam reaproveitadas entre
+    chamadas em vez de abrir uma conexão nova a cada carregamento.
+    """
+    # URL de conexão explícita (ex.: banco sintético usado nos benchmarks)
+    db_url = os.getenv("DB_URL_ENV")
+    if db_url:
+        if db_url.startswith("sqlite"):
+            return _engine_sqlite(db_url)
+        return create_engine(db_url)
+
+    # Banco DuckDB local gerado pelo ETL, aberto somente para leitura e sem pool: cada consulta libera o arquivo,
+    # permitindo que o ETL grave entre as leituras
+    duckdb_path = os.getenv("DUCKDB_PATH_ENV")
+    if duckdb_path:
+        try:
+            return create_engine(f"duckdb:///{duckdb_path}", connect_args={"read_only": True}, poolclass=NullPool)
+        except Exception as e:
+            logging.error(f"Erro ao conectar ao DuckDB: {e}")
+            raise
+
+    try:
+        db_host = get_env_var("DB_HOST_ENV")
+        db_port = get_env_var("DB_PORT_ENV")
+        db_user = get_env_var("DB_USER_ENV")
+        db_password = get_env_var("DB_PASS_ENV")
+        db_database = get_env_var("DB_NAME_ENV")
+        logging.info("Variáveis de ambiente carregadas com sucesso.")
+
+        # Conexão MySQL
+        try:
+            engine = _engine_mysql(f"mysql+pymysql://{db_user}:%s@{db_host}/{db_database}?charset=utf8mb4" % quote_plus(db_password))
+        except Exception as e:
+            logging.error(f"Erro ao conectar ao MySQL: {e}")
+            raise
+
+    except ValueError as e:
+        # Conexão SQLite local somente leitura (modo ro): o ETL continua sendo o único processo que grava
+        try:
+            if not os.path.exists(SQLITE_PATH):
+                raise FileNotFoundError(f"Banco SQLite não encontrado em {SQLITE_PATH}. Execute o ETL: python -m etl todos")
+            engine = _engine_sqlite(f"sqlite:///file:{SQLITE_PATH}?mode=ro&uri=true")
+        except Exception as e:
+            logging.error(f"Erro ao conectar ao SQLite: {e}")
+            raise
+
+    return engine
+
+def banco_colunar():
+    """Indica se o banco é o DuckDB, em que as agregações das páginas podem ser feitas no próprio banco."""
+    db_url = os.getenv("DB_URL_ENV")
+    if db_url:
+        return db_url.startswith("duckdb")
+    return bool(os.getenv("DUCKDB_PATH_ENV"))
@@ -0,0 +1,59 @@
+import pandas as pd
+from sqlalchemy import bindparam, text
+
+from conexao import criar_engine
+from get_despesas import tabela_despesas
+
+# Agregações das despesas feitas no próprio banco (usadas com o DuckDB, que lê só as colunas envolvidas)
+
+def _condicoes(ano, ids_deputados, mes, tipos, valor_min, valor_max):
+    """Cláusula WHERE e parâmetros equivalentes aos filtros da página de despesas."""
+    condicoes = ["valorDocumento BETWEEN :valor_min AND :valor_max"]
+    parametros = {"valor_min": valor_min, "valor_max": valor_max}
+    expandidos = []
+    if ano is not None:
+        condicoes.append("ano = :ano")
+        parametros["ano"] = int(ano)
+    if ids_deputados is not None:
+        condicoes.append("id_deputado IN :ids_deputados")
+        parametros["ids_deputados"] = [int(id) for id in ids_deputados]
+        expandidos.append("ids_deputados")
+    if mes is not None:
+        condicoes.append("mes = :mes")
+        parametros["mes"] = int(mes)
+    if tipos:
+        condicoes.append("tipoDespesa IN :tipos")
+        parametros["tipos"] = list(tipos)
+        expandidos.append("tipos")
+    return " AND ".join(condicoes), parametros, expandidos
+
+def agregar_despesas(por=None, ano=None, ids_deputados=None, mes=None, tipos=(), valor_min=float("-inf"), valor_max=float("inf")):
+    """Total, média, quantidade de documentos e fornecedores distintos das despesas filtradas.
+
+    Com `por` (nome de uma coluna de deputados_despesas) devolve uma linha por valor da coluna;
+    sem ele, uma única linha com o resumo geral.
+    """
+    # Deputados sem nenhum id no filtro (ex.: partido sem deputados) não têm despesas
+    if ids_deputados is not None and len(ids_deputados) == 0:
+        ids_deputados = [-1]
+
+    # Conectando no banco de dados (com o ano informado, só a tabela/partição do ano é lida)
+    engine = criar_engine()
+
+    where, parametros, expandidos = _condicoes(ano, ids_deputados, mes, tipos, valor_min, valor_max)
+    selecao = f"{por}, " if por else ""
+    agrupamento = f"GROUP BY {por}" if por else ""
+    sql = text(f"""
+        SELECT {selecao}
+               COALESCE(SUM(valorDocumento), 0) AS valorDocumento,
+               AVG(valorDocumento) AS mediaDocumento,
+               COUNT(*) AS qtdDocumentos,
+               COUNT(DISTINCT id_fornecedor) AS qtdFornecedores
+        FROM {tabela_despesas(engine, ano)}
+        WHERE {where}
+        {agrupamento}
+    """).bindparams(*[bindparam(nome, expanding=True) for nome in expandidos])
+
+    with engine.connect() as connection:
+        resultado = pd.read_sql(sql, connection, params=parametros)
+    return resultado.astype({"valorDocumento": "float64", "mediaDocumento": "float64"})
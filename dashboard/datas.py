@@ -0,0 +1,30 @@
+import pandas as pd
+
+MESES = ['Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
+         'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
+
+# Na ordem de dt.dayofweek (0 = segunda-feira)
+DIAS_SEMANA = ['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo']
+
+def derivar_colunas_datas(df):
+    """Acrescenta às despesas as colunas de data usadas nas análises temporais.
+
+    - dataDocumento convertida para data (valores inválidos viram NaT);
+    - mes_nome e dia_semana_nome como categorias ordenadas (Janeiro a Dezembro, Segunda a Domingo);
+    - dia_semana com o código do dia (0 = segunda-feira, -1 sem data).
+
+    Calculadas uma vez ao carregar os dados (e guardadas no snapshot), deixam os agrupamentos por mês e dia da
+    semana como agrupamentos pelos códigos das categorias, sem converter datas nem mapear textos a cada execução.
+    """
+    datas = pd.to_datetime(df['dataDocumento'], errors='coerce')
+    dia_semana = datas.dt.dayofweek.fillna(-1).astype('int8')
+    return df.assign(
+        dataDocumento=datas,
+        dia_semana=dia_semana,
+        mes_nome=pd.Categorical.from_codes(
+            df['mes'].where(df['mes'].between(1, 12), 0).astype('int8') - 1,
+            categories=MESES,
+            ordered=True
+        ),
+        dia_semana_nome=pd.Categorical.from_codes(dia_semana, categories=DIAS_SEMANA, ordered=True),
+    )
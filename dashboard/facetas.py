@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+def indexar_facetas(df, colunas, coluna_valor='valorDocumento'):
+    """Índice das facetas de filtro: códigos inteiros de cada coluna e contagem de linhas por valor.
+
+    colunas mapeia o nome da faceta para a coluna do DataFrame. Os códigos seguem a ordem dos valores
+    (pd.factorize com sort=True); linhas com valor nulo ficam com código -1 e não entram nas contagens.
+    """
+    indice = {"codigos": {}, "valores": {}, "contagens": {}, "valor": df[coluna_valor].to_numpy(dtype='float64')}
+    for nome, coluna in colunas.items():
+        codigos, valores = pd.factorize(df[coluna], sort=True)
+        codigos = codigos.astype('int32')
+        indice["codigos"][nome] = codigos
+        indice["valores"][nome] = valores
+        indice["contagens"][nome] = np.bincount(codigos[codigos >= 0], minlength=len(valores))
+    return indice
+
+def _mascara(indice, nome, selecionados):
+    # Tabela de consulta por código (a última posição corresponde ao código -1 dos nulos) indexada pelos códigos:
+    # uma leitura vetorizada por linha, qualquer que seja a quantidade de valores escolhidos
+    valores = indice["valores"][nome]
+    escolhidos = np.zeros(len(valores) + 1, dtype=bool)
+    posicoes = valores.get_indexer(list(selecionados))
+    escolhidos[posicoes[posicoes >= 0]] = True
+    return escolhidos[indice["codigos"][nome]]
+
+def _combinar(mascaras):
+    resultado = None
+    for mascara in mascaras:
+        if mascara is not None:
+            resultado = mascara if resultado is None else resultado & mascara
+    return resultado
+
+def _mascaras(indice, selecao, faixa_valor):
+    mascaras = {nome: _mascara(indice, nome, valores) if len(valores) > 0 else None
+                for nome, valores in selecao.items()}
+    mascara_valor = None
+    if faixa_valor is not None:
+        mascara_valor = (indice["valor"] >= faixa_valor[0]) & (indice["valor"] <= faixa_valor[1])
+    return mascaras, mascara_valor
+
+def mascara_filtros(indice, selecao, faixa_valor=None):
+    """Linhas que atendem a todas as facetas escolhidas e à faixa de valor (None quando nenhum filtro está ativo)."""
+    mascaras, mascara_valor = _mascaras(indice, selecao, faixa_valor)
+    return _combinar(list(mascaras.values()) + [mascara_valor])
+
+def filtrar_facetas(indice, selecao, faixa_valor=None):
+    """Aplica a seleção e devolve, para cada faceta, as opções que ainda têm linhas.
+
+    selecao mapeia o nome da faceta para os valores escolhidos (vazio = todos). As contagens de cada faceta
+    consideram as escolhas de todas as outras facetas e a faixa de valor, mas não a da própria faceta, para que
+    seja possível trocar de opção sem limpar o filtro. Sem nenhum filtro ativo, são usadas as contagens
+    pré-calculadas no índice.
+
+    Retorna um dicionário com:
+    - contagens: Series por faceta com as linhas de cada valor disponível (somente valores com linhas);
+    - faixa_valor: (mínimo, máximo) do valor nas linhas que atendem às facetas, ou None se nenhuma atende.
+    """
+    mascaras, mascara_valor = _mascaras(indice, selecao, faixa_valor)
+
+    contagens = {}
+    for nome, codigos in indice["codigos"].items():
+        outras = _combinar([mascara for outra, mascara in mascaras.items() if outra != nome] + [mascara_valor])
+        if outras is None:
+            contagem = indice["contagens"][nome]
+        else:
+            selecionados = codigos[outras]
+            contagem = np.bincount(selecionados[selecionados >= 0], minlength=len(indice["valores"][nome]))
+        contagens[nome] = pd.Series(contagem, index=indice["valores"][nome])[contagem > 0]
+
+    # A faixa de valor disponível depende só das facetas, não da própria faixa escolhida
+    facetas = _combinar(mascaras.values())
+    valores = indice["valor"] if facetas is None else indice["valor"][facetas]
+    faixa = (float(valores.min()), float(valores.max())) if len(valores) > 0 else None
+
+    return {"contagens": contagens, "faixa_valor": faixa}
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Separadores decimal e de milhar no padrão brasileiro (usados pelo Plotly no navegador)
+SEPARADORES_BRL = ",."
+
+# Template de texto para rótulos em reais, formatado pelo Plotly no navegador
+TEXTO_MOEDA = "R$ %{y:,.2f}"
+
+# Função para formatar valores monetários
+def formatar_moeda(valor):
+    return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+def formatar_moeda_vetor(valores):
+    """Formata uma Series (ou array) de valores em reais, com o mesmo texto de formatar_moeda.
+
+    Os centavos são arredondados uma vez e o texto é montado com as funções de strings do pyarrow. Valores em que o
+    produto por 100 não decide o arredondamento (quase meio centavo), infinitos, nulos e valores enormes usam
+    formatar_moeda, para que o resultado seja sempre idêntico.
+    """
+    numeros = np.asarray(valores, dtype="float64")
+    if numeros.size == 0:
+        texto = np.array([], dtype=object)
+    else:
+        texto = _formatar_numeros(numeros)
+
+    if isinstance(valores, pd.Series):
+        return pd.Series(texto, index=valores.index, name=valores.name, dtype=object)
+    return texto
+
+def _formatar_numeros(numeros):
+    escalado = np.abs(numeros) * 100
+    # O produto tem erro de no máximo meio ulp: longe de 0,5 o arredondamento é o mesmo do valor exato
+    with np.errstate(invalid="ignore"):
+        fracao = escalado - np.floor(escalado)
+        exatos = np.isfinite(escalado) & (escalado < 2 ** 52) & (np.abs(fracao - 0.5) > escalado * 1e-15 + 1e-300)
+    centavos = np.where(exatos, np.floor(escalado + 0.5), 0).astype(np.int64)
+    inteiro = centavos // 100
+    # Grupos de milhar da direita para a esquerda; o preenchimento completa os zeros dos grupos já montados
+    texto = pc.cast(pa.array(inteiro % 1000), pa.string())
+    resto = inteiro // 1000
+    grupos = 1
+    while resto.any():
+        completo = pc.binary_join_element_wise(
+            pc.cast(pa.array(resto % 1000), pa.string()), pc.utf8_lpad(texto, 4 * grupos - 1, "0"), "."
+        )
+        texto = pc.if_else(pa.array(resto > 0), completo, texto)
+        resto //= 1000
+        grupos += 1
+    # Como no Python, o sinal vem do valor original (-0,001 vira "R$ -0,00")
+    sinal = pa.array(np.where(np.signbit(numeros), "R$ -", "R$ "))
+    fracao_texto = pc.utf8_lpad(pc.cast(pa.array(centavos % 100), pa.string()), 2, "0")
+    texto = pc.binary_join_element_wise(pc.binary_join_element_wise(sinal, texto, ""), fracao_texto, ",")
+    texto = texto.to_numpy(zero_copy_only=False).astype(object)
+    for posicao in np.flatnonzero(~exatos):
+        texto[posicao] = formatar_moeda(numeros[posicao])
+    return texto
+
+def aplicar_formato_brl(fig, rotulos=True):
+    """Configura a figura para exibir valores em reais, deixando a formatação para o navegador."""
+    fig.update_layout(separators=SEPARADORES_BRL)
+    if rotulos:
+        fig.update_traces(texttemplate=TEXTO_MOEDA, textposition='auto')
+    return fig
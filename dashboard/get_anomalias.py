@@ -0,0 +1,20 @@
+import pandas as pd
+
+from conexao import criar_engine
+
+# Tabelas pré-calculadas pela etapa "anomalias" do ETL
+TABELAS_ANOMALIAS = [
+    "anomalias_resumo",
+    "anomalias_deputado_tipo",
+    "anomalias_documentos",
+    "anomalias_duplicidades",
+    "anomalias_concentracao",
+]
+
+def carregar_anomalias():
+    # Conectando no banco de dados
+    engine = criar_engine()
+
+    # Importando as tabelas de anomalias (dicionário nome -> DataFrame)
+    anomalias = {tabela: pd.read_sql(f"SELECT * FROM {tabela}", engine) for tabela in TABELAS_ANOMALIAS}
+    return anomalias
@@ -1,57 +1,49 @@
+import re
+
 import pandas as pd
-import os
-from urllib.parse import quote_plus
-from sqlalchemy import create_engine
-from dotenv import load_dotenv
-import logging
-
-# Carregar variáveis de ambiente do .env
-load_dotenv()
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler()
-    ]
-)
-
-def carregar_lista_despesas():
+from sqlalchemy import inspect, text
+
+from conexao import criar_engine
+
+# No SQLite/DuckDB o ETL grava cada ano em deputados_despesas_<ano> (deputados_despesas é a view com a união);
+# no MySQL deputados_despesas é particionada por ano e o filtro por ano lê só a partição do ano
+PADRAO_TABELA_ANO = re.compile(r"deputados_despesas_(\d{4})")
+
+def anos_em_tabelas(engine):
+    """Anos gravados em tabelas próprias (vazio quando o banco usa uma única tabela)."""
+    anos = []
+    for nome in inspect(engine).get_table_names():
+        encontrado = PADRAO_TABELA_ANO.fullmatch(nome)
+        if encontrado:
+            anos.append(int(encontrado.group(1)))
+    return sorted(anos)
+
+def tabela_despesas(engine, ano=None):
+    """Tabela de onde ler as despesas: a tabela do ano, quando existe, ou deputados_despesas."""
+    if ano is not None and int(ano) in anos_em_tabelas(engine):
+        return f"deputados_despesas_{int(ano)}"
+    return "deputados_despesas"
+
+def carregar_anos_despesas():
     # Conectando no banco de dados
-    def get_env_var(name):
-        value = os.getenv(name)
-        
-        if value is None:
-            raise ValueError(f"A variável de ambiente '{name}' não está definida.")
-        
-        if not value.strip():
-            raise ValueError(f"A variável de ambiente '{name}' está vazia.")
-        
-        return value
-
-    try:
-        db_host = get_env_var("DB_HOST_ENV")
-        db_port = get_env_var("DB_PORT_ENV")
-        db_user = get_env_var("DB_USER_ENV")
-        db_password = get_env_var("DB_PASS_ENV")
-        db_database = get_env_var("DB_NAME_ENV")
-        logging.info("Variáveis de ambiente carregadas com sucesso.")
-
-        # Conexão MySQL
-        try:
-            engine = create_engine(f"mysql+pymysql://{db_user}:%s@{db_host}/{db_database}?charset=utf8mb4" % quote_plus(db_password))
-        except Exception as e:
-            logging.error(f"Erro ao conectar ao MySQL: {e}")
-            raise
-
-    except ValueError as e:
-        # Conexão SQLite
-        try:
-            engine = create_engine("sqlite://../database.db")
-        except Exception as e:
-            logging.error(f"Erro ao conectar ao SQLite: {e}")
-            raise
-
-    # Importando dados
-    lista_despesas = pd.read_sql("SELECT * FROM deputados_despesas", engine)
-    return lista_despesas
\ No newline at end of file
+    engine = criar_engine()
+
+    anos = anos_em_tabelas(engine)
+    if anos:
+        return anos
+    with engine.connect() as connection:
+        resultado = connection.execute(text("SELECT DISTINCT ano FROM deputados_despesas WHERE ano IS NOT NULL"))
+        return sorted(int(ano) for (ano,) in resultado)
+
+def carregar_lista_despesas(ano=None):
+    # Conectando no banco de dados
+    engine = criar_engine()
+
+    # Importando dados (apenas do ano pedido, quando informado)
+    if ano is None:
+        lista_despesas = pd.read_sql("SELECT * FROM deputados_despesas", engine)
+    else:
+        lista_despesas = pd.read_sql(
+            text(f"SELECT * FROM {tabela_despesas(engine, ano)} WHERE ano = :ano"), engine, params={"ano": int(ano)}
+        )
+    return lista_despesas
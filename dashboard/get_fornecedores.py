@@ -0,0 +1,25 @@
+import pandas as pd
+from sqlalchemy import text
+
+from conexao import criar_engine
+
+def carregar_lista_fornecedores():
+    # Conectando no banco de dados
+    engine = criar_engine()
+
+    # Importando a dimensão de fornecedores gerada pelo ETL
+    lista_fornecedores = pd.read_sql("SELECT * FROM dim_fornecedores", engine)
+    return lista_fornecedores
+
+def carregar_totais_fornecedores(ano=None):
+    # Conectando no banco de dados
+    engine = criar_engine()
+
+    # Totais pré-calculados por fornecedor, deputado, tipo de despesa e mês (apenas do ano pedido, quando informado)
+    if ano is None:
+        totais_fornecedores = pd.read_sql("SELECT * FROM fornecedores_totais", engine)
+    else:
+        totais_fornecedores = pd.read_sql(
+            text("SELECT * FROM fornecedores_totais WHERE ano = :ano"), engine, params={"ano": int(ano)}
+        )
+    return totais_fornecedores
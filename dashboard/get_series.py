@@ -0,0 +1,11 @@
+import pandas as pd
+
+from conexao import criar_engine
+
+def carregar_series_mensais():
+    # Conectando no banco de dados
+    engine = criar_engine()
+
+    # Séries mensais pré-calculadas pela etapa "series" do ETL
+    series_mensais = pd.read_sql("SELECT * FROM series_mensais", engine)
+    return series_mensais
@@ -0,0 +1,73 @@
+import pandas as pd
+
+# Orçamento de pontos por gráfico: mantém o tamanho do JSON das figuras limitado
+MAX_FATIAS_PIZZA = 10
+MAX_BARRAS = 30
+MAX_PONTOS_TEMPORAIS = 40
+
+MESES_ABREVIADOS = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+# Granularidades possíveis para séries temporais, da mais fina para a mais grossa
+GRANULARIDADES = {
+    'D': 'Diária',
+    'W': 'Semanal',
+    'M': 'Mensal',
+    'Q': 'Trimestral',
+    'Y': 'Anual'
+}
+
+def limitar_categorias(df, categoria, valor='valorDocumento', max_pontos=MAX_BARRAS, rotulo_outros='Outros'):
+    """Mantém as maiores categorias e agrupa o restante em uma única categoria "Outros"."""
+    if len(df) <= max_pontos:
+        return df
+
+    principais = df.nlargest(max_pontos - 1, valor)
+    outros = pd.DataFrame({
+        categoria: [rotulo_outros],
+        valor: [df[valor].sum() - principais[valor].sum()]
+    })
+    return pd.concat([principais[[categoria, valor]], outros], ignore_index=True)
+
+def escolher_granularidade(inicio, fim, max_pontos=MAX_PONTOS_TEMPORAIS):
+    """Escolhe a granularidade mais fina cujo número de períodos cabe no orçamento de pontos."""
+    dias = (fim - inicio).days + 1
+    if dias <= max_pontos:
+        return 'D'
+    if dias / 7 <= max_pontos:
+        return 'W'
+    if dias / 30.44 <= max_pontos:
+        return 'M'
+    if dias / 91.31 <= max_pontos:
+        return 'Q'
+    return 'Y'
+
+def _rotular_periodos(periodos, granularidade):
+    """Rótulos legíveis para o início de cada período."""
+    varios_anos = periodos.dt.year.nunique() > 1
+    if granularidade == 'D':
+        return periodos.dt.strftime('%d/%m/%Y' if varios_anos else '%d/%m')
+    if granularidade == 'W':
+        return 'Sem. ' + periodos.dt.strftime('%d/%m/%Y' if varios_anos else '%d/%m')
+    if granularidade == 'M':
+        rotulos = periodos.dt.month.map(lambda mes: MESES_ABREVIADOS[mes - 1])
+        return rotulos + '/' + periodos.dt.year.astype(str) if varios_anos else rotulos
+    if granularidade == 'Q':
+        return periodos.dt.quarter.astype(str) + 'º tri/' + periodos.dt.year.astype(str)
+    return periodos.dt.year.astype(str)
+
+def agrupar_por_periodo(df, coluna_data='dataDocumento', valor='valorDocumento', max_pontos=MAX_PONTOS_TEMPORAIS):
+    """Soma os valores por período, com a granularidade escolhida pelo intervalo de datas.
+
+    Retorna o DataFrame (colunas periodo, rotulo e o valor) e a granularidade usada.
+    """
+    datas = df[coluna_data]
+    validas = datas.notna()
+    if not validas.any():
+        return pd.DataFrame(columns=['periodo', 'rotulo', valor]), None
+
+    granularidade = escolher_granularidade(datas[validas].min(), datas[validas].max(), max_pontos)
+    periodos = datas[validas].dt.to_period(granularidade).dt.start_time.rename('periodo')
+
+    agrupado = df.loc[validas, valor].groupby(periodos).sum().reset_index()
+    agrupado.insert(1, 'rotulo', _rotular_periodos(agrupado['periodo'], granularidade))
+    return agrupado, granularidade
@@ -3,9 +3,22 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import logging
 
 from get_deputados import carregar_lista_deputados
-from get_despesas import carregar_lista_despesas
+from get_despesas import carregar_lista_despesas, carregar_anos_despesas
+from get_fornecedores import carregar_lista_fornecedores, carregar_totais_fornecedores
+from get_series import carregar_series_mensais
+from conexao import banco_colunar
+from snapshot import carregar_versao_dados, ler_snapshot, gravar_snapshot, COMPARTILHADO
+from consultas import agregar_despesas
+from ranking import agrupar_totais, calcular_ranking, seletor_pagina
+from paginacao import pagina_dataframe
+from datas import derivar_colunas_datas, MESES
+from facetas import indexar_facetas, filtrar_facetas, mascara_filtros
+from graficos import limitar_categorias, agrupar_por_periodo, GRANULARIDADES, MAX_BARRAS, MAX_FATIAS_PIZZA
+from formatacao import formatar_moeda, formatar_moeda_vetor, aplicar_formato_brl, TEXTO_MOEDA
+from perfil import iniciar_perfil, finalizar_perfil, secao, cache_medido
 
 # Configuração da página
 st.set_page_config(
@@ -15,39 +28,33 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Função para formatar valores monetários
-def formatar_moeda(valor):
-    return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+# Perfil opcional da execução (PERFIL_DASHBOARD=1 ou ?perfil=1 na URL)
+iniciar_perfil("despesas")
+
+# Facetas de filtro da página e a coluna das despesas de cada uma
+FACETAS = {"partido": "siglaPartido", "mes": "mes", "deputado": "nomeCivil", "tipo": "tipoDespesa"}
+
+# DataFrames processados guardados no snapshot em disco, na ordem devolvida por carregando_dados
+NOMES_SNAPSHOT = ("deputados", "despesas", "fornecedores", "totais_fornecedores")
 
 # Função para carregar dados
-@st.cache_data(ttl=3600)
-def carregando_dados():
-    # # Carregar dados dos deputados
-    lista_deputados = carregar_lista_deputados()
-    
-    # Carregar dados das despesas
-    lista_despesas = carregar_lista_despesas()
+def processando_dados(ano):
+    with secao("leitura_banco"):
+        # # Carregar dados dos deputados
+        lista_deputados = carregar_lista_deputados()
+        
+        # Carregar dados das despesas (somente do ano escolhido)
+        lista_despesas = carregar_lista_despesas(ano)
+        
+        # Carregar dimensão e totais pré-calculados dos fornecedores
+        lista_fornecedores = carregar_lista_fornecedores()
+        totais_fornecedores = carregar_totais_fornecedores(ano)
     
     # Pré-processamento
     deputados_unicos = lista_deputados.drop_duplicates(subset="id", keep="last")
     
-    # Converter data e extrair mês
-    lista_despesas['dataDocumento'] = pd.to_datetime(lista_despesas['dataDocumento'], errors='coerce')
-    meses_pt = {
-        1: 'Janeiro',
-        2: 'Fevereiro',
-        3: 'Março',
-        4: 'Abril',
-        5: 'Maio',
-        6: 'Junho',
-        7: 'Julho',
-        8: 'Agosto',
-        9: 'Setembro',
-        10: 'Outubro',
-        11: 'Novembro',
-        12: 'Dezembro'
-    }
-    lista_despesas['mes_nome'] = lista_despesas['mes'].map(meses_pt)
+    # Colunas derivadas da data (data convertida, mês e dia da semana como códigos e categorias)
+    lista_despesas = derivar_colunas_datas(lista_despesas)
     
     # Adicionar informações de deputados às despesas
     lista_despesas = lista_despesas.merge(
@@ -57,108 +64,286 @@ def carregando_dados():
         how='left'
     )
     
-    return deputados_unicos, lista_despesas
+    # Adicionar nome e CNPJ/CPF do fornecedor a partir da dimensão (categorias ocupam menos memória)
+    lista_fornecedores = lista_fornecedores.set_index('id_fornecedor')
+    lista_despesas = lista_despesas.join(
+        lista_fornecedores[['nomeFornecedor', 'cnpjCpfFornecedor']].astype('category'),
+        on='id_fornecedor'
+    )
+    
+    # Adicionar partido aos totais dos fornecedores para permitir o filtro por partido
+    totais_fornecedores = totais_fornecedores.merge(
+        deputados_unicos[['id', 'siglaPartido']],
+        left_on='id_deputado',
+        right_on='id',
+        how='left'
+    )
+    
+    return deputados_unicos, lista_despesas, lista_fornecedores, totais_fornecedores
 
-# Carregar dados
-deputados_unicos, lista_despesas = carregando_dados()
+# Devolve também a versão dos dados carregados, que pode ser anterior à consultada por carregando_versao
+# enquanto este cache não expira
+@cache_medido("carregando_dados", ttl=3600)
+def carregando_dados(ano):
+    # Na inicialização, os dados já processados são lidos do snapshot enquanto a versão dos dados não muda
+    with secao("snapshot"):
+        versao = carregar_versao_dados()
+        dados = ler_snapshot(f"despesas_{ano}", versao, NOMES_SNAPSHOT)
+    if dados is not None:
+        return versao, dados
+
+    dados = processando_dados(ano)
+    with secao("snapshot"):
+        gravar_snapshot(f"despesas_{ano}", versao, dict(zip(NOMES_SNAPSHOT, dados)))
+    return versao, dados
+
+# Índice das facetas de filtro, compartilhado entre as sessões. Os códigos são posições nas linhas de lista_despesas:
+# a chave usa a versão que produziu esses dados, para nunca aplicar o índice de outra carga
+@cache_medido("indexando_facetas", recurso=True, ttl=3600, max_entries=4)
+def indexando_facetas(ano, versao, qtd_linhas, _lista_despesas):
+    return indexar_facetas(_lista_despesas, FACETAS)
+
+# Versão dos dados consultada no máximo uma vez por minuto (detecta uma nova carga do ETL)
+@cache_medido("carregando_versao", ttl=60)
+def carregando_versao():
+    return carregar_versao_dados()
+
+# Modo compartilhado (SNAPSHOT_COMPARTILHADO_ENV=1): um único conjunto de DataFrames por versão, mapeado do snapshot
+# e usado sem cópia por todas as sessões; os processos do servidor compartilham o mesmo arquivo
+@cache_medido("carregando_dados_compartilhados", recurso=True, max_entries=2)
+def carregando_dados_compartilhados(ano, versao):
+    with secao("snapshot"):
+        dados = ler_snapshot(f"despesas_{ano}", versao, NOMES_SNAPSHOT, compartilhado=True)
+    if dados is not None:
+        return dados
+
+    with secao("snapshot"):
+        gravar_snapshot(f"despesas_{ano}", versao, dict(zip(NOMES_SNAPSHOT, processando_dados(ano))))
+        dados = ler_snapshot(f"despesas_{ano}", versao, NOMES_SNAPSHOT, compartilhado=True)
+    if dados is None:
+        raise RuntimeError(f"Não foi possível gravar o snapshot compartilhado das despesas de {ano}")
+    return dados
+
+# Séries mensais pré-calculadas pelo ETL, indexadas por nível e chave (busca de uma série sem percorrer a tabela)
+@cache_medido("carregando_series", ttl=3600)
+def carregando_series():
+    try:
+        with secao("leitura_banco"):
+            series_mensais = carregar_series_mensais()
+    except Exception as e:
+        logging.error(f"Erro ao carregar as séries mensais: {e}")
+        return None
+    return series_mensais.set_index(['nivel', 'chave']).sort_index()
+
+# Agregações filtradas feitas no banco (DuckDB); o resultado fica em cache por combinação de filtros
+@cache_medido("agregacao_banco", ttl=3600)
+def agregar_no_banco(por, ano, ids_deputados, mes, tipos, valor_min, valor_max):
+    return agregar_despesas(por, ano, ids_deputados, mes, tipos, valor_min, valor_max)
+
+# Anos carregados no banco
+@cache_medido("carregando_anos", ttl=3600)
+def carregando_anos():
+    return carregar_anos_despesas()
+
+anos_disponiveis = carregando_anos()
 
 # Título e descrição
 st.title("💰 Análise de Despesas dos Deputados")
-st.caption("Os registros são referentes aos deputados em exercício no ano de 2022")
+ano_selecionado = st.selectbox("Escolha um ano", options=anos_disponiveis, index=len(anos_disponiveis) - 1)
+st.caption(f"Os registros são referentes aos deputados em exercício no ano de {ano_selecionado}")
+
+# Carregar dados (apenas o ano escolhido é lido do banco)
+versao_dados = carregando_versao()
+if COMPARTILHADO and versao_dados is not None:
+    versao_despesas = versao_dados
+    deputados_unicos, lista_despesas, lista_fornecedores, totais_fornecedores = carregando_dados_compartilhados(
+        ano_selecionado, versao_dados
+    )
+else:
+    versao_despesas, (deputados_unicos, lista_despesas, lista_fornecedores, totais_fornecedores) = carregando_dados(
+        ano_selecionado
+    )
+series_mensais = carregando_series()
+indice_facetas = indexando_facetas(ano_selecionado, versao_despesas, len(lista_despesas), lista_despesas)
+
+# Seleção atual dos filtros (guardada pelos widgets na execução anterior)
+def escolha(chave):
+    valor = st.session_state.get(chave, "Todos")
+    return [] if valor == "Todos" else [valor]
+
+def selecao_filtros():
+    return {
+        "partido": escolha("filtro_partido"),
+        "mes": [MESES.index(mes) + 1 for mes in escolha("filtro_mes")],
+        "deputado": escolha("filtro_deputado"),
+        "tipo": list(st.session_state.get("filtro_tipos", [])),
+    }
+
+# Opções de cada filtro a partir das escolhas dos demais: só aparecem valores que ainda têm despesas
+with secao("facetas"):
+    facetas = filtrar_facetas(indice_facetas, selecao_filtros(), st.session_state.get("filtro_valor"))
+    contagens = facetas["contagens"]
+
+    # Escolhas que ficaram sem despesas depois de mudar outro filtro voltam para "Todos"
+    invalidas = False
+    for chave, nome in (("filtro_partido", "partido"), ("filtro_deputado", "deputado")):
+        if escolha(chave) and escolha(chave)[0] not in contagens[nome].index:
+            st.session_state[chave] = "Todos"
+            invalidas = True
+    if escolha("filtro_mes") and MESES.index(escolha("filtro_mes")[0]) + 1 not in contagens["mes"].index:
+        st.session_state["filtro_mes"] = "Todos"
+        invalidas = True
+    tipos_validos = [tipo for tipo in st.session_state.get("filtro_tipos", []) if tipo in contagens["tipo"].index]
+    if len(tipos_validos) < len(st.session_state.get("filtro_tipos", [])):
+        st.session_state["filtro_tipos"] = tipos_validos
+        invalidas = True
+    if invalidas:
+        facetas = filtrar_facetas(indice_facetas, selecao_filtros(), st.session_state.get("filtro_valor"))
+        contagens = facetas["contagens"]
+
+    # Faixa do slider: valores das despesas que atendem aos demais filtros (o slider exige mínimo menor que o máximo)
+    faixa_valor = facetas["faixa_valor"] or (0.0, 0.0)
+    if faixa_valor[1] <= faixa_valor[0]:
+        faixa_valor = (faixa_valor[0], faixa_valor[0] + 1.0)
+    # Por padrão a faixa inteira, inclusive valores negativos (estornos): assim o filtro de valor fica inativo e os
+    # totais pré-calculados dos fornecedores continuam valendo
+    padrao_valor = (faixa_valor[0], faixa_valor[1])
+    valor_atual = st.session_state.get("filtro_valor")
+    if valor_atual is None or valor_atual == st.session_state.get("filtro_valor_padrao"):
+        # Enquanto o slider não é movido, acompanha a faixa disponível
+        st.session_state["filtro_valor"] = padrao_valor
+    else:
+        st.session_state["filtro_valor"] = (
+            min(max(valor_atual[0], faixa_valor[0]), faixa_valor[1]),
+            max(min(valor_atual[1], faixa_valor[1]), faixa_valor[0])
+        )
+    st.session_state["filtro_valor_padrao"] = padrao_valor
+
+    # As opções (com as contagens) fazem parte da identidade do widget no Streamlit; reatribuir as escolhas mantém
+    # a seleção quando as opções mudam
+    for chave in ("filtro_partido", "filtro_mes", "filtro_deputado", "filtro_tipos"):
+        if chave in st.session_state:
+            st.session_state[chave] = st.session_state[chave]
+
+def com_contagem(faceta, rotulo=None):
+    # Rótulo da opção com a quantidade de despesas que ela mantém
+    contagem = contagens[faceta]
+    return lambda opcao: opcao if opcao == "Todos" else f"{rotulo(opcao) if rotulo else opcao} ({contagem[opcao]:,})"
 
 # Sidebar com filtros
 st.header("Filtros")
 
 # Criar um container para os filtros
-with st.container(border=True):
-    # Primeiro, vamos criar os filtros básicos que não dependem de outros
+with st.container(border=True), secao("widgets_filtros"):
     col1, col2 = st.columns(2)
     
     with col1:
-        # Filtro por partido (independente)
+        # Filtro por partido
         partido_selecionado = st.selectbox(
             "Escolha um partido",
-            options=["Todos"] + sorted(deputados_unicos["siglaPartido"].unique().tolist()),
-            index=0
+            options=["Todos"] + contagens["partido"].index.tolist(),
+            format_func=com_contagem("partido"),
+            key="filtro_partido"
         )
     
     with col2:
-        # Filtro por mês (independente)
-        meses = ["Todos"] + ["Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho", 
-                            "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"]
+        # Filtro por mês (os códigos 1 a 12 são exibidos pelo nome)
         mes_selecionado = st.selectbox(
             "Escolha um mês", 
-            options=meses,
-            index=0
+            options=["Todos"] + [MESES[mes - 1] for mes in contagens["mes"].index],
+            format_func=lambda mes: mes if mes == "Todos" else f"{mes} ({contagens['mes'][MESES.index(mes) + 1]:,})",
+            key="filtro_mes"
         )
     
-    # Agora, vamos criar os filtros dependentes
     col3, col4 = st.columns(2)
     
     with col3:
-        # Filtrar deputados com base no partido selecionado
-        if partido_selecionado != "Todos":
-            deputados_filtrados = deputados_unicos[deputados_unicos["siglaPartido"] == partido_selecionado]
-            deputados_options = ["Todos"] + sorted(deputados_filtrados["nomeCivil"].unique().tolist())
-        else:
-            deputados_options = ["Todos"] + sorted(deputados_unicos["nomeCivil"].unique().tolist())
-        
-        # Filtro por deputado (depende do partido)
+        # Filtro por deputado (apenas os que têm despesas com os demais filtros)
         deputado_selecionado = st.selectbox(
             "Escolha um deputado", 
-            options=deputados_options,
-            index=0
+            options=["Todos"] + contagens["deputado"].index.tolist(),
+            format_func=com_contagem("deputado"),
+            key="filtro_deputado"
         )
     
     with col4:
         # Filtro por tipo de despesa
         tipo_despesa = st.multiselect(
             "Selecione tipo(s) de despesa",
-            options=lista_despesas['tipoDespesa'].unique(),
-            placeholder="Escolha uma opção"
+            options=contagens["tipo"].index.tolist(),
+            format_func=com_contagem("tipo"),
+            placeholder="Escolha uma opção",
+            key="filtro_tipos"
         )
     
     # Filtro por valor
     min_valor, max_valor = st.slider(
         "Filtrar por valor (R$)",
-        min_value=float(lista_despesas['valorDocumento'].min()),
-        max_value=float(lista_despesas['valorDocumento'].max()),
-        value=(0.0, float(lista_despesas['valorDocumento'].max()))
+        min_value=float(faixa_valor[0]),
+        max_value=float(faixa_valor[1]),
+        key="filtro_valor"
     )
 
-# Aplicar filtros
-despesas_filtradas = lista_despesas.copy()
-
-# Filtro por deputado
-if deputado_selecionado != "Todos":
-    id_deputado = deputados_unicos.loc[deputados_unicos['nomeCivil'] == deputado_selecionado, 'id'].values[0]
-    despesas_filtradas = despesas_filtradas[despesas_filtradas['id_deputado'] == id_deputado]
-
-# Filtro por mês
-if mes_selecionado != "Todos":
-    mes_numero = meses.index(mes_selecionado)
-    despesas_filtradas = despesas_filtradas[despesas_filtradas['mes'] == mes_numero]
+# Aplicar filtros: uma única máscara com a interseção das facetas e da faixa de valor
+with secao("filtros"):
+    despesas_filtradas = lista_despesas[mascara_filtros(indice_facetas, selecao_filtros(), (min_valor, max_valor))]
+    id_deputado = None
+    mes_numero = None
+    if deputado_selecionado != "Todos":
+        id_deputado = deputados_unicos.loc[deputados_unicos['nomeCivil'] == deputado_selecionado, 'id'].values[0]
+    if mes_selecionado != "Todos":
+        mes_numero = MESES.index(mes_selecionado) + 1
 
-# Filtro de partido
-if partido_selecionado != "Todos":
-    despesas_filtradas = despesas_filtradas[despesas_filtradas['siglaPartido'] == partido_selecionado]
+# Com o DuckDB as métricas e os gastos por tipo são agregados no banco com os mesmos filtros
+agregar_banco = banco_colunar()
+if agregar_banco:
+    ids_filtro = None
+    if partido_selecionado != "Todos":
+        ids_filtro = set(deputados_unicos.loc[deputados_unicos['siglaPartido'] == partido_selecionado, 'id'])
+    if id_deputado is not None:
+        ids_filtro = {id_deputado} if ids_filtro is None else ids_filtro & {id_deputado}
+    filtros_banco = (
+        ano_selecionado,
+        tuple(sorted(int(id) for id in ids_filtro)) if ids_filtro is not None else None,
+        mes_numero,
+        tuple(tipo_despesa),
+        float(min_valor),
+        float(max_valor)
+    )
 
-# Filtro por tipo de despesa
-if len(tipo_despesa) > 0:
-    despesas_filtradas = despesas_filtradas[despesas_filtradas['tipoDespesa'].isin(tipo_despesa)]
+# Os totais pré-calculados dos fornecedores só valem quando o filtro de valor não exclui nenhuma despesa
+# (a faixa do slider é a das despesas que atendem aos demais filtros)
+filtro_valor_ativo = min_valor > faixa_valor[0] or max_valor < faixa_valor[1]
 
-# Filtro por valor
-despesas_filtradas = despesas_filtradas[
-    (despesas_filtradas['valorDocumento'] >= min_valor) & 
-    (despesas_filtradas['valorDocumento'] <= max_valor)
-]
+def totais_por_fornecedor(tipos=None):
+    """Soma das despesas filtradas por fornecedor (id_fornecedor)."""
+    if filtro_valor_ativo:
+        base = despesas_filtradas
+    else:
+        base = totais_fornecedores
+        if id_deputado is not None:
+            base = base[base['id_deputado'] == id_deputado]
+        if mes_numero is not None:
+            base = base[base['mes'] == mes_numero]
+        if partido_selecionado != "Todos":
+            base = base[base['siglaPartido'] == partido_selecionado]
+        if len(tipo_despesa) > 0:
+            base = base[base['tipoDespesa'].isin(tipo_despesa)]
+    
+    if tipos is not None:
+        base = base[base['tipoDespesa'].isin(tipos)]
+    
+    return agrupar_totais(base, 'id_fornecedor')
 
 # Seção de métricas
 st.header("📊 Métricas Principais")
 col1, col2, col3, col4 = st.columns([4, 3, 3, 3])
 
+if agregar_banco:
+    resumo_banco = agregar_no_banco(None, *filtros_banco).iloc[0]
+
 with col1:
-    total_gasto = despesas_filtradas["valorDocumento"].sum()
+    total_gasto = resumo_banco["valorDocumento"] if agregar_banco else despesas_filtradas["valorDocumento"].sum()
     st.metric(
         "Total Gasto", 
         formatar_moeda(total_gasto), 
@@ -168,7 +353,7 @@ with col1:
     )
 
 with col2:
-    media_despesa = despesas_filtradas['valorDocumento'].mean()
+    media_despesa = resumo_banco["mediaDocumento"] if agregar_banco else despesas_filtradas['valorDocumento'].mean()
     st.metric(
         "Média por Despesa", 
         formatar_moeda(media_despesa),
@@ -177,7 +362,7 @@ with col2:
     )
 
 with col3:
-    qtd_despesas = len(despesas_filtradas)
+    qtd_despesas = int(resumo_banco["qtdDocumentos"]) if agregar_banco else len(despesas_filtradas)
     st.metric(
         "Total de Despesas", 
         f"{qtd_despesas:,}",
@@ -185,7 +370,7 @@ with col3:
         border=True
     )
 with col4:
-    fornecedores_unicos = despesas_filtradas['cnpjCpfFornecedor'].nunique()
+    fornecedores_unicos = int(resumo_banco["qtdFornecedores"]) if agregar_banco else despesas_filtradas['id_fornecedor'].nunique()
     st.metric(
         "Fornecedores Distintos", 
         fornecedores_unicos,
@@ -196,28 +381,31 @@ with col4:
 # Abas para diferentes visualizações
 tab1, tab2, tab3, tab4 = st.tabs(["📈 Visualizações", "📋 Detalhes das Despesas", "🔍 Análises", "📊 Comparativos"])
 
-with tab1:
+with tab1, secao("visualizacoes"):
     st.header("Visualizações Gráficas")
     
     # Criar abas para diferentes tipos de visualizações
     viz_tab1, viz_tab2, viz_tab3 = st.tabs(["Gastos por Tipo", "Evolução Temporal", "Distribuição"])
     
-    with viz_tab1:
+    with viz_tab1, secao("gastos_por_tipo"):
         # Gráfico de barras por tipo de despesa
-        despesas_por_tipo = despesas_filtradas.groupby('tipoDespesa')['valorDocumento'].sum().reset_index()
+        if agregar_banco:
+            despesas_por_tipo = agregar_no_banco('tipoDespesa', *filtros_banco)[['tipoDespesa', 'valorDocumento']]
+        else:
+            despesas_por_tipo = despesas_filtradas.groupby('tipoDespesa')['valorDocumento'].sum().reset_index()
         despesas_por_tipo = despesas_por_tipo.sort_values('valorDocumento', ascending=False)
         
         fig = px.bar(
-            despesas_por_tipo, 
+            limitar_categorias(despesas_por_tipo, 'tipoDespesa', max_pontos=MAX_BARRAS), 
             x='tipoDespesa', 
             y='valorDocumento',
             title='Gastos por Tipo de Despesa',
             labels={'tipoDespesa': 'Tipo de Despesa', 'valorDocumento': 'Total Gasto (R$)'},
             color='tipoDespesa',
-            text=despesas_por_tipo['valorDocumento'].apply(formatar_moeda),
             hover_data={'valorDocumento': ':,.2f'}
         )
         
+        aplicar_formato_brl(fig)
         fig.update_layout(
             xaxis_title="Tipo de Despesa",
             yaxis_title="Total Gasto (R$)",
@@ -232,49 +420,50 @@ with tab1:
         # Adicionar tabela com os dados
         with st.expander("Ver dados em formato de tabela"):
             st.dataframe(
-                despesas_por_tipo.rename(columns={
+                despesas_por_tipo.assign(valorDocumento=formatar_moeda_vetor(despesas_por_tipo['valorDocumento'])).rename(columns={
                     'tipoDespesa': 'Tipo de Despesa',
                     'valorDocumento': 'Total Gasto (R$)'
-                }).style.format({'Total Gasto (R$)': lambda x: formatar_moeda(x)}),
+                }),
                 use_container_width=True
             )
     
-    with viz_tab2:
+    with viz_tab2, secao("evolucao_temporal"):
         # Evolução temporal dos gastos
-        if len(despesas_filtradas) > 0:
-            # Agrupar por mês
-            gastos_por_mes = despesas_filtradas.groupby(['mes', 'mes_nome'])['valorDocumento'].sum().reset_index()
-            gastos_por_mes = gastos_por_mes.sort_values('mes')
-            
-            # Calcular média mensal
-            media_mensal = gastos_por_mes['valorDocumento'].mean()
+        # Agrupar por dia, semana ou mês conforme o intervalo de datas (orçamento de pontos do gráfico);
+        # o resultado fica vazio quando nenhuma despesa filtrada tem data válida
+        gastos_por_periodo, granularidade = agrupar_por_periodo(despesas_filtradas)
+        if len(gastos_por_periodo) > 0:
+            # Calcular média por período
+            media_periodo = gastos_por_periodo['valorDocumento'].mean()
+            nome_granularidade = GRANULARIDADES.get(granularidade, 'Mensal')
             
             fig = go.Figure()
             
-            # Adicionar barras para gastos mensais
+            # Adicionar barras para gastos por período
             fig.add_trace(go.Bar(
-                x=gastos_por_mes['mes_nome'],
-                y=gastos_por_mes['valorDocumento'],
-                name='Gastos Mensais',
-                text=gastos_por_mes['valorDocumento'].apply(formatar_moeda),
+                x=gastos_por_periodo['rotulo'],
+                y=gastos_por_periodo['valorDocumento'],
+                name='Gastos no Período',
+                texttemplate=TEXTO_MOEDA,
                 textposition='auto',
                 marker_color='#3498db'
             ))
             
-            # Adicionar linha para média
+            # Adicionar linha para média (apenas dois pontos, nas extremidades)
             fig.add_trace(go.Scatter(
-                x=gastos_por_mes['mes_nome'],
-                y=[media_mensal] * len(gastos_por_mes),
-                name='Média Mensal',
+                x=gastos_por_periodo['rotulo'].iloc[[0, -1]],
+                y=[media_periodo, media_periodo],
+                name=f'Média ({nome_granularidade})',
                 line=dict(color='red', dash='dash'),
-                text=[formatar_moeda(media_mensal)] * len(gastos_por_mes),
+                texttemplate=TEXTO_MOEDA,
                 mode='lines+text',
                 textposition='top center'
             ))
             
+            aplicar_formato_brl(fig, rotulos=False)
             fig.update_layout(
-                title='Evolução Mensal dos Gastos',
-                xaxis_title="Mês",
+                title=f'Evolução dos Gastos ({nome_granularidade})',
+                xaxis_title="Período",
                 yaxis_title="Total Gasto (R$)",
                 yaxis_tickformat=",.2f",
                 yaxis_tickprefix="R$ ",
@@ -286,21 +475,24 @@ with tab1:
             # Adicionar tabela com os dados
             with st.expander("Ver dados em formato de tabela"):
                 st.dataframe(
-                    gastos_por_mes.rename(columns={
-                        'mes_nome': 'Mês',
+                    gastos_por_periodo[['rotulo', 'valorDocumento']].assign(valorDocumento=formatar_moeda_vetor(gastos_por_periodo['valorDocumento'])).rename(columns={
+                        'rotulo': 'Período',
                         'valorDocumento': 'Total Gasto (R$)'
-                    }).style.format({'Total Gasto (R$)': lambda x: formatar_moeda(x)}),
+                    }),
+                    hide_index=True,
                     use_container_width=True
                 )
+        elif len(despesas_filtradas) > 0:
+            st.info("As despesas filtradas não têm data do documento válida para mostrar a evolução temporal.")
         else:
             st.info("Não há dados suficientes para mostrar a evolução temporal.")
     
-    with viz_tab3:
+    with viz_tab3, secao("distribuicao"):
         # Distribuição dos gastos
         if len(despesas_filtradas) > 0:
             # Gráfico de pizza com distribuição por tipo
             fig = px.pie(
-                despesas_por_tipo,
+                limitar_categorias(despesas_por_tipo, 'tipoDespesa', max_pontos=MAX_FATIAS_PIZZA),
                 names='tipoDespesa',
                 values='valorDocumento',
                 title='Distribuição por Tipo de Despesa',
@@ -318,7 +510,7 @@ with tab1:
                 gastos_por_partido = gastos_por_partido.sort_values('valorDocumento', ascending=False)
                 
                 fig = px.pie(
-                    gastos_por_partido,
+                    limitar_categorias(gastos_por_partido, 'siglaPartido', max_pontos=MAX_FATIAS_PIZZA),
                     names='siglaPartido',
                     values='valorDocumento',
                     title='Distribuição por Partido',
@@ -332,7 +524,7 @@ with tab1:
         else:
             st.info("Não há dados suficientes para mostrar a distribuição.")
 
-with tab2:
+with tab2, secao("detalhes"):
     st.header("Detalhes das Despesas")
 
     # Renomear colunas para exibição
@@ -348,10 +540,48 @@ with tab2:
         'siglaUf': 'UF'
     }
 
+    # Controles da tabela: apenas a página atual é enviada para o navegador
+    colDetalhes1, colDetalhes2, colDetalhes3 = st.columns([6, 3, 2])
+    
+    with colDetalhes1:
+        colunas_detalhes = st.multiselect(
+            "Colunas exibidas",
+            options=despesas_filtradas.columns.tolist(),
+            default=[coluna for coluna in nomes_colunas if coluna in despesas_filtradas.columns],
+            format_func=lambda coluna: nomes_colunas.get(coluna, coluna)
+        )
+    
+    with colDetalhes2:
+        ordenar_detalhes = st.selectbox(
+            "Ordenar por",
+            options=colunas_detalhes if colunas_detalhes else ['valorDocumento'],
+            index=colunas_detalhes.index('valorDocumento') if 'valorDocumento' in colunas_detalhes else 0,
+            format_func=lambda coluna: nomes_colunas.get(coluna, coluna)
+        )
+        ordem_crescente = st.toggle("Ordem crescente", value=False)
+    
+    with colDetalhes3:
+        tamanho_pagina = st.selectbox("Linhas por página", options=[25, 50, 100, 250], index=1)
+        pagina_detalhes = seletor_pagina(len(despesas_filtradas), tamanho_pagina, key='pagina_detalhes')
 
-    # Exibir tabela
-    st.dataframe(
+    # Ordenar e recortar a página no servidor
+    despesas_pagina = pagina_dataframe(
         despesas_filtradas,
+        colunas_detalhes if colunas_detalhes else ['valorDocumento'],
+        ordenar_detalhes,
+        ordem_crescente,
+        pagina_detalhes,
+        tamanho_pagina
+    )
+    if 'valorDocumento' in despesas_pagina.columns:
+        despesas_pagina = despesas_pagina.assign(valorDocumento=formatar_moeda_vetor(despesas_pagina['valorDocumento']))
+
+    inicio_pagina = pagina_detalhes * tamanho_pagina
+    st.caption(f"Exibindo {inicio_pagina + 1 if len(despesas_pagina) else 0}–{inicio_pagina + len(despesas_pagina)} de {len(despesas_filtradas):,} despesas")
+
+    # Exibir tabela (valores formatados só para a página atual)
+    st.dataframe(
+        despesas_pagina.rename(columns=nomes_colunas),
         hide_index=True,
         use_container_width=True,
         column_config={
@@ -364,7 +594,7 @@ with tab2:
                 "Valor (R$)",
                 help="Valor da despesa"
             ),
-            "Comprovante": st.column_config.TextColumn(
+            "Comprovante": st.column_config.LinkColumn(
                 "Comprovante",
                 help="Link para o comprovante da despesa"
             )
@@ -385,27 +615,29 @@ with tab2:
     )
 
 
-with tab3:
+with tab3, secao("analises"):
     st.header("Análises Detalhadas")
     
     # Criar abas para diferentes tipos de análises
     analise_tab1, analise_tab2, analise_tab3 = st.tabs(["Fornecedores", "Deputados", "Temporal"])
     
-    with analise_tab1:
+    with analise_tab1, secao("fornecedores"):
         st.subheader("Análise de Fornecedores")
 
-        # Calcular top fornecedores
-        top_fornecedores = (despesas_filtradas.groupby(['nomeFornecedor', 'cnpjCpfFornecedor'])
-                        ['valorDocumento']
-                        .sum()
-                        .reset_index()
-                        .sort_values('valorDocumento', ascending=False))
+        # Calcular totais por fornecedor (sem ordenar todos os grupos)
+        totais_fornecedor = totais_por_fornecedor()
 
-        # Limitar a top 20 para melhor visualização
-        top_fornecedores = top_fornecedores.head(20)
+        # Paginar o ranking de 20 em 20 fornecedores
+        pagina_fornecedores = seletor_pagina(len(totais_fornecedor), 20, key='pagina_fornecedores')
 
-        # Salvar uma cópia formatada só para exibição no texto do gráfico
-        top_fornecedores['valorDocumentoFormatado'] = top_fornecedores['valorDocumento'].apply(formatar_moeda)
+        # Calcular apenas a página exibida e buscar os nomes somente dessas linhas
+        top_fornecedores = (calcular_ranking(totais_fornecedor, 20, pagina_fornecedores)
+                        .to_frame('valorDocumento')
+                        .join(lista_fornecedores[['nomeFornecedor', 'cnpjCpfFornecedor']])
+                        .reset_index())
+
+        # Salvar uma cópia formatada só para exibição na tabela
+        top_fornecedores['valorDocumentoFormatado'] = formatar_moeda_vetor(top_fornecedores['valorDocumento'])
 
         # Renomear colunas
         top_fornecedores = top_fornecedores.rename(columns={
@@ -416,8 +648,8 @@ with tab3:
 
         # Exibir tabela
         st.dataframe(
-            top_fornecedores[['Fornecedor', 'CNPJ/CPF', 'Total Gasto (R$)']].assign(
-                **{'Total Gasto (R$)': top_fornecedores['Total Gasto (R$)'].apply(formatar_moeda)}
+            top_fornecedores[['Fornecedor', 'CNPJ/CPF', 'valorDocumentoFormatado']].rename(
+                columns={'valorDocumentoFormatado': 'Total Gasto (R$)'}
             ),
             hide_index=True,
             use_container_width=True
@@ -428,11 +660,11 @@ with tab3:
             top_fornecedores,
             x='Fornecedor',
             y='Total Gasto (R$)',
-            title='Top 20 Fornecedores por Valor Total',
-            text='valorDocumentoFormatado',
+            title=f'Top 20 Fornecedores por Valor Total (página {pagina_fornecedores + 1})',
             color='Fornecedor'
         )
 
+        aplicar_formato_brl(fig)
         fig.update_layout(
             xaxis_tickangle=45,
             showlegend=False,
@@ -451,19 +683,15 @@ with tab3:
             index=0
         )
         
-        # Filtrar despesas pelo tipo selecionado
-        despesas_tipo = despesas_filtradas[despesas_filtradas['tipoDespesa'] == tipo_para_analise]
-        
         # Calcular top fornecedores para o tipo selecionado
-        top_fornecedores_tipo = (despesas_tipo.groupby(['nomeFornecedor', 'cnpjCpfFornecedor'])
-                                ['valorDocumento']
-                                .sum()
+        top_fornecedores_tipo = (calcular_ranking(totais_por_fornecedor([tipo_para_analise]), 10)
+                                .to_frame('valorDocumento')
+                                .join(lista_fornecedores[['nomeFornecedor', 'cnpjCpfFornecedor']])
                                 .reset_index()
-                                .sort_values('valorDocumento', ascending=False)
-                                .head(10))
+                                [['nomeFornecedor', 'cnpjCpfFornecedor', 'valorDocumento']])
         
         # Formatar valores
-        top_fornecedores_tipo['valorDocumento'] = top_fornecedores_tipo['valorDocumento'].apply(formatar_moeda)
+        top_fornecedores_tipo['valorDocumento'] = formatar_moeda_vetor(top_fornecedores_tipo['valorDocumento'])
         
         # Renomear colunas
         top_fornecedores_tipo = top_fornecedores_tipo.rename(columns={
@@ -479,48 +707,53 @@ with tab3:
             use_container_width=True
         )
     
-    with analise_tab2:
+    with analise_tab2, secao("deputados"):
         st.subheader("Análise de Deputados")
         
         # Só mostrar análise de deputados se não tiver deputado selecionado
         if deputado_selecionado == "Todos":
-            # Calcular gastos por deputado
-            gastos_por_deputado = (despesas_filtradas.groupby(['id_deputado', 'nomeCivil', 'siglaPartido'])
-                                  ['valorDocumento']
-                                  .sum()
-                                  .reset_index()
-                                  .sort_values('valorDocumento', ascending=False))
+            # Calcular gastos por deputado (agrupando apenas pela chave inteira)
+            totais_deputado = agrupar_totais(despesas_filtradas, 'id_deputado')
+            dados_deputados = deputados_unicos.set_index('id')[['nomeCivil', 'siglaPartido']]
             
-            # Formatar valores
-            gastos_por_deputado['valorDocumento'] = gastos_por_deputado['valorDocumento'].apply(formatar_moeda)
+            def ranking_deputados(n, pagina=0):
+                """Página do ranking de deputados com nome, partido e valores formatados."""
+                ranking = (calcular_ranking(totais_deputado, n, pagina)
+                           .to_frame('valorDocumento')
+                           .join(dados_deputados)
+                           .reset_index())
+                ranking['valorDocumentoFormatado'] = formatar_moeda_vetor(ranking['valorDocumento'])
+                return ranking.rename(columns={
+                    'nomeCivil': 'Deputado',
+                    'siglaPartido': 'Partido',
+                    'valorDocumento': 'Total Gasto (R$)'
+                })
             
-            # Renomear colunas
-            gastos_por_deputado = gastos_por_deputado.rename(columns={
-                'nomeCivil': 'Deputado',
-                'siglaPartido': 'Partido',
-                'valorDocumento': 'Total Gasto (R$)'
-            })
+            # Paginar a tabela de deputados de 50 em 50
+            pagina_deputados = seletor_pagina(len(totais_deputado), 50, key='pagina_deputados')
+            gastos_por_deputado = ranking_deputados(50, pagina_deputados)
             
             # Exibir tabela
             st.dataframe(
-                gastos_por_deputado,
+                gastos_por_deputado[['id_deputado', 'Deputado', 'Partido', 'valorDocumentoFormatado']].rename(
+                    columns={'valorDocumentoFormatado': 'Total Gasto (R$)'}
+                ),
                 hide_index=True,
                 use_container_width=True
             )
             
-            # Gráfico de barras para top deputados
-            # Ordenar os dados em ordem decrescente pelo valor total gasto
-            top_deputados = gastos_por_deputado.sort_values('Total Gasto (R$)', ascending=False).head(20)
+            # Gráfico de barras para top deputados (ordenado pelo valor numérico)
+            top_deputados = gastos_por_deputado.head(20) if pagina_deputados == 0 else ranking_deputados(20)
             
             fig = px.bar(
                 top_deputados,
                 x='Deputado',
                 y='Total Gasto (R$)',
                 color='Partido',
-                title='Top 20 Deputados por Valor Total Gasto',
-                text='Total Gasto (R$)'
+                title='Top 20 Deputados por Valor Total Gasto'
             )
             
+            aplicar_formato_brl(fig)
             fig.update_layout(
                 xaxis_tickangle=45,
                 height=500
@@ -548,8 +781,8 @@ with tab3:
             analise_partido['gasto_medio_por_deputado'] = analise_partido['valorDocumento'] / analise_partido['num_deputados']
             
             # Formatar valores
-            analise_partido['valorDocumento'] = analise_partido['valorDocumento'].apply(formatar_moeda)
-            analise_partido['gasto_medio_por_deputado'] = analise_partido['gasto_medio_por_deputado'].apply(formatar_moeda)
+            analise_partido['valorDocumento'] = formatar_moeda_vetor(analise_partido['valorDocumento'])
+            analise_partido['gasto_medio_por_deputado'] = formatar_moeda_vetor(analise_partido['gasto_medio_por_deputado'])
             
             # Renomear colunas
             analise_partido = analise_partido.rename(columns={
@@ -568,33 +801,13 @@ with tab3:
         else:
             st.info("Selecione 'Todos' nos filtros para ver a análise de deputados.")
     
-    with analise_tab3:
+    with analise_tab3, secao("temporal"):
         st.subheader("Análise Temporal")
         
-        # Análise de gastos por dia da semana
-        despesas_filtradas['dia_semana'] = pd.to_datetime(despesas_filtradas['dataDocumento']).dt.day_name()
-        
-        # Mapear dias da semana para português
-        dias_pt = {
-            'Monday': 'Segunda',
-            'Tuesday': 'Terça',
-            'Wednesday': 'Quarta',
-            'Thursday': 'Quinta',
-            'Friday': 'Sexta',
-            'Saturday': 'Sábado',
-            'Sunday': 'Domingo'
-        }
-        
-        despesas_filtradas['dia_semana_pt'] = despesas_filtradas['dia_semana'].map(dias_pt)
-        
-        # Ordem dos dias da semana
-        ordem_dias = ['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo']
-        
-        # Calcular gastos por dia da semana
-        gastos_por_dia = (despesas_filtradas.groupby('dia_semana_pt')
-                         ['valorDocumento']
+        # Gastos por dia da semana: agrupamento pelos códigos da categoria pré-calculada, na ordem de Segunda a Domingo
+        gastos_por_dia = (despesas_filtradas.groupby('dia_semana_nome', observed=False)['valorDocumento']
                          .sum()
-                         .reindex(ordem_dias)
+                         .rename_axis('dia_semana_pt')
                          .reset_index())
         
         # Gráfico de barras para gastos por dia da semana
@@ -603,10 +816,10 @@ with tab3:
             x='dia_semana_pt',
             y='valorDocumento',
             title='Gastos por Dia da Semana',
-            labels={'dia_semana_pt': 'Dia da Semana', 'valorDocumento': 'Total Gasto (R$)'},
-            text=gastos_por_dia['valorDocumento'].apply(formatar_moeda)
+            labels={'dia_semana_pt': 'Dia da Semana', 'valorDocumento': 'Total Gasto (R$)'}
         )
         
+        aplicar_formato_brl(fig)
         fig.update_layout(
             xaxis_title="Dia da Semana",
             yaxis_title="Total Gasto (R$)",
@@ -618,9 +831,80 @@ with tab3:
         st.plotly_chart(fig, use_container_width=True)
 
 
-with tab4:
+with tab4, secao("comparativos"):
     st.header("Comparativos")
     
+    # Tendência mensal a partir das séries pré-calculadas (todos os anos carregados)
+    st.subheader("Tendência Mensal")
+    if series_mensais is None:
+        st.info("Séries mensais não encontradas. Execute a etapa do ETL: python -m etl series")
+    else:
+        # Séries comparadas conforme os filtros: deputado, partido e tipos selecionados, sempre com a geral
+        comparadas = []
+        if deputado_selecionado != "Todos":
+            comparadas.append(("deputado", str(int(id_deputado)), deputado_selecionado))
+            partido_deputado = deputados_unicos.loc[deputados_unicos['id'] == id_deputado, 'siglaPartido'].iloc[0]
+            comparadas.append(("partido", partido_deputado, f"Partido {partido_deputado}"))
+        elif partido_selecionado != "Todos":
+            comparadas.append(("partido", partido_selecionado, f"Partido {partido_selecionado}"))
+        for tipo in tipo_despesa:
+            comparadas.append(("tipo", tipo, tipo))
+        comparadas.append(("geral", "Todos", "Geral"))
+        
+        col_indicador, col_media = st.columns([3, 1])
+        with col_indicador:
+            indicador = st.radio(
+                "Indicador",
+                options=["Valor mensal", "Acumulado no ano", "Média móvel (3 meses)", "Variação sobre o ano anterior"],
+                horizontal=True
+            )
+        with col_media:
+            por_deputado = st.checkbox("Média por deputado", value=True,
+                                       help="Divide o valor de cada série pelo número de deputados dela")
+        
+        colunas_indicador = {
+            "Valor mensal": "valor",
+            "Acumulado no ano": "valor_acumulado_ano",
+            "Média móvel (3 meses)": "media_movel",
+            "Variação sobre o ano anterior": "variacao_ano_anterior",
+        }
+        coluna = colunas_indicador[indicador]
+        
+        linhas = []
+        for nivel, chave, rotulo in comparadas:
+            if (nivel, chave) not in series_mensais.index:
+                continue
+            serie = series_mensais.loc[(nivel, chave)]
+            valores = serie[coluna]
+            if por_deputado and coluna != "variacao_ano_anterior":
+                valores = valores / serie['qtdDeputados'].where(serie['qtdDeputados'] > 0)
+            linhas.append(pd.DataFrame({
+                'periodo': serie['ano'].astype(str) + "-" + serie['mes'].astype(str).str.zfill(2),
+                'valor': valores.to_numpy(),
+                'serie': rotulo
+            }))
+        
+        if linhas:
+            tendencia = pd.concat(linhas, ignore_index=True)
+            fig = px.line(
+                tendencia,
+                x='periodo',
+                y='valor',
+                color='serie',
+                markers=True,
+                labels={'periodo': 'Mês', 'valor': indicador, 'serie': 'Série'}
+            )
+            if coluna == "variacao_ano_anterior":
+                fig.update_layout(yaxis_tickformat=".0%")
+            else:
+                aplicar_formato_brl(fig, rotulos=False)
+                fig.update_layout(yaxis_tickformat=",.2f", yaxis_tickprefix="R$ ")
+            titulo = indicador
+            if por_deputado and coluna != "variacao_ano_anterior":
+                titulo += " por deputado"
+            fig.update_layout(title=titulo)
+            st.plotly_chart(fig, use_container_width=True)
+    
     # Comparativo de gastos por deputado vs. média
     if deputado_selecionado != "Todos":
         # Calcular média de gastos por deputado
@@ -641,11 +925,12 @@ with tab4:
         fig.add_trace(go.Bar(
             x=['Média Geral', deputado_selecionado],
             y=[media_geral, gastos_deputado],
-            text=[formatar_moeda(media_geral), formatar_moeda(gastos_deputado)],
+            texttemplate=TEXTO_MOEDA,
             textposition='auto',
             marker_color=['#3498db', '#e74c3c']
         ))
         
+        aplicar_formato_brl(fig, rotulos=False)
         fig.update_layout(
             title=f'Comparativo: {deputado_selecionado} vs. Média Geral',
             yaxis_title='Total Gasto (R$)',
@@ -690,7 +975,7 @@ with tab4:
             x=gastos_tipo_deputado['tipoDespesa'],
             y=gastos_tipo_deputado['valorDocumento'],
             name=deputado_selecionado,
-            text=gastos_tipo_deputado['valorDocumento'].apply(formatar_moeda),
+            texttemplate=TEXTO_MOEDA,
             textposition='auto',
             marker_color='#e74c3c'
         ))
@@ -699,11 +984,12 @@ with tab4:
             x=gastos_tipo_geral['tipoDespesa'],
             y=gastos_tipo_geral['valorDocumento'],
             name='Média Geral',
-            text=gastos_tipo_geral['valorDocumento'].apply(formatar_moeda),
+            texttemplate=TEXTO_MOEDA,
             textposition='auto',
             marker_color='#3498db'
         ))
         
+        aplicar_formato_brl(fig, rotulos=False)
         fig.update_layout(
             title=f'Comparativo por Tipo de Despesa: {deputado_selecionado} vs. Média Geral',
             barmode='group',
@@ -738,6 +1024,7 @@ with tab4:
         color='siglaPartido'
     )
     
+    aplicar_formato_brl(fig, rotulos=False)
     fig.update_layout(
         xaxis_title="Partido",
         yaxis_title="Média de Gastos por Deputado (R$)",
@@ -773,9 +1060,10 @@ with tab4:
         title='Gasto Médio por Deputado por Partido',
         labels={'siglaPartido': 'Partido', 'gasto_medio_por_deputado': 'Gasto Médio por Deputado (R$)'},
         color='siglaPartido',
-        text=proporcionalidade['num_deputados'].apply(lambda x: f"{x} deputados")
+        text=proporcionalidade['num_deputados'].astype(str) + " deputados"
     )
     
+    aplicar_formato_brl(fig, rotulos=False)
     fig.update_layout(
         xaxis_title="Partido",
         yaxis_title="Gasto Médio por Deputado (R$)",
@@ -792,7 +1080,7 @@ with tab4:
         x=proporcionalidade['siglaPartido'],
         y=proporcionalidade['valorDocumento'],
         name='Gasto Total',
-        text=proporcionalidade['valorDocumento'].apply(formatar_moeda),
+        texttemplate=TEXTO_MOEDA,
         textposition='auto',
         marker_color='#3498db'
     ))
@@ -801,11 +1089,12 @@ with tab4:
         x=proporcionalidade['siglaPartido'],
         y=proporcionalidade['gasto_medio_por_deputado'],
         name='Gasto Médio por Deputado',
-        text=proporcionalidade['gasto_medio_por_deputado'].apply(formatar_moeda),
+        texttemplate=TEXTO_MOEDA,
         textposition='auto',
         marker_color='#e74c3c'
     ))
     
+    aplicar_formato_brl(fig, rotulos=False)
     fig.update_layout(
         title='Comparação: Gasto Total vs. Gasto Médio por Deputado por Partido',
         xaxis_title="Partido",
@@ -820,11 +1109,10 @@ with tab4:
     # Comparativo de gastos por mês
     st.subheader("Comparativo Mensal")
     
-    # Calcular gastos por mês
-    gastos_mes = (despesas_filtradas.groupby(['mes', 'mes_nome'])['valorDocumento']
+    # Calcular gastos por mês (categoria ordenada: os meses já saem de Janeiro a Dezembro)
+    gastos_mes = (despesas_filtradas.groupby('mes_nome', observed=True)['valorDocumento']
                   .sum()
-                  .reset_index()
-                  .sort_values('mes'))
+                  .reset_index())
     
     # Calcular média mensal
     media_mensal = gastos_mes['valorDocumento'].mean()
@@ -836,7 +1124,7 @@ with tab4:
         x=gastos_mes['mes_nome'],
         y=gastos_mes['valorDocumento'],
         name='Gastos Mensais',
-        text=gastos_mes['valorDocumento'].apply(formatar_moeda),
+        texttemplate=TEXTO_MOEDA,
         textposition='auto',
         marker_color='#3498db'
     ))
@@ -846,11 +1134,12 @@ with tab4:
         y=[media_mensal] * len(gastos_mes),
         name='Média Mensal',
         line=dict(color='red', dash='dash'),
-        text=[formatar_moeda(media_mensal)] * len(gastos_mes),
+        texttemplate=TEXTO_MOEDA,
         mode='lines+text',
         textposition='top center'
     ))
     
+    aplicar_formato_brl(fig, rotulos=False)
     fig.update_layout(
         title='Comparativo de Gastos Mensais vs. Média',
         xaxis_title="Mês",
@@ -861,4 +1150,7 @@ with tab4:
     
     st.plotly_chart(fig, use_container_width=True)
         
-    
\ No newline at end of file
+    
+
+# Painel e registro do perfil (apenas quando ativado)
+finalizar_perfil()
@@ -11,6 +11,7 @@ from io import BytesIO
 import logging
 
 from get_deputados import carregar_lista_deputados
+from perfil import iniciar_perfil, finalizar_perfil, cache_medido
 
 # Configuração da página
 st.set_page_config(
@@ -19,6 +20,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Perfil opcional da execução (PERFIL_DASHBOARD=1 ou ?perfil=1 na URL)
+iniciar_perfil("deputados")
+
 st.caption("Os registros são referentes aos deputados em exercício no ano de 2022")
 
 # Configuração de logging
@@ -28,8 +32,15 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 bins = [18, 31, 41, 51, 61, 71, 81, 120]
 labels = ["18-30", "31-40", "41-50", "51-60", "61-70", "71-80", "81+"]
 
+# Valor do gabinete para exibição: "-" quando ausente, número quando numérico e o texto original nos demais casos
+def formatar_gabinete(valor):
+    if pd.isna(valor) or str(valor).strip().lower() in ("", "x", "-"):
+        return "-"
+    texto = str(valor).strip()
+    return int(texto) if texto.isdigit() else texto
+
 ### Coletar dados
-@st.cache_data(ttl=3600)  # Cache por 1 hora para melhorar performance
+@cache_medido("carregar_dados_deputados", ttl=3600)  # Cache por 1 hora para melhorar performance
 def carregar_dados_deputados():
     """Carrega e processa os dados dos deputados."""
     try:
@@ -284,15 +295,15 @@ with st.container(border=True):
                 dadosGabinete = st.columns([1, 1, 1, 2, 6])
                 with dadosGabinete[0]:
                     predio_gabinete = deputado_escolhido["Prédio"].iloc[0]
-                    predio_final = "-" if (pd.isna(predio_gabinete) or predio_gabinete == "x") else int(predio_gabinete)
+                    predio_final = formatar_gabinete(predio_gabinete)
                     st.metric("Predio", predio_final, border=True)
                 with dadosGabinete[1]:
                     sala_deputado = deputado_escolhido["Sala"].iloc[0]
-                    sala_final = "-" if pd.isna(sala_deputado) else int(sala_deputado) 
+                    sala_final = formatar_gabinete(sala_deputado)
                     st.metric("Sala", sala_final, border=True)
                 with dadosGabinete[2]:
                     andar_deputado = deputado_escolhido["Andar"].iloc[0]
-                    andar_final = "-" if pd.isna(andar_deputado) else int(andar_deputado) 
+                    andar_final = formatar_gabinete(andar_deputado)
                     st.metric("Andar", andar_final, border=True)
                 with dadosGabinete[3]:
                     telefone_deputado = deputado_escolhido["Telefone"].iloc[0]
@@ -303,4 +314,7 @@ with st.container(border=True):
                     email_final = "-" if pd.isna(email_deputado) else email_deputado 
                     st.metric("Email", email_final, border=True)
 
-st.caption("Dados atualizados em " + pd.Timestamp.now().strftime("%d/%m/%Y"))
\ No newline at end of file
+st.caption("Dados atualizados em " + pd.Timestamp.now().strftime("%d/%m/%Y"))
+
+# Painel e registro do perfil (apenas quando ativado)
+finalizar_perfil()
\ No newline at end of file
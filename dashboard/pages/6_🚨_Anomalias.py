@@ -0,0 +1,223 @@
+# ### Importando bibliotecas
+import logging
+
+import streamlit as st
+import plotly.express as px
+
+from get_deputados import carregar_lista_deputados
+from get_fornecedores import carregar_lista_fornecedores
+from get_anomalias import carregar_anomalias
+from ranking import seletor_pagina
+from paginacao import pagina_dataframe
+from formatacao import formatar_moeda, formatar_moeda_vetor, aplicar_formato_brl
+from perfil import iniciar_perfil, finalizar_perfil, secao, cache_medido
+
+# Configuração da página
+st.set_page_config(
+    page_title="Anomalias nas Despesas",
+    page_icon="🚨",
+    layout="wide"
+)
+
+# Perfil opcional da execução (PERFIL_DASHBOARD=1 ou ?perfil=1 na URL)
+iniciar_perfil("anomalias")
+
+TAMANHO_PAGINA = 50
+
+# Nome da linha que reúne todos os tipos de despesa nas tabelas de anomalias
+TODOS_OS_TIPOS = "Todos"
+
+# Função para carregar dados
+@cache_medido("carregar_dados_anomalias", ttl=3600)
+def carregar_dados_anomalias():
+    """Carrega as tabelas de anomalias calculadas pelo ETL, já com nome do deputado e do fornecedor."""
+    try:
+        with secao("leitura_banco"):
+            anomalias = carregar_anomalias()
+            lista_deputados = carregar_lista_deputados()
+            lista_fornecedores = carregar_lista_fornecedores()
+    except Exception as e:
+        # O erro não entra no cache: a próxima execução da página tenta ler as tabelas de novo
+        logging.error(f"Erro ao carregar as tabelas de anomalias: {e}")
+        raise
+
+    deputados = (lista_deputados.drop_duplicates(subset="id", keep="last")
+                 .set_index("id")[["nomeCivil", "siglaPartido", "siglaUf"]])
+    fornecedores = lista_fornecedores.set_index("id_fornecedor")["nomeFornecedor"]
+
+    for nome, df in anomalias.items():
+        df = df.join(deputados, on="id_deputado")
+        for coluna in ("id_fornecedor", "id_fornecedor_maior"):
+            if coluna in df.columns:
+                df[coluna.replace("id_fornecedor", "nomeFornecedor")] = df[coluna].map(fornecedores)
+        anomalias[nome] = df
+    return anomalias
+
+try:
+    anomalias = carregar_dados_anomalias()
+except Exception:
+    st.error("Tabelas de anomalias não encontradas. Execute a etapa de análise do ETL: python -m etl anomalias")
+    st.stop()
+
+resumo = anomalias["anomalias_resumo"]
+deputado_tipo = anomalias["anomalias_deputado_tipo"]
+documentos = anomalias["anomalias_documentos"]
+duplicidades = anomalias["anomalias_duplicidades"]
+concentracao = anomalias["anomalias_concentracao"]
+
+st.title("🚨 Anomalias nas Despesas")
+st.caption("Indicadores pré-calculados pelo ETL sobre todas as despesas carregadas. "
+           "Um alerta indica um gasto fora do padrão a ser verificado, não uma irregularidade.")
+
+# Filtro por partido (aplicado a todas as abas)
+partido_selecionado = st.selectbox(
+    "Escolha um partido",
+    options=["Todos"] + sorted(resumo["siglaPartido"].dropna().unique().tolist()),
+    index=0
+)
+
+def filtrar_partido(df):
+    if partido_selecionado == "Todos":
+        return df
+    return df[df["siglaPartido"] == partido_selecionado]
+
+def tabela_paginada(df, colunas, nomes_colunas, ordenar_por, key, colunas_moeda=()):
+    """Exibe só a página escolhida da tabela, ordenada de forma decrescente pela coluna indicada."""
+    pagina = seletor_pagina(len(df), TAMANHO_PAGINA, key=key)
+    df_pagina = pagina_dataframe(df, colunas, ordenar_por, False, pagina, TAMANHO_PAGINA)
+    for coluna in colunas_moeda:
+        df_pagina = df_pagina.assign(**{coluna: formatar_moeda_vetor(df_pagina[coluna])})
+    st.caption(f"{len(df):,} registros")
+    st.dataframe(df_pagina.rename(columns=nomes_colunas), hide_index=True, use_container_width=True)
+
+with secao("filtros"):
+    resumo_filtrado = filtrar_partido(resumo)
+    deputado_tipo_filtrado = filtrar_partido(deputado_tipo)
+    documentos_filtrados = filtrar_partido(documentos)
+    duplicidades_filtradas = filtrar_partido(duplicidades)
+    concentracao_filtrada = filtrar_partido(concentracao)
+
+# Métricas principais
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("Deputados com alertas", f"{int((resumo_filtrado['total_alertas'] > 0).sum()):,}", border=True)
+with col2:
+    st.metric("Documentos atípicos", f"{len(documentos_filtrados):,}",
+              help="Valor muito acima do usual para o tipo de despesa", border=True)
+with col3:
+    st.metric("Valor em possíveis duplicidades", formatar_moeda(duplicidades_filtradas["valorRepetido"].sum()),
+              border=True)
+with col4:
+    st.metric("Gastos concentrados", f"{int(concentracao_filtrada['concentrado'].sum()):,}",
+              help="Deputado e tipo de despesa com a maior parte do valor em poucos fornecedores", border=True)
+
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["📋 Resumo", "📊 Deputado x Tipo", "🧾 Documentos Atípicos",
+                                        "🔁 Duplicidades", "🏢 Concentração de Fornecedores"])
+
+with tab1, secao("resumo"):
+    st.subheader("Alertas por Deputado")
+    tabela_paginada(
+        resumo_filtrado,
+        ["nomeCivil", "siglaPartido", "siglaUf", "total_alertas", "tipos_atipicos", "documentos_atipicos",
+         "duplicidades", "tipos_concentrados", "valorTotal", "valor_repetido"],
+        {"nomeCivil": "Deputado", "siglaPartido": "Partido", "siglaUf": "UF", "total_alertas": "Alertas",
+         "tipos_atipicos": "Tipos Atípicos", "documentos_atipicos": "Documentos Atípicos",
+         "duplicidades": "Duplicidades", "tipos_concentrados": "Tipos Concentrados",
+         "valorTotal": "Total Gasto (R$)", "valor_repetido": "Valor Repetido (R$)"},
+        "total_alertas",
+        key="pagina_resumo_anomalias",
+        colunas_moeda=("valorTotal", "valor_repetido")
+    )
+
+with tab2, secao("deputado_tipo"):
+    st.subheader("Gasto do Deputado Comparado aos Demais")
+    tipos = [TODOS_OS_TIPOS] + sorted(t for t in deputado_tipo["tipoDespesa"].unique() if t != TODOS_OS_TIPOS)
+    tipo_selecionado = st.selectbox("Tipo de despesa", options=tipos, index=0)
+    por_tipo = deputado_tipo_filtrado[deputado_tipo_filtrado["tipoDespesa"] == tipo_selecionado]
+
+    fig = px.scatter(
+        por_tipo,
+        x="qtdDocumentos",
+        y="valorTotal",
+        color="atipico",
+        hover_name="nomeCivil",
+        hover_data={"zscore_robusto": ":.2f", "siglaPartido": True},
+        labels={"qtdDocumentos": "Quantidade de Documentos", "valorTotal": "Total Gasto (R$)",
+                "atipico": "Atípico", "zscore_robusto": "Escore robusto", "siglaPartido": "Partido"},
+        color_discrete_map={True: "#e74c3c", False: "#3498db"}
+    )
+    aplicar_formato_brl(fig, rotulos=False)
+    fig.update_layout(yaxis_tickprefix="R$ ", yaxis_tickformat=",.2f")
+    st.plotly_chart(fig, use_container_width=True)
+
+    tabela_paginada(
+        por_tipo,
+        ["nomeCivil", "siglaPartido", "valorTotal", "mediana_tipo", "qtdDocumentos", "zscore", "zscore_robusto"],
+        {"nomeCivil": "Deputado", "siglaPartido": "Partido", "valorTotal": "Total Gasto (R$)",
+         "mediana_tipo": "Mediana dos Deputados (R$)", "qtdDocumentos": "Documentos",
+         "zscore": "Escore z", "zscore_robusto": "Escore Robusto"},
+        "zscore_robusto",
+        key="pagina_deputado_tipo",
+        colunas_moeda=("valorTotal", "mediana_tipo")
+    )
+
+with tab3, secao("documentos"):
+    st.subheader("Documentos com Valor Atípico para o Tipo de Despesa")
+    tabela_paginada(
+        documentos_filtrados,
+        ["nomeCivil", "siglaPartido", "tipoDespesa", "nomeFornecedor", "dataDocumento", "numDocumento",
+         "valorDocumento", "razao_mediana", "zscore_robusto"],
+        {"nomeCivil": "Deputado", "siglaPartido": "Partido", "tipoDespesa": "Tipo de Despesa",
+         "nomeFornecedor": "Fornecedor", "dataDocumento": "Data", "numDocumento": "Documento",
+         "valorDocumento": "Valor (R$)", "razao_mediana": "Vezes a Mediana", "zscore_robusto": "Escore Robusto"},
+        "zscore_robusto",
+        key="pagina_documentos_atipicos",
+        colunas_moeda=("valorDocumento",)
+    )
+
+with tab4, secao("duplicidades"):
+    st.subheader("Possíveis Cobranças em Duplicidade")
+    st.caption("Mesmo deputado, fornecedor e valor com o mesmo número de documento ou na mesma data.")
+    tabela_paginada(
+        duplicidades_filtradas,
+        ["nomeCivil", "siglaPartido", "nomeFornecedor", "tipoDespesa", "criterio", "numDocumento", "dataDocumento",
+         "valorDocumento", "qtdOcorrencias", "valorRepetido"],
+        {"nomeCivil": "Deputado", "siglaPartido": "Partido", "nomeFornecedor": "Fornecedor",
+         "tipoDespesa": "Tipo de Despesa", "criterio": "Critério", "numDocumento": "Documento",
+         "dataDocumento": "Data", "valorDocumento": "Valor (R$)", "qtdOcorrencias": "Ocorrências",
+         "valorRepetido": "Valor Repetido (R$)"},
+        "valorRepetido",
+        key="pagina_duplicidades",
+        colunas_moeda=("valorDocumento", "valorRepetido")
+    )
+
+with tab5, secao("concentracao"):
+    st.subheader("Concentração dos Gastos em Fornecedores")
+    st.caption("Índice Herfindahl-Hirschman (HHI): soma dos quadrados das participações dos fornecedores; "
+               "1 indica um único fornecedor.")
+    tipo_concentracao = st.selectbox("Tipo de despesa", options=tipos, index=0, key="tipo_concentracao")
+    concentracao_tipo = concentracao_filtrada[concentracao_filtrada["tipoDespesa"] == tipo_concentracao]
+
+    fig = px.histogram(
+        concentracao_tipo,
+        x="hhi",
+        nbins=20,
+        labels={"hhi": "HHI", "count": "Deputados"}
+    )
+    fig.update_layout(yaxis_title="Deputados", bargap=0.1)
+    st.plotly_chart(fig, use_container_width=True)
+
+    tabela_paginada(
+        concentracao_tipo,
+        ["nomeCivil", "siglaPartido", "hhi", "qtdFornecedores", "qtdDocumentos", "nomeFornecedor_maior",
+         "participacao_maior", "valorTotal"],
+        {"nomeCivil": "Deputado", "siglaPartido": "Partido", "hhi": "HHI", "qtdFornecedores": "Fornecedores",
+         "qtdDocumentos": "Documentos", "nomeFornecedor_maior": "Maior Fornecedor",
+         "participacao_maior": "Participação do Maior", "valorTotal": "Total Gasto (R$)"},
+        "hhi",
+        key="pagina_concentracao",
+        colunas_moeda=("valorTotal",)
+    )
+
+# Painel e registro do perfil (apenas quando ativado)
+finalizar_perfil()
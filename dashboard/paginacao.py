@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+def _chave_ordenacao(serie, crescente):
+    """Converte a coluna em uma chave numérica (nulos sempre no final)."""
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        chave = serie.to_numpy(dtype="datetime64[ns]").view("int64").astype("float64")
+        chave[serie.isna().to_numpy()] = np.nan
+    elif pd.api.types.is_numeric_dtype(serie) and not isinstance(serie.dtype, pd.CategoricalDtype):
+        chave = serie.to_numpy(dtype="float64", na_value=np.nan)
+    else:
+        # Textos (object ou string[pyarrow] do snapshot compartilhado) e categorias: posição na ordem dos valores
+        codigos, _ = pd.factorize(serie, sort=True)
+        chave = codigos.astype("float64")
+        chave[codigos < 0] = np.nan
+
+    if not crescente:
+        chave = -chave
+    return np.where(np.isnan(chave), np.inf, chave)
+
+def indices_pagina(serie, crescente, inicio, fim):
+    """Posições das linhas entre `inicio` e `fim` na ordenação da coluna.
+
+    Usa seleção parcial (np.partition) para ordenar só as `fim` primeiras linhas.
+    Empates mantêm a ordem original, então as páginas não repetem nem pulam linhas.
+    """
+    chave = _chave_ordenacao(serie, crescente)
+    fim = min(fim, len(chave))
+    if fim <= inicio:
+        return np.array([], dtype=np.int64)
+
+    if fim < len(chave):
+        limite = np.partition(chave, fim - 1)[fim - 1]
+        menores = np.flatnonzero(chave < limite)
+        iguais = np.flatnonzero(chave == limite)[:fim - len(menores)]
+        selecionadas = np.concatenate([menores, iguais])
+    else:
+        selecionadas = np.arange(len(chave))
+
+    ordem = selecionadas[np.lexsort((selecionadas, chave[selecionadas]))]
+    return ordem[inicio:fim]
+
+def pagina_dataframe(df, colunas, ordenar_por, crescente, pagina, tamanho):
+    """Retorna somente as linhas e colunas da página pedida (pagina inicia em 0)."""
+    inicio = pagina * tamanho
+    posicoes = indices_pagina(df[ordenar_por], crescente, inicio, inicio + tamanho)
+    return df.iloc[posicoes][colunas]
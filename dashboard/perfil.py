@@ -0,0 +1,186 @@
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+# Perfil opcional do dashboard: ativado com PERFIL_DASHBOARD=1 (ou "cprofile"/"pyinstrument")
+# ou pelo parâmetro de URL ?perfil=1 (ou ?perfil=cprofile / ?perfil=pyinstrument)
+MODOS_COLETA = ("cprofile", "pyinstrument")
+
+PASTA_LOGS = os.getenv("PATH_LOGS") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "logs")
+
+_CHAVE_ESTADO = "_perfil_execucao"
+
+# Marca, por thread, quais carregadores realmente executaram (cache miss) durante a chamada
+_execucoes = threading.local()
+
+def modo_perfil():
+    """Modo de perfil pedido pela variável de ambiente ou pela URL ('' quando desativado)."""
+    modo = st.query_params.get("perfil") or os.getenv("PERFIL_DASHBOARD", "")
+    modo = modo.strip().lower()
+    if modo in ("", "0", "false", "nao", "não"):
+        return ""
+    return modo if modo in MODOS_COLETA else "secoes"
+
+def _perfil_atual():
+    return st.session_state.get(_CHAVE_ESTADO)
+
+def iniciar_perfil(pagina):
+    """Começa o perfil de uma execução da página; não faz nada se o perfil estiver desativado."""
+    modo = modo_perfil()
+    if not modo:
+        st.session_state.pop(_CHAVE_ESTADO, None)
+        return
+
+    perfil = {
+        "pagina": pagina,
+        "modo": modo,
+        "inicio": time.perf_counter(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "secoes": [],
+        "pilha": [],
+        "cache": {},
+        "coletor": None,
+    }
+
+    if modo == "cprofile":
+        perfil["coletor"] = cProfile.Profile()
+        perfil["coletor"].enable()
+    elif modo == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logging.warning("pyinstrument não está instalado; usando apenas o tempo das seções.")
+        else:
+            perfil["coletor"] = Profiler()
+            perfil["coletor"].start()
+
+    st.session_state[_CHAVE_ESTADO] = perfil
+
+@contextmanager
+def secao(nome):
+    """Mede o tempo de um trecho da página; seções aninhadas recebem o nome completo (pai/filho)."""
+    perfil = _perfil_atual()
+    if perfil is None:
+        yield
+        return
+
+    perfil["pilha"].append(nome)
+    # Registrada na ordem de início, para que a seção pai apareça antes das filhas
+    registro = {"secao": "/".join(perfil["pilha"]), "tempo_ms": 0.0}
+    perfil["secoes"].append(registro)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registro["tempo_ms"] = (time.perf_counter() - inicio) * 1000
+        perfil["pilha"].pop()
+
+def cache_medido(nome, recurso=False, **opcoes_cache):
+    """Substitui @st.cache_data (ou @st.cache_resource, com recurso=True) contando acertos e faltas de cache e o
+    tempo de cada chamada."""
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def executar(*args, **kwargs):
+            # Só chega aqui quando o resultado não está em cache
+            _execucoes.nomes = getattr(_execucoes, "nomes", set()) | {nome}
+            return funcao(*args, **kwargs)
+
+        em_cache = (st.cache_resource if recurso else st.cache_data)(**opcoes_cache)(executar)
+
+        @functools.wraps(funcao)
+        def chamar(*args, **kwargs):
+            perfil = _perfil_atual()
+            if perfil is None:
+                return em_cache(*args, **kwargs)
+
+            _execucoes.nomes = set()
+            with secao(nome):
+                resultado = em_cache(*args, **kwargs)
+            contagem = perfil["cache"].setdefault(nome, {"acertos": 0, "faltas": 0})
+            contagem["faltas" if nome in _execucoes.nomes else "acertos"] += 1
+            return resultado
+
+        chamar.clear = em_cache.clear
+        return chamar
+    return decorador
+
+def _resumo_coletor(perfil, pasta):
+    """Para o coletor e grava o rastro desta execução; devolve (texto resumido, arquivo)."""
+    coletor = perfil["coletor"]
+    if coletor is None:
+        return "", None
+
+    os.makedirs(pasta, exist_ok=True)
+    prefixo = os.path.join(pasta, f"perfil_{perfil['pagina']}_{datetime.now():%Y%m%d_%H%M%S_%f}")
+
+    if perfil["modo"] == "cprofile":
+        coletor.disable()
+        arquivo = f"{prefixo}.prof"
+        coletor.dump_stats(arquivo)
+        texto = io.StringIO()
+        pstats.Stats(coletor, stream=texto).sort_stats("cumulative").print_stats(25)
+        return texto.getvalue(), arquivo
+
+    coletor.stop()
+    arquivo = f"{prefixo}.html"
+    with open(arquivo, "w", encoding="utf-8") as saida:
+        saida.write(coletor.output_html())
+    return coletor.output_text(unicode=True, color=False), arquivo
+
+def finalizar_perfil():
+    """Encerra o perfil da execução, mostra o painel de tempos e grava o registro em logs/perfil_dashboard.jsonl."""
+    perfil = st.session_state.pop(_CHAVE_ESTADO, None)
+    if perfil is None:
+        return
+
+    total_ms = (time.perf_counter() - perfil["inicio"]) * 1000
+    pasta = os.path.join(PASTA_LOGS, "perfil")
+    try:
+        texto_coletor, arquivo_coletor = _resumo_coletor(perfil, pasta)
+    except Exception as e:
+        logging.error(f"Erro ao gravar o rastro do perfil: {e}")
+        texto_coletor, arquivo_coletor = "", None
+
+    registro = {
+        "data": perfil["data"],
+        "pagina": perfil["pagina"],
+        "modo": perfil["modo"],
+        "total_ms": round(total_ms, 2),
+        "secoes": [dict(s, tempo_ms=round(s["tempo_ms"], 2)) for s in perfil["secoes"]],
+        "cache": perfil["cache"],
+        "rastro": arquivo_coletor,
+    }
+    try:
+        os.makedirs(PASTA_LOGS, exist_ok=True)
+        with open(os.path.join(PASTA_LOGS, "perfil_dashboard.jsonl"), "a", encoding="utf-8") as arquivo:
+            arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    except Exception as e:
+        logging.error(f"Erro ao gravar o registro de perfil: {e}")
+
+    with st.expander(f"⏱️ Perfil desta execução: {total_ms:,.0f} ms", expanded=False):
+        secoes = pd.DataFrame(registro["secoes"], columns=["secao", "tempo_ms"])
+        secoes["% do total"] = (secoes["tempo_ms"] / total_ms * 100).round(1)
+        st.dataframe(secoes, hide_index=True, use_container_width=True)
+
+        if perfil["cache"]:
+            st.caption("Cache dos carregadores de dados")
+            st.dataframe(
+                pd.DataFrame.from_dict(perfil["cache"], orient="index").rename_axis("carregador").reset_index(),
+                hide_index=True
+            )
+
+        if texto_coletor:
+            st.caption(f"Rastro ({perfil['modo']}) salvo em {arquivo_coletor}")
+            st.code(texto_coletor, language="text")
+
@@ -0,0 +1,36 @@
+import math
+
+import streamlit as st
+
+def agrupar_totais(df, chave, coluna_valor='valorDocumento'):
+    """Soma os valores por chave, sem ordenar o resultado."""
+    return df.groupby(chave, sort=False, observed=True)[coluna_valor].sum()
+
+def calcular_ranking(totais, n=20, pagina=0):
+    """Retorna a página `pagina` (iniciando em 0) do ranking dos maiores totais.
+
+    Usa seleção parcial (nlargest) em vez de ordenar todos os grupos: apenas os
+    n * (pagina + 1) maiores valores são ordenados.
+    """
+    inicio = n * pagina
+    return totais.nlargest(inicio + n).iloc[inicio:]
+
+def seletor_pagina(total_itens, tamanho_pagina, key):
+    """Campo para navegar pelas páginas de um ranking. Retorna a página escolhida (iniciando em 0)."""
+    total_paginas = max(1, math.ceil(total_itens / tamanho_pagina))
+    if total_paginas == 1:
+        return 0
+
+    # Quando os filtros reduzem o total de páginas, volta para a última página válida
+    if st.session_state.get(key, 1) > total_paginas:
+        st.session_state[key] = total_paginas
+
+    pagina = st.number_input(
+        f"Página (de {total_paginas})",
+        min_value=1,
+        max_value=total_paginas,
+        value=1,
+        step=1,
+        key=key
+    )
+    return int(pagina) - 1
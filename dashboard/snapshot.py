@@ -0,0 +1,91 @@
+import os
+import shutil
+import logging
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from sqlalchemy import inspect, text
+
+from conexao import criar_engine, RAIZ_PROJETO
+
+# Snapshot em disco dos DataFrames já processados pelas páginas, em Arrow IPC (Feather v2) sem compressão, que pode
+# ser mapeado em memória. Cada versão dos dados (tabela versao_dados, gravada ao final de cada execução do ETL) tem
+# sua própria pasta; ao gravar uma versão nova as anteriores são apagadas.
+PASTA_SNAPSHOT = os.getenv("SNAPSHOT_PATH_ENV") or os.path.join(RAIZ_PROJETO, "snapshot_dashboard")
+
+# Modo compartilhado: os processos do servidor usam os DataFrames mapeados do snapshot, sem cópia própria por processo
+COMPARTILHADO = os.getenv("SNAPSHOT_COMPARTILHADO_ENV", "").strip().lower() in ("1", "true", "sim")
+
+# Formato dos DataFrames gravados: incrementar quando o processamento feito nas páginas mudar
+FORMATO_SNAPSHOT = 2
+
+def carregar_versao_dados():
+    """Versão dos dados carregados pelo ETL (None em bancos gravados antes da tabela versao_dados)."""
+    # Conectando no banco de dados
+    engine = criar_engine()
+
+    if not inspect(engine).has_table("versao_dados"):
+        return None
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT MAX(versao) FROM versao_dados")).scalar()
+
+def _pasta_versao(versao):
+    return os.path.join(PASTA_SNAPSHOT, f"v{FORMATO_SNAPSHOT}_{versao}")
+
+def _arquivo(versao, chave, nome):
+    return os.path.join(_pasta_versao(versao), f"{chave}_{nome}.arrow")
+
+def _tipo_compartilhado(tipo):
+    # Textos ficam como string[pyarrow], que usa os buffers mapeados em vez de criar um objeto Python por valor
+    if pa.types.is_string(tipo) or pa.types.is_large_string(tipo):
+        return pd.StringDtype("pyarrow")
+    return None
+
+def ler_snapshot(chave, versao, nomes, compartilhado=False):
+    """DataFrames gravados para a chave na versão dos dados, na ordem de nomes (None quando não há snapshot).
+
+    Os arquivos são mapeados em memória; com split_blocks as colunas numéricas sem nulos não são copiadas.
+    Com compartilhado=True os textos também são lidos sem cópia: as páginas dos vários processos do servidor
+    compartilham as mesmas páginas do arquivo no cache do sistema operacional. Os arrays devolvidos são somente
+    leitura e não devem ser alterados.
+    """
+    if versao is None:
+        return None
+    arquivos = [_arquivo(versao, chave, nome) for nome in nomes]
+    if not all(os.path.exists(arquivo) for arquivo in arquivos):
+        return None
+    try:
+        tipos = _tipo_compartilhado if compartilhado else None
+        return tuple(feather.read_table(arquivo, memory_map=True).to_pandas(split_blocks=True, types_mapper=tipos)
+                     for arquivo in arquivos)
+    except Exception as e:
+        logging.warning(f"Snapshot {chave} da versão {versao} ilegível; recarregando do banco: {e}")
+        return None
+
+def gravar_snapshot(chave, versao, dataframes):
+    """Grava os DataFrames (por nome) da chave na pasta da versão e apaga as pastas de versões anteriores.
+
+    Falhas só geram aviso: o snapshot acelera a próxima inicialização, mas a página funciona sem ele.
+    """
+    if versao is None:
+        return
+    try:
+        pasta = _pasta_versao(versao)
+        os.makedirs(pasta, exist_ok=True)
+        for nome, df in dataframes.items():
+            arquivo = _arquivo(versao, chave, nome)
+            # Gravação em arquivo temporário e renomeação atômica: outra sessão ou processo nunca lê um arquivo pela
+            # metade, e quem já mapeou a versão anterior continua com ela até trocar de versão
+            temporario = f"{arquivo}.{os.getpid()}.tmp"
+            feather.write_feather(pa.Table.from_pandas(df), temporario, compression="uncompressed")
+            os.replace(temporario, arquivo)
+
+        # Pastas de outras versões (ou de outro formato) não serão mais lidas
+        for outra in os.listdir(PASTA_SNAPSHOT):
+            caminho = os.path.join(PASTA_SNAPSHOT, outra)
+            if outra.startswith("v") and os.path.isdir(caminho) and caminho != pasta:
+                shutil.rmtree(caminho, ignore_errors=True)
+        logging.info(f"Snapshot {chave} gravado em {pasta}")
+    except Exception as e:
+        logging.warning(f"Não foi possível gravar o snapshot {chave}: {e}")
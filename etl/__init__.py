@@ -0,0 +1,2 @@
+# Pacote do ETL dos dados abertos da Câmara dos Deputados.
+# Execução: python -m etl todos  (ou as etapas deputados, detalhes, despesas, views)
@@ -0,0 +1,169 @@
+import os
+import signal
+import argparse
+import logging
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+from sqlalchemy import inspect, text
+
+from etl.config import configurar_logging, criar_engine, ANO_DESPESAS
+from etl.cli import ETAPAS, executar
+
+# Intervalo entre execuções de cada etapa (s, m, h ou d). Deputados e detalhes mudam pouco; despesas são
+# publicadas todo dia. Pode ser sobrescrito pela variável ETL_AGENDA ou por --agenda.
+AGENDA_PADRAO = "deputados=7d,detalhes=7d,despesas=1d,views=1d,anomalias=1d,series=1d"
+
+# Etapas calculadas a partir das tabelas de outras: são refeitas sempre que uma delas é atualizada
+DEPENDENCIAS = {
+    "views": ("deputados", "detalhes"),
+    "anomalias": ("despesas",),
+    "series": ("despesas", "deputados"),
+}
+
+UNIDADES = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+def ler_agenda(texto):
+    """Converte 'etapa=intervalo,...' (ex.: despesas=1d,deputados=12h) em {etapa: timedelta}.
+
+    Etapas fora da agenda só são executadas quando uma dependência é atualizada.
+    """
+    agenda = {}
+    for item in texto.split(","):
+        if not item.strip():
+            continue
+        etapa, _, intervalo = item.partition("=")
+        etapa, intervalo = etapa.strip(), intervalo.strip().lower()
+        if etapa not in ETAPAS or not intervalo[:-1].isdigit() or intervalo[-1:] not in UNIDADES:
+            raise ValueError(f"Item inválido na agenda do ETL: '{item}' (formato etapa=N[s|m|h|d])")
+        agenda[etapa] = timedelta(**{UNIDADES[intervalo[-1]]: int(intervalo[:-1])})
+    return agenda
+
+def ultimas_execucoes(engine):
+    """Fim da última execução com sucesso de cada etapa, segundo o histórico etl_execucoes."""
+    if not inspect(engine).has_table("etl_execucoes"):
+        return {}
+    try:
+        df_execucoes = pd.read_sql("SELECT etapas, fim FROM etl_execucoes WHERE status = 'sucesso'", engine)
+    except Exception as e:
+        logging.error(f"Erro ao ler o histórico de execuções do ETL: {e}")
+        raise
+
+    ultimas = {}
+    for etapas, fim in zip(df_execucoes["etapas"], df_execucoes["fim"]):
+        fim = datetime.fromisoformat(fim)
+        for etapa in etapas.split(","):
+            if etapa not in ultimas or fim > ultimas[etapa]:
+                ultimas[etapa] = fim
+    return ultimas
+
+def despesas_ano_completo(engine, ano):
+    """Indica se alguma execução com sucesso carregou as despesas do ano inteiro (sem --meses)."""
+    inspetor = inspect(engine)
+    if not inspetor.has_table("etl_execucoes"):
+        return False
+    # Históricos gravados antes da coluna meses só têm cargas do ano inteiro
+    colunas = {coluna["name"] for coluna in inspetor.get_columns("etl_execucoes")}
+    filtro_meses = " AND meses IS NULL" if "meses" in colunas else ""
+    try:
+        df_execucoes = pd.read_sql(
+            text(f"SELECT etapas FROM etl_execucoes WHERE status = 'sucesso' AND ano = :ano{filtro_meses}"),
+            engine, params={"ano": int(ano)}
+        )
+    except Exception as e:
+        logging.error(f"Erro ao ler o histórico de execuções do ETL: {e}")
+        raise
+    return any("despesas" in etapas.split(",") for etapas in df_execucoes["etapas"])
+
+def etapas_pendentes(agenda, ultimas, agora=None):
+    """Etapas a executar agora, na ordem do ETL.
+
+    Uma etapa está pendente quando nunca foi executada com sucesso, quando seu intervalo na agenda já passou ou
+    quando alguma dependência foi (ou será, nesta mesma execução) atualizada depois dela.
+    """
+    agora = agora or datetime.now()
+    pendentes = []
+    for etapa in ETAPAS:
+        ultima = ultimas.get(etapa)
+        vencida = etapa in agenda and (ultima is None or agora - ultima >= agenda[etapa])
+        dependencias = DEPENDENCIAS.get(etapa, ())
+        desatualizada = any(
+            dependencia in pendentes or (dependencia in ultimas and (ultima is None or ultimas[dependencia] > ultima))
+            for dependencia in dependencias
+        )
+        if vencida or desatualizada:
+            pendentes.append(etapa)
+    return pendentes
+
+def meses_recentes(ano, quantidade, hoje=None):
+    """Últimos meses do ano até o mês atual (None, ano inteiro, para anos já encerrados)."""
+    hoje = hoje or datetime.now()
+    if not quantidade or ano != hoje.year:
+        return None
+    return list(range(max(1, hoje.month - quantidade + 1), hoje.month + 1))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m etl.agendador",
+                                     description="Executa as etapas do ETL continuamente, conforme a agenda de cada uma")
+    parser.add_argument("--agenda", default=os.getenv("ETL_AGENDA") or AGENDA_PADRAO,
+                        help="Intervalo de cada etapa, ex.: despesas=1d,deputados=7d (padrão: ETL_AGENDA ou %(default)s)")
+    parser.add_argument("--ano", type=int, default=ANO_DESPESAS, help="Ano das despesas (padrão: %(default)s)")
+    parser.add_argument("--paralelo", type=int, default=1,
+                        help="Requisições simultâneas nas etapas por deputado (padrão: %(default)s)")
+    parser.add_argument("--meses-recentes", type=int,
+                        help="Depois da primeira carga do ano, buscar na API só os últimos N meses das despesas")
+    parser.add_argument("--intervalo-verificacao", type=int, default=60,
+                        help="Segundos entre as verificações da agenda (padrão: %(default)s)")
+    parser.add_argument("--espera-falha", type=int, default=900,
+                        help="Segundos antes de tentar de novo depois de uma execução com erro (padrão: %(default)s)")
+    parser.add_argument("--sem-landing", action="store_true",
+                        help="Não guardar as respostas brutas da API na zona de pouso")
+    parser.add_argument("--uma-vez", action="store_true",
+                        help="Executa as etapas pendentes uma única vez e termina (para uso com cron)")
+    args = parser.parse_args(argv)
+
+    configurar_logging()
+    agenda = ler_agenda(args.agenda)
+    engine = criar_engine()
+
+    # Encerramento gracioso: o primeiro sinal só impede novas execuções e a execução em andamento termina
+    # normalmente; o segundo interrompe a execução (a trava é liberada e o erro fica no histórico)
+    parar = threading.Event()
+
+    def encerrar(sinal, frame):
+        if parar.is_set():
+            raise KeyboardInterrupt
+        logging.info(f"Sinal {signal.Signals(sinal).name} recebido; o agendador termina após a execução atual")
+        parar.set()
+
+    signal.signal(signal.SIGTERM, encerrar)
+    signal.signal(signal.SIGINT, encerrar)
+
+    logging.info(f"Agendador do ETL iniciado: {args.agenda}")
+    proxima_tentativa = datetime.min
+    while not parar.is_set():
+        if datetime.now() >= proxima_tentativa:
+            ultimas = ultimas_execucoes(engine)
+            etapas = etapas_pendentes(agenda, ultimas)
+            if etapas:
+                logging.info(f"Etapas pendentes: {', '.join(etapas)}")
+                # A carga parcial só vale com o ano completo já gravado por uma execução anterior do mesmo ano
+                meses = meses_recentes(args.ano, args.meses_recentes)
+                if meses and not despesas_ano_completo(engine, args.ano):
+                    logging.info(f"Despesas de {args.ano} ainda sem carga completa; buscando o ano inteiro")
+                    meses = None
+                try:
+                    executar(engine, etapas, args.ano, args.paralelo, "api", not args.sem_landing, meses)
+                except Exception as e:
+                    # O agendador continua; a falha está no log e no histórico de execuções
+                    logging.error(f"Execução agendada do ETL falhou; nova tentativa em {args.espera_falha}s: {e}")
+                    proxima_tentativa = datetime.now() + timedelta(seconds=args.espera_falha)
+        if args.uma_vez:
+            break
+        parar.wait(args.intervalo_verificacao)
+
+    logging.info("Agendador do ETL encerrado")
+
+if __name__ == "__main__":
+    main()
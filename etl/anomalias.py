@@ -0,0 +1,162 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Escore robusto (mediana/MAD) acima do qual um valor é marcado como atípico
+LIMITE_ESCORE_ROBUSTO = float(os.getenv("ETL_LIMITE_ESCORE_ROBUSTO") or "3.5")
+
+# Índice Herfindahl-Hirschman (0 a 1) a partir do qual os gastos são considerados concentrados
+LIMITE_HHI = float(os.getenv("ETL_LIMITE_HHI") or "0.25")
+
+# Mínimo de documentos para avaliar a concentração (com poucos documentos um único fornecedor é esperado)
+MIN_DOCUMENTOS_CONCENTRACAO = 5
+
+# Nome usado nas linhas que consideram todos os tipos de despesa
+TODOS_OS_TIPOS = "Todos"
+
+# Constante que torna o MAD comparável ao desvio padrão em dados normais
+_FATOR_MAD = 0.6745
+
+def escores(valores, grupos):
+    """Escore z e escore robusto de cada valor em relação ao seu grupo (vetorizado com groupby.transform).
+
+    Grupos sem variação (desvio ou MAD zero) ficam com escore nulo.
+    """
+    agrupado = valores.groupby(grupos, sort=False, observed=True)
+    media = agrupado.transform("mean")
+    desvio = agrupado.transform("std").replace(0, np.nan)
+    mediana = agrupado.transform("median")
+    mad = (valores - mediana).abs().groupby(grupos, sort=False, observed=True).transform("median").replace(0, np.nan)
+    return (valores - media) / desvio, _FATOR_MAD * (valores - mediana) / mad
+
+def anomalias_deputado_tipo(df_gastos):
+    """Total de cada deputado por tipo de despesa (e no geral) comparado aos demais deputados."""
+    por_tipo = (df_gastos.groupby(["id_deputado", "tipoDespesa"], as_index=False, observed=True)
+                .agg(valorTotal=("valorDocumento", "sum"), qtdDocumentos=("valorDocumento", "size")))
+    geral = (df_gastos.groupby("id_deputado", as_index=False)
+             .agg(valorTotal=("valorDocumento", "sum"), qtdDocumentos=("valorDocumento", "size"))
+             .assign(tipoDespesa=TODOS_OS_TIPOS))
+    df = pd.concat([por_tipo, geral[por_tipo.columns]], ignore_index=True)
+
+    df["zscore"], df["zscore_robusto"] = escores(df["valorTotal"], df["tipoDespesa"])
+    df["mediana_tipo"] = df.groupby("tipoDespesa")["valorTotal"].transform("median")
+    df["atipico"] = df["zscore_robusto"] > LIMITE_ESCORE_ROBUSTO
+    return df
+
+def anomalias_documentos(df_gastos):
+    """Documentos com valor atípico para o tipo de despesa (apenas os marcados são guardados).
+
+    Os escores usam o logaritmo do valor: valores de documentos são muito assimétricos e, na escala original,
+    boa parte dos documentos comuns de valor alto seria marcada.
+    """
+    log_valor = np.log1p(df_gastos["valorDocumento"].clip(lower=0))
+    zscore, zscore_robusto = escores(log_valor, df_gastos["tipoDespesa"])
+    mediana = df_gastos.groupby("tipoDespesa")["valorDocumento"].transform("median")
+    atipicos = (zscore_robusto > LIMITE_ESCORE_ROBUSTO).to_numpy()
+
+    colunas = ["id_deputado", "tipoDespesa", "id_fornecedor", "ano", "mes", "dataDocumento",
+               "codDocumento", "numDocumento", "valorDocumento"]
+    return df_gastos.loc[atipicos, colunas].assign(
+        zscore=zscore[atipicos],
+        zscore_robusto=zscore_robusto[atipicos],
+        razao_mediana=(df_gastos["valorDocumento"] / mediana.replace(0, np.nan))[atipicos],
+    ).reset_index(drop=True)
+
+def _grupos_repetidos(df, chave, criterio):
+    repetidos = df[df.duplicated(subset=chave, keep=False)]
+    return (repetidos.groupby(chave, as_index=False, observed=True)
+            .agg(qtdOcorrencias=("valorDocumento", "size"),
+                 primeiraData=("dataDocumento", "min"),
+                 ultimaData=("dataDocumento", "max"),
+                 tipoDespesa=("tipoDespesa", "first"))
+            .assign(criterio=criterio))
+
+def duplicidades(df_gastos):
+    """Possíveis cobranças em duplicidade de um mesmo deputado.
+
+    - numero_documento: mesmo fornecedor, número de documento e valor;
+    - fornecedor_data_valor: mesmo fornecedor, data e valor (documentos sem número ou com números diferentes).
+    """
+    colunas = ["id_deputado", "id_fornecedor", "numDocumento", "dataDocumento", "valorDocumento", "tipoDespesa"]
+    df = df_gastos[colunas].copy()
+    df["numDocumento"] = df["numDocumento"].fillna("").astype(str).str.strip()
+    df = df[df["valorDocumento"] > 0]
+
+    chave_numero = ["id_deputado", "id_fornecedor", "numDocumento", "valorDocumento"]
+    com_numero = df[~df["numDocumento"].isin(["", "0", "S/N"])]
+    por_numero = _grupos_repetidos(com_numero, chave_numero, "numero_documento")
+
+    # Documentos já apontados pelo número não são contados de novo pela data
+    repetidos_numero = df.index.isin(com_numero.index[com_numero.duplicated(subset=chave_numero, keep=False)])
+    por_data = _grupos_repetidos(df[~repetidos_numero & df["dataDocumento"].notna()],
+                                 ["id_deputado", "id_fornecedor", "dataDocumento", "valorDocumento"],
+                                 "fornecedor_data_valor")
+
+    df_duplicidades = pd.concat([por_numero, por_data], ignore_index=True)
+    df_duplicidades["valorRepetido"] = df_duplicidades["valorDocumento"] * (df_duplicidades["qtdOcorrencias"] - 1)
+    return df_duplicidades[["id_deputado", "id_fornecedor", "tipoDespesa", "criterio", "numDocumento", "dataDocumento",
+                            "valorDocumento", "qtdOcorrencias", "valorRepetido", "primeiraData", "ultimaData"]]
+
+def concentracao_fornecedores(df_gastos):
+    """Concentração dos gastos de cada deputado em fornecedores (HHI e participação do maior), por tipo e no geral."""
+    por_fornecedor = (df_gastos[df_gastos["valorDocumento"] > 0]
+                      .groupby(["id_deputado", "tipoDespesa", "id_fornecedor"], as_index=False, observed=True)
+                      .agg(valor=("valorDocumento", "sum"), qtd=("valorDocumento", "size")))
+    geral = (por_fornecedor.groupby(["id_deputado", "id_fornecedor"], as_index=False)
+             .agg(valor=("valor", "sum"), qtd=("qtd", "sum"))
+             .assign(tipoDespesa=TODOS_OS_TIPOS))
+    df = pd.concat([por_fornecedor, geral[por_fornecedor.columns]], ignore_index=True)
+
+    chave = ["id_deputado", "tipoDespesa"]
+    df["participacao"] = df["valor"] / df.groupby(chave)["valor"].transform("sum")
+    df["participacao2"] = df["participacao"] ** 2
+
+    # Linha do maior fornecedor de cada grupo
+    maiores = df.loc[df.groupby(chave)["valor"].idxmax(), chave + ["id_fornecedor", "participacao"]]
+    df_concentracao = (df.groupby(chave, as_index=False)
+                       .agg(valorTotal=("valor", "sum"), qtdDocumentos=("qtd", "sum"),
+                            qtdFornecedores=("id_fornecedor", "size"), hhi=("participacao2", "sum"))
+                       .merge(maiores.rename(columns={"id_fornecedor": "id_fornecedor_maior",
+                                                      "participacao": "participacao_maior"}), on=chave))
+    df_concentracao["concentrado"] = ((df_concentracao["hhi"] >= LIMITE_HHI) &
+                                      (df_concentracao["qtdDocumentos"] >= MIN_DOCUMENTOS_CONCENTRACAO))
+    return df_concentracao
+
+def resumo_anomalias(df_deputado_tipo, df_documentos, df_duplicidades, df_concentracao):
+    """Uma linha por deputado com a contagem e o valor de cada tipo de anomalia, para ordenar a lista no dashboard."""
+    geral = df_deputado_tipo[df_deputado_tipo["tipoDespesa"] == TODOS_OS_TIPOS].set_index("id_deputado")
+    por_tipo = df_deputado_tipo[df_deputado_tipo["tipoDespesa"] != TODOS_OS_TIPOS]
+    concentracao_geral = df_concentracao[df_concentracao["tipoDespesa"] == TODOS_OS_TIPOS].set_index("id_deputado")
+    concentracao_tipos = df_concentracao[df_concentracao["tipoDespesa"] != TODOS_OS_TIPOS]
+
+    df_resumo = pd.DataFrame({
+        "valorTotal": geral["valorTotal"],
+        "zscore_robusto_total": geral["zscore_robusto"],
+        "tipos_atipicos": por_tipo[por_tipo["atipico"]].groupby("id_deputado").size(),
+        "documentos_atipicos": df_documentos.groupby("id_deputado").size(),
+        "valor_documentos_atipicos": df_documentos.groupby("id_deputado")["valorDocumento"].sum(),
+        "duplicidades": df_duplicidades.groupby("id_deputado").size(),
+        "valor_repetido": df_duplicidades.groupby("id_deputado")["valorRepetido"].sum(),
+        "hhi_geral": concentracao_geral["hhi"],
+        "tipos_concentrados": concentracao_tipos[concentracao_tipos["concentrado"]].groupby("id_deputado").size(),
+    })
+    contagens = ["tipos_atipicos", "documentos_atipicos", "duplicidades", "tipos_concentrados"]
+    df_resumo[contagens] = df_resumo[contagens].fillna(0).astype("int64")
+    df_resumo[["valor_documentos_atipicos", "valor_repetido"]] = df_resumo[["valor_documentos_atipicos", "valor_repetido"]].fillna(0.0)
+    df_resumo["total_alertas"] = df_resumo[contagens].sum(axis=1)
+    return df_resumo.rename_axis("id_deputado").reset_index()
+
+def calcular_anomalias(df_gastos):
+    """Tabelas de anomalias calculadas sobre todas as despesas carregadas, por nome de tabela."""
+    df_deputado_tipo = anomalias_deputado_tipo(df_gastos)
+    df_documentos = anomalias_documentos(df_gastos)
+    df_duplicidades = duplicidades(df_gastos)
+    df_concentracao = concentracao_fornecedores(df_gastos)
+    return {
+        "anomalias_deputado_tipo": df_deputado_tipo,
+        "anomalias_documentos": df_documentos,
+        "anomalias_duplicidades": df_duplicidades,
+        "anomalias_concentracao": df_concentracao,
+        "anomalias_resumo": resumo_anomalias(df_deputado_tipo, df_documentos, df_duplicidades, df_concentracao),
+    }
@@ -0,0 +1,70 @@
+import json
+import time
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from etl.config import TENTATIVAS_REQUISICAO, ESPERA_RETENTATIVA
+from etl.metricas import metricas
+
+# orjson, quando instalado, decodifica as respostas direto dos bytes e bem mais rápido que o módulo json
+try:
+    import orjson
+    ler_json = orjson.loads
+except ImportError:
+    ler_json = json.loads
+
+# Sessão compartilhada para reaproveitar as conexões HTTP entre requisições (inclusive entre threads)
+sessao = requests.Session()
+sessao.mount("http://", HTTPAdapter(pool_maxsize=32))
+sessao.mount("https://", HTTPAdapter(pool_maxsize=32))
+
+# Função para realizar uma requisição GET registrando as métricas da etapa e repetindo em caso de falha temporária.
+# Com um gravador da zona de pouso, a resposta bruta também é guardada (com o contexto informado).
+def requisitar(url, etapa, params=None, landing=None, **contexto):
+    for tentativa in range(1, TENTATIVAS_REQUISICAO + 1):
+        inicio = time.perf_counter()
+        try:
+            response = sessao.get(url, params=params, timeout=60)
+        except requests.RequestException as e:
+            metricas.registrar_requisicao(etapa, time.perf_counter() - inicio, 0, None)
+            erro = e
+        else:
+            metricas.registrar_requisicao(etapa, time.perf_counter() - inicio, len(response.content), response.status_code)
+            # Erros 5xx e 429 são temporários; os demais são devolvidos imediatamente
+            if response.status_code < 500 and response.status_code != 429:
+                response.raise_for_status()
+                if landing is not None:
+                    with metricas.fase(etapa, "landing"):
+                        landing.gravar(url, params, response.content, **contexto)
+                with metricas.fase(etapa, "json"):
+                    return ler_json(response.content)
+            erro = requests.HTTPError(f"{response.status_code} para a url {response.url}", response=response)
+
+        if tentativa < TENTATIVAS_REQUISICAO:
+            metricas.registrar_retentativa(etapa)
+            logging.warning(f"Falha na requisição (tentativa {tentativa} de {TENTATIVAS_REQUISICAO}): {erro}")
+            time.sleep(ESPERA_RETENTATIVA * 2 ** (tentativa - 1))
+
+    raise erro
+
+# Função para verificar se tem uma próxima página para requisição
+def verificar_proxima_pagina(data):
+    for link in data['links']:
+        if link['rel'] == 'next' and link['href']:
+            return link['href']
+    return False
+
+# Função que percorre todas as páginas de um recurso e devolve os itens de "dados" de cada página
+def buscar_paginas(url, etapa, params=None, landing=None, **contexto):
+    dados = requisitar(url, etapa, params=params, landing=landing, **contexto)
+    yield dados["dados"]
+
+    # Se tiver mais páginas, seguir o link "next" até a última
+    nova_url = verificar_proxima_pagina(dados)
+    while nova_url:
+        logging.info(f"Nova pagina: {nova_url}")
+        dados = requisitar(nova_url, etapa, landing=landing, **contexto)
+        yield dados["dados"]
+        nova_url = verificar_proxima_pagina(dados)
@@ -0,0 +1,169 @@
+import logging
+from uuid import uuid4
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import inspect, text
+
+from etl.metricas import metricas
+
+# SQL da view deputados_completo usada pelo dashboard
+# DROP + CREATE funciona tanto no MySQL quanto no SQLite (que não tem CREATE OR REPLACE VIEW)
+DROP_VIEW_SQL = "DROP VIEW IF EXISTS deputados_completo"
+CREATE_VIEW_SQL = """
+CREATE VIEW deputados_completo AS
+SELECT
+    dep.id,
+    dep.nome AS nomeCampanha,
+    dep.siglaPartido,
+    dep.siglaUf,
+    dep.urlFoto,
+    dep_det.nomeCivil,
+    dep_det.cpf,
+    dep_det.sexo,
+    dep_det.dataNascimento,
+    dep_det.dataFalecimento,
+    dep_det.ufNascimento,
+    dep_det.municipioNascimento,
+    dep_det.escolaridade,
+    dep_ult.siglaPartido AS ultimoPartido,
+    dep_ult.situacao,
+    dep_ult.condicaoEleitoral,
+    dep_ult.data AS ultimoStatus,
+    dep_gab.predio AS "Prédio",
+    dep_gab.sala AS "Sala",
+    dep_gab.andar AS "Andar",
+    dep_gab.telefone AS "Telefone",
+    dep_gab.email AS "Email"
+FROM
+    deputados dep
+    JOIN deputados_detalhado dep_det ON dep.id = dep_det.id
+    JOIN deputados_ultimo_status dep_ult ON dep.id = dep_ult.id_deputado
+    JOIN deputados_ultimo_gabinete dep_gab ON dep.id = dep_gab.id_deputado
+"""
+
+def _gravar_duckdb(df, nome, engine, if_exists):
+    # O DuckDB lê o DataFrame coluna a coluna e grava a tabela em lote, sem os INSERTs linha a linha do to_sql
+    with engine.begin() as connection:
+        duckdb = connection.connection.driver_connection
+        duckdb.register("df_carga", df)
+        try:
+            if if_exists == "append" and inspect(connection).has_table(nome):
+                duckdb.execute(f'INSERT INTO "{nome}" BY NAME SELECT * FROM df_carga')
+            else:
+                duckdb.execute(f'CREATE OR REPLACE TABLE "{nome}" AS SELECT * FROM df_carga')
+        finally:
+            duckdb.unregister("df_carga")
+
+def _gravar(df, nome, engine, if_exists):
+    if engine.dialect.name == "duckdb":
+        _gravar_duckdb(df, nome, engine, if_exists)
+    else:
+        df.to_sql(name=nome, con=engine, if_exists=if_exists, index=False)
+
+def salvar_tabela(df, nome, engine, etapa, if_exists="replace"):
+    """Grava o DataFrame na tabela, registrando o tempo de escrita da etapa."""
+    try:
+        with metricas.fase(etapa, "escrita_db"):
+            _gravar(df, nome, engine, if_exists)
+        logging.info(f"Tabela {nome} gravada com {len(df)} linhas")
+    except Exception as e:
+        logging.error(f"Erro ao salvar a tabela {nome} no banco de dados: {e}")
+        raise
+
+def registrar_versao_dados(engine, etapas):
+    """Grava na tabela versao_dados um identificador novo dos dados carregados.
+
+    O dashboard compara essa versão com a do snapshot em disco para decidir se precisa reprocessar os dados.
+    """
+    df_versao = pd.DataFrame({
+        "versao": [f"{datetime.now():%Y%m%d%H%M%S}_{uuid4().hex[:8]}"],
+        "etapas": [",".join(etapas)],
+        "gravado_em": [datetime.now().isoformat(timespec="seconds")],
+    })
+    try:
+        _gravar(df_versao, "versao_dados", engine, "replace")
+        logging.info(f"Versão dos dados registrada: {df_versao['versao'].iloc[0]}")
+    except Exception as e:
+        logging.error(f"Erro ao registrar a versão dos dados: {e}")
+        raise
+
+def registrar_execucao(engine, id_execucao, etapas, ano, inicio, status, erro=None, meses=None):
+    """Acrescenta a execução ao histórico (tabela etl_execucoes), usado pelo agendador para saber o que está pendente.
+
+    status: sucesso, erro ou travada (outra execução detinha a trava e nenhuma etapa foi executada).
+    meses: meses das despesas buscados na API (None quando o ano inteiro foi carregado).
+    """
+    fim = datetime.now()
+    df_execucao = pd.DataFrame({
+        "id_execucao": [id_execucao],
+        "etapas": [",".join(etapas)],
+        "ano": [int(ano)],
+        "inicio": [inicio.isoformat(timespec="seconds")],
+        "fim": [fim.isoformat(timespec="seconds")],
+        "duracao_s": [round((fim - inicio).total_seconds(), 3)],
+        "status": [status],
+        # Tipo texto explícito: sem erro a coluna só teria nulos e o tipo inferido não aceitaria mensagens depois
+        "erro": pd.array([str(erro)[:1000] if erro else None], dtype="string"),
+        "meses": pd.array([",".join(str(mes) for mes in meses) if meses else None], dtype="string"),
+    })
+    try:
+        # Históricos gravados antes da coluna meses (as execuções deles carregaram o ano inteiro)
+        if inspect(engine).has_table("etl_execucoes") and "meses" not in {
+                coluna["name"] for coluna in inspect(engine).get_columns("etl_execucoes")}:
+            with engine.begin() as connection:
+                connection.execute(text("ALTER TABLE etl_execucoes ADD COLUMN meses VARCHAR(40)"))
+        _gravar(df_execucao, "etl_execucoes", engine, "append")
+    except Exception as e:
+        # O histórico não deve mascarar o erro da própria execução
+        logging.error(f"Erro ao registrar a execução no histórico: {e}")
+
+def ler_ids_deputados(engine):
+    """Ids dos deputados já carregados, para executar as etapas de detalhes e despesas isoladamente."""
+    try:
+        return pd.read_sql("SELECT DISTINCT id FROM deputados", engine)["id"].tolist()
+    except Exception as e:
+        logging.error(f"Erro ao ler a tabela deputados (execute antes a etapa 'deputados'): {e}")
+        raise
+
+def ler_despesas_carregadas(engine, etapa):
+    """Despesas já gravadas em deputados_despesas, com as colunas usadas na análise de anomalias."""
+    try:
+        with metricas.fase(etapa, "leitura_db"):
+            return pd.read_sql(
+                "SELECT id_deputado, tipoDespesa, id_fornecedor, ano, mes, dataDocumento, codDocumento, "
+                "numDocumento, valorDocumento FROM deputados_despesas",
+                engine
+            )
+    except Exception as e:
+        logging.error(f"Erro ao ler a tabela deputados_despesas (execute antes a etapa 'despesas'): {e}")
+        raise
+
+def ler_partidos_deputados(engine, etapa):
+    """Partido de cada deputado carregado (a tabela deputados pode ter mais de uma linha por deputado)."""
+    try:
+        with metricas.fase(etapa, "leitura_db"):
+            return pd.read_sql("SELECT id, siglaPartido FROM deputados", engine)
+    except Exception as e:
+        logging.error(f"Erro ao ler a tabela deputados (execute antes a etapa 'deputados'): {e}")
+        raise
+
+def criar_views(engine):
+    # Criando a view deputados_completo para facilitar o acesso aos dados
+    try:
+        logging.info("Criando a view deputados_completo")
+
+        # Aspas duplas nos apelidos com acento exigem ANSI_QUOTES no MySQL; lá usamos crases
+        create_view_sql = CREATE_VIEW_SQL
+        if engine.dialect.name == "mysql":
+            create_view_sql = create_view_sql.replace('"', "`")
+
+        with engine.connect() as connection:
+            connection.execute(text(DROP_VIEW_SQL))
+            connection.execute(text(create_view_sql))
+            connection.commit()
+
+        logging.info("View deputados_completo criada com sucesso")
+    except Exception as e:
+        logging.error(f"Erro ao criar a view deputados_completo: {e}")
+        raise
@@ -0,0 +1,270 @@
+import os
+import sys
+import argparse
+import logging
+from datetime import datetime
+from contextlib import nullcontext
+
+import pandas as pd
+
+from etl.config import configurar_logging, criar_engine, PATH_LOGS, ANO_DESPESAS
+from etl.metricas import metricas
+from etl.extracao import (extrair_deputados, extrair_detalhes, extrair_despesas, reler_deputados, reler_detalhes,
+                          reler_despesas, particao_legislatura, particao_ano)
+from etl.landing import GravadorLanding
+from etl.transformacao import transformar_deputados, transformar_detalhes, transformar_despesas
+from etl.validacao import validar_despesas, validar_detalhes, contar_linhas_tabela, salvar_relatorio_validacao, relatorios
+from etl.anomalias import calcular_anomalias
+from etl.series import calcular_series_mensais
+from etl.particoes import salvar_despesas_ano, substituir_ano, ler_dimensao_fornecedores, ler_despesas_mantidas, totais_dimensao
+from etl.trava import TravaExecucao
+from etl.carga import salvar_tabela, registrar_versao_dados, registrar_execucao, ler_ids_deputados, ler_despesas_carregadas, ler_partidos_deputados, criar_views
+
+ETAPAS = ("deputados", "detalhes", "despesas", "views", "anomalias", "series")
+
+# Gravador da zona de pouso da etapa (ou nenhum, quando a gravação está desativada)
+def _gravador(entidade, particao, ativo):
+    return GravadorLanding(entidade, particao) if ativo else nullcontext()
+
+def executar_deputados(engine, origem="api", gravar_landing=True):
+    """Extrai a lista de deputados da legislatura e grava a tabela deputados."""
+    with metricas.etapa("deputados"):
+        if origem == "landing":
+            registros = reler_deputados()
+        else:
+            with _gravador("deputados", particao_legislatura(), gravar_landing) as landing:
+                registros = extrair_deputados(landing)
+        with metricas.fase("deputados", "dataframe"):
+            df_deputados = transformar_deputados(registros)
+        metricas.registrar_linhas("deputados", len(df_deputados))
+
+        # Salvando a lista de deputados no banco de dados
+        if len(df_deputados) > 0:
+            salvar_tabela(df_deputados, "deputados", engine, "deputados")
+        else:
+            logging.info("Nenhum dado de deputados para salvar.")
+    return df_deputados["id"].drop_duplicates().tolist() if len(df_deputados) > 0 else []
+
+def executar_detalhes(engine, ids, paralelo=1, origem="api", gravar_landing=True):
+    """Extrai os dados detalhados dos deputados e grava dados pessoais, último status e gabinete."""
+    with metricas.etapa("detalhes"):
+        if origem == "landing":
+            detalhes = reler_detalhes()
+        else:
+            with _gravador("detalhes", particao_legislatura(), gravar_landing) as landing:
+                detalhes = extrair_detalhes(ids, paralelo, landing)
+        with metricas.fase("detalhes", "dataframe"):
+            df_deputado, df_ultimo_status, df_ultimo_gabinete = transformar_detalhes(detalhes)
+        with metricas.fase("detalhes", "validacao"):
+            df_deputado, df_ultimo_status, df_ultimo_gabinete, relatorios["detalhes"] = validar_detalhes(
+                df_deputado, df_ultimo_status, df_ultimo_gabinete
+            )
+        metricas.registrar_linhas("detalhes", len(df_deputado))
+
+        logging.info("Inserindo dados no banco de dados")
+        salvar_tabela(df_deputado, "deputados_detalhado", engine, "detalhes")
+        salvar_tabela(df_ultimo_status, "deputados_ultimo_status", engine, "detalhes")
+        salvar_tabela(df_ultimo_gabinete, "deputados_ultimo_gabinete", engine, "detalhes")
+
+def executar_despesas(engine, ids, ano=ANO_DESPESAS, paralelo=1, origem="api", gravar_landing=True, meses=None):
+    """Extrai as despesas do ano, monta a dimensão de fornecedores e grava as tabelas de despesas.
+
+    Com meses, só esses meses são buscados na API; os demais meses do ano são lidos do banco.
+    """
+    with metricas.etapa("despesas"):
+        ids_com_falha = []
+        # As páginas viram DataFrames tipados em lotes durante a extração (fase dataframe das métricas)
+        if origem == "landing":
+            df_gastos = reler_despesas(ano)
+        else:
+            with _gravador("despesas", particao_ano(ano, meses), gravar_landing) as landing:
+                df_gastos, ids_com_falha = extrair_despesas(ids, ano, paralelo, landing, meses)
+
+        if meses and origem == "api":
+            # Validação, fornecedores e a partição do ano continuam trabalhando com o ano completo
+            with metricas.fase("despesas", "leitura_db"):
+                df_mantidas = ler_despesas_mantidas(engine, ano, meses)
+            if df_mantidas is None or len(df_mantidas) == 0:
+                logging.warning(f"Nenhuma despesa de outros meses de {ano} gravada; o ano terá só os meses {meses}")
+            else:
+                logging.info(f"{len(df_mantidas)} despesas dos demais meses de {ano} mantidas do banco")
+                df_gastos = pd.concat([df_mantidas, df_gastos], ignore_index=True)
+
+        # Linhas inválidas vão para a quarentena antes de montar a dimensão de fornecedores e os totais
+        with metricas.fase("despesas", "validacao"):
+            linhas_anteriores = contar_linhas_tabela(engine, "deputados_despesas", ano)
+            df_gastos, df_quarentena, relatorios["despesas"] = validar_despesas(
+                df_gastos, ano, linhas_anteriores, ids if origem == "api" else None, ids_com_falha
+            )
+
+        # Fornecedores já gravados (de outros anos) mantêm o id
+        df_dimensao_anterior = ler_dimensao_fornecedores(engine)
+        with metricas.fase("despesas", "dataframe"):
+            df_gastos, df_fornecedores, df_fornecedores_totais = transformar_despesas(df_gastos, df_dimensao_anterior)
+        metricas.registrar_linhas("despesas", len(df_gastos))
+        logging.info(f"Dimensão de fornecedores criada com {len(df_fornecedores)} fornecedores")
+
+        logging.info("Inserindo dados no banco de dados")
+        # A quarentena guarda o ano da carga: linhas reprovadas por ano inválido também são trocadas ao recarregar
+        substituir_ano(df_quarentena.assign(ano_carga=int(ano)), "quarentena_despesas", engine, ano, "despesas",
+                       coluna="ano_carga")
+        # Só o ano extraído é substituído; os demais anos carregados são mantidos
+        salvar_despesas_ano(df_gastos, engine, ano, "despesas")
+        if len(df_fornecedores) > 0:
+            substituir_ano(df_fornecedores_totais, "fornecedores_totais", engine, ano, "despesas")
+            df_fornecedores = df_fornecedores.drop(columns=["qtdDocumentos", "valorTotal"]).join(
+                totais_dimensao(engine), on="id_fornecedor"
+            )
+            salvar_tabela(df_fornecedores, "dim_fornecedores", engine, "despesas")
+        logging.info("Despesas inseridas com sucesso")
+
+def executar_views(engine):
+    with metricas.etapa("views"):
+        criar_views(engine)
+
+def executar_anomalias(engine):
+    """Calcula as tabelas de anomalias sobre todas as despesas carregadas, lidas pelo dashboard sem recálculo."""
+    with metricas.etapa("anomalias"):
+        df_gastos = ler_despesas_carregadas(engine, "anomalias")
+        if len(df_gastos) == 0:
+            logging.info("Nenhuma despesa carregada; análise de anomalias não executada.")
+            return
+        with metricas.fase("anomalias", "analise"):
+            tabelas = calcular_anomalias(df_gastos)
+        metricas.registrar_linhas("anomalias", len(df_gastos))
+
+        for nome, df in tabelas.items():
+            salvar_tabela(df, nome, engine, "anomalias")
+        resumo = tabelas["anomalias_resumo"]
+        logging.info(f"Anomalias: {int((resumo['total_alertas'] > 0).sum())} deputados com ao menos um alerta")
+
+def executar_series(engine):
+    """Calcula as séries mensais por deputado, partido e tipo de despesa usadas nos comparativos do dashboard."""
+    with metricas.etapa("series"):
+        df_gastos = ler_despesas_carregadas(engine, "series")
+        if len(df_gastos) == 0:
+            logging.info("Nenhuma despesa carregada; séries mensais não calculadas.")
+            return
+        df_deputados = ler_partidos_deputados(engine, "series")
+        with metricas.fase("series", "analise"):
+            df_series = calcular_series_mensais(df_gastos, df_deputados)
+        metricas.registrar_linhas("series", len(df_series))
+        salvar_tabela(df_series, "series_mensais", engine, "series")
+
+def salvar_metricas(engine, sucesso):
+    # Relatório gravado ao final de toda execução, inclusive quando o ETL falha
+    try:
+        caminho = metricas.salvar(PATH_LOGS)
+        logging.info(f"Relatório de métricas salvo em {caminho}")
+    except Exception as e:
+        logging.error(f"Erro ao salvar o relatório de métricas: {e}")
+
+    # Com ETL_METRICAS_TABELA=1 o resumo por etapa também é acrescentado à tabela etl_metricas
+    if sucesso and os.getenv("ETL_METRICAS_TABELA", "").strip().lower() in ("1", "true", "sim"):
+        try:
+            metricas.dataframe().to_sql(name="etl_metricas", con=engine, if_exists="append", index=False)
+            logging.info("Métricas da execução gravadas na tabela etl_metricas")
+        except Exception as e:
+            logging.error(f"Erro ao gravar as métricas no banco de dados: {e}")
+            raise
+
+def ler_meses(texto):
+    """Converte '10-12' ou '1,2,3' na lista ordenada de meses."""
+    meses = set()
+    for parte in texto.split(","):
+        inicio, _, fim = parte.partition("-")
+        meses.update(range(int(inicio), int(fim or inicio) + 1))
+    if not meses or min(meses) < 1 or max(meses) > 12:
+        raise argparse.ArgumentTypeError(f"Meses inválidos: '{texto}' (ex.: 10-12 ou 1,2,3)")
+    return sorted(meses)
+
+def registrar_requisicoes():
+    # Requisições feitas à API nesta execução, por etapa, para acompanhar o custo de cada carga
+    requisicoes = {nome: etapa["requisicoes"] for nome, etapa in metricas.relatorio()["etapas"].items() if etapa["requisicoes"]}
+    if requisicoes:
+        detalhe = ", ".join(f"{nome}={quantidade}" for nome, quantidade in requisicoes.items())
+        logging.info(f"Requisições à API: {sum(requisicoes.values())} ({detalhe})")
+
+def _executar_etapas(engine, etapas, ano, paralelo, origem, gravar_landing, meses):
+    ids = None
+    if "deputados" in etapas:
+        ids = executar_deputados(engine, origem, gravar_landing)
+
+    # Etapas executadas isoladamente usam os deputados já gravados no banco
+    if ids is None and origem == "api" and ("detalhes" in etapas or "despesas" in etapas):
+        ids = ler_ids_deputados(engine)
+
+    if "detalhes" in etapas:
+        executar_detalhes(engine, ids, paralelo, origem, gravar_landing)
+    if "despesas" in etapas:
+        executar_despesas(engine, ids, ano, paralelo, origem, gravar_landing, meses)
+    if "views" in etapas:
+        executar_views(engine)
+    if "anomalias" in etapas:
+        executar_anomalias(engine)
+    if "series" in etapas:
+        executar_series(engine)
+
+    # Nova versão dos dados: invalida o snapshot do dashboard
+    registrar_versao_dados(engine, etapas)
+
+def executar(engine, etapas, ano=ANO_DESPESAS, paralelo=1, origem="api", gravar_landing=True, meses=None):
+    """Executa as etapas em ordem, com a trava do ETL adquirida, e registra a execução no histórico.
+
+    Retorna False, sem executar nenhuma etapa, quando outra execução detém a trava.
+    """
+    # Métricas e relatórios de validação são por execução (o agendador executa várias no mesmo processo)
+    metricas.reiniciar()
+    relatorios.clear()
+    inicio = datetime.now()
+
+    trava = TravaExecucao(engine)
+    if not trava.adquirir():
+        detentor = trava.detentor()
+        logging.warning(f"Outra execução do ETL está em andamento ({detentor}); nenhuma etapa executada.")
+        registrar_execucao(engine, trava.dono, etapas, ano, inicio, "travada", f"Trava com {detentor}", meses)
+        return False
+
+    sucesso = False
+    erro = None
+    try:
+        _executar_etapas(engine, etapas, ano, paralelo, origem, gravar_landing, meses)
+        sucesso = True
+    except Exception as e:
+        erro = e
+        raise
+    finally:
+        trava.liberar()
+        # O histórico vem antes dos relatórios: uma falha ao gravá-los não pode esconder uma execução com sucesso
+        # do agendador, que voltaria a executar as mesmas etapas
+        registrar_execucao(engine, trava.dono, etapas, ano, inicio, "sucesso" if sucesso else "erro", erro, meses)
+        registrar_requisicoes()
+        if relatorios:
+            salvar_relatorio_validacao(PATH_LOGS)
+        salvar_metricas(engine, sucesso)
+    return True
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m etl", description="ETL dos dados abertos da Câmara dos Deputados")
+    parser.add_argument("etapas", nargs="+", choices=ETAPAS + ("todos",),
+                        help="Etapas a executar, na ordem: deputados, detalhes, despesas, views, anomalias, series ou todos")
+    parser.add_argument("--ano", type=int, default=ANO_DESPESAS, help="Ano das despesas (padrão: %(default)s)")
+    parser.add_argument("--meses", type=ler_meses,
+                        help="Buscar na API só estes meses das despesas (ex.: 10-12); os demais são mantidos do banco")
+    parser.add_argument("--paralelo", type=int, default=1,
+                        help="Requisições simultâneas nas etapas por deputado (padrão: %(default)s)")
+    parser.add_argument("--origem", choices=("api", "landing"), default="api",
+                        help="Buscar os dados na API ou reprocessar as respostas guardadas na zona de pouso")
+    parser.add_argument("--sem-landing", action="store_true",
+                        help="Não guardar as respostas brutas da API na zona de pouso")
+    args = parser.parse_args(argv)
+    if args.meses and args.origem == "landing":
+        parser.error("--meses só se aplica à extração da API")
+
+    etapas = ETAPAS if "todos" in args.etapas else [etapa for etapa in ETAPAS if etapa in args.etapas]
+
+    configurar_logging()
+    engine = criar_engine()
+
+    if not executar(engine, etapas, args.ano, args.paralelo, args.origem, not args.sem_landing, args.meses):
+        sys.exit(1)
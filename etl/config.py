@@ -0,0 +1,148 @@
+import os
+import logging
+from urllib.parse import quote_plus
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import NullPool
+
+# Carregar variáveis de ambiente do .env
+load_dotenv()
+
+# Pasta dos logs e relatórios de métricas
+PATH_LOGS = os.getenv("PATH_LOGS") or "./logs"
+
+# URL base da API (pode apontar para o servidor local de benchmark)
+URL_BASE = os.getenv("API_URL_ENV") or "https://dadosabertos.camara.leg.br/api/v2"
+
+# Banco DuckDB local (armazenamento em colunas); quando definido, é usado no lugar do MySQL/SQLite
+# Requer os pacotes duckdb e duckdb-engine
+DUCKDB_PATH = os.getenv("DUCKDB_PATH_ENV")
+
+# Banco SQLite local: um único caminho absoluto (por padrão database.db na raiz do projeto), o mesmo lido pelo dashboard
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SQLITE_PATH = os.path.abspath(os.getenv("SQLITE_PATH_ENV") or os.path.join(RAIZ_PROJETO, "database.db"))
+
+# Memória mapeada (bytes) e cache de páginas (KiB) de cada conexão SQLite
+SQLITE_MMAP = int(os.getenv("SQLITE_MMAP_ENV") or 256 * 1024 * 1024)
+SQLITE_CACHE_KB = int(os.getenv("SQLITE_CACHE_KB_ENV") or 64 * 1024)
+
+# Espera (ms) por um bloqueio do banco antes de falhar
+SQLITE_ESPERA_BLOQUEIO = 30000
+
+# Legislatura 56 ( referente ao periodo de deputados de 2019-02-01 a 2023-01-31 ) e ano das despesas
+LEGISLATURA = 56
+ANO_DESPESAS = 2022
+
+# Número de tentativas por requisição e espera inicial entre elas (dobra a cada nova tentativa)
+TENTATIVAS_REQUISICAO = int(os.getenv("ETL_TENTATIVAS") or "3")
+ESPERA_RETENTATIVA = float(os.getenv("ETL_ESPERA_RETENTATIVA") or "1")
+
+# Itens por página nas listas paginadas da API (o máximo aceito é 100; sem o parâmetro ela devolve 15)
+ITENS_POR_PAGINA = 100
+
+# Despesas acumuladas como dicionários por thread de extração antes de virarem colunas tipadas de um DataFrame
+LOTE_DESPESAS = int(os.getenv("ETL_LOTE_DESPESAS") or "5000")
+
+def configurar_logging():
+    os.makedirs(PATH_LOGS, exist_ok=True)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.FileHandler(f"{PATH_LOGS}/logs.log"),
+            logging.StreamHandler()
+        ]
+    )
+
+def get_env_var(name):
+    value = os.getenv(name)
+
+    if value is None:
+        raise ValueError(f"A variável de ambiente '{name}' não está definida.")
+
+    if not value.strip():
+        raise ValueError(f"A variável de ambiente '{name}' está vazia.")
+
+    return value
+
+def configurar_sqlite(engine):
+    """Aplica os pragmas do modo local em cada conexão SQLite da engine.
+
+    O journal WAL permite que o dashboard leia o banco enquanto o ETL grava; com WAL, synchronous=NORMAL
+    continua seguro e evita um fsync a cada transação.
+    """
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KB}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_ESPERA_BLOQUEIO}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    return engine
+
+def _opcoes_duckdb(url):
+    # O DuckDB trava o arquivo para escrita enquanto houver uma conexão aberta: sem pool, a trava é liberada ao fim de
+    # cada operação e o dashboard consegue abrir o banco entre as execuções do agendador
+    return {"poolclass": NullPool} if url.startswith("duckdb") else {}
+
+def criar_engine():
+    """Cria a engine do banco: DB_URL_ENV, DuckDB local, MySQL configurado no .env ou SQLite local."""
+    # URL de conexão explícita (ex.: banco descartável usado nos benchmarks)
+    db_url = os.getenv("DB_URL_ENV")
+
+    if db_url:
+        try:
+            engine = create_engine(db_url, **_opcoes_duckdb(db_url))
+            if engine.dialect.name == "sqlite":
+                configurar_sqlite(engine)
+            logging.info("Conexão criada a partir da variável DB_URL_ENV.")
+            return engine
+        except Exception as e:
+            logging.error(f"Erro ao conectar usando DB_URL_ENV: {e}")
+            raise
+
+    # Conexão DuckDB
+    if DUCKDB_PATH:
+        try:
+            engine = create_engine(f"duckdb:///{DUCKDB_PATH}", **_opcoes_duckdb("duckdb"))
+            logging.info(f"Conexão DuckDB criada em {DUCKDB_PATH}.")
+            return engine
+        except Exception as e:
+            logging.error(f"Erro ao conectar ao DuckDB (pacotes duckdb e duckdb-engine instalados?): {e}")
+            raise
+
+    try:
+        db_host = get_env_var("DB_HOST_ENV")
+        db_port = get_env_var("DB_PORT_ENV")
+        db_user = get_env_var("DB_USER_ENV")
+        db_password = get_env_var("DB_PASS_ENV")
+        db_database = get_env_var("DB_NAME_ENV")
+        logging.info("Variáveis de ambiente carregadas com sucesso.")
+
+        # Conexão MySQL
+        try:
+            engine = create_engine(f"mysql+pymysql://{db_user}:%s@{db_host}/{db_database}?charset=utf8mb4" % quote_plus(db_password))
+            logging.info("Conexão MySQL estabelecida com sucesso.")
+            return engine
+        except Exception as e:
+            logging.error(f"Erro ao conectar ao MySQL: {e}")
+            raise
+
+    except ValueError as e:
+        logging.warning(f"Variáveis de ambiente do MySQL não configuradas: {e}")
+        logging.info("Criando engine SQLite local...")
+
+        # Conexão SQLite
+        try:
+            engine = configurar_sqlite(create_engine(f"sqlite:///{SQLITE_PATH}"))
+            logging.info(f"Conexão SQLite estabelecida com sucesso em {SQLITE_PATH}.")
+            return engine
+        except Exception as e:
+            logging.error(f"Erro ao conectar ao SQLite: {e}")
+            raise
@@ -0,0 +1,160 @@
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from etl.api import buscar_paginas, requisitar
+from etl.config import URL_BASE, LEGISLATURA, LOTE_DESPESAS, ITENS_POR_PAGINA
+from etl.landing import ler_landing, subparticoes, arquivo_mais_recente, momento_arquivo
+from etl.metricas import metricas
+from etl.transformacao import montar_despesas
+
+# Partições da zona de pouso de cada entidade
+def particao_legislatura():
+    return f"legislatura={LEGISLATURA}"
+
+def particao_ano(ano, meses=None):
+    # Cargas de alguns meses ficam numa subpasta, fora do reprocessamento do ano inteiro
+    if meses:
+        return os.path.join(f"ano={ano}", f"meses={'-'.join(str(mes) for mes in meses)}")
+    return f"ano={ano}"
+
+# Executa a função para cada id, em paralelo quando pedido, mantendo a ordem dos ids
+def _para_cada_id(funcao, ids, paralelo=1):
+    if paralelo <= 1:
+        return [funcao(id) for id in ids]
+    with ThreadPoolExecutor(max_workers=paralelo) as executor:
+        return list(executor.map(funcao, ids))
+
+def extrair_deputados(landing=None):
+    """Lista de deputados da legislatura (todas as páginas)."""
+    logging.info("Iniciando extração da lista de deputados")
+    registros = []
+    for pagina in buscar_paginas(f"{URL_BASE}/deputados", "deputados", params={"idLegislatura": LEGISLATURA}, landing=landing):
+        registros.extend(pagina)
+    logging.info(f"Não há novas paginas")
+    return registros
+
+def extrair_detalhe_deputado(id, landing=None):
+    # Buscando dados detalhados dos deputados
+    logging.info(f"Buscando dados detalhados do deputado com id: {id}")
+    deputado_detalhado = requisitar(f"{URL_BASE}/deputados/{id}", "detalhes", landing=landing, id_deputado=id)
+
+    # Verifica se a chave "dados" está presente na resposta
+    if "dados" not in deputado_detalhado:
+        raise KeyError("Item 'dados', não encontrado na resposta JSON")
+
+    return deputado_detalhado["dados"]
+
+def extrair_detalhes(ids, paralelo=1, landing=None):
+    """Resposta detalhada (chave "dados") de cada deputado, na ordem dos ids."""
+    return _para_cada_id(lambda id: extrair_detalhe_deputado(id, landing), ids, paralelo)
+
+class LoteDespesas:
+    """Acumula despesas de uma página por vez e as converte em DataFrames tipados a cada LOTE_DESPESAS linhas.
+
+    Os dicionários de cada despesa ocupam várias vezes o espaço das mesmas linhas em colunas tipadas: com o lote,
+    a memória ocupada por dicionários em cada thread fica limitada, qualquer que seja o número de páginas.
+    """
+
+    def __init__(self, tamanho=LOTE_DESPESAS):
+        self.tamanho = tamanho
+        self._registros = []
+        self._partes = []
+        self.linhas = 0
+
+    def acrescentar(self, pagina, id):
+        self._registros.extend(dict(despesa, id_deputado=id) for despesa in pagina)
+        self.linhas += len(pagina)
+        if len(self._registros) >= self.tamanho:
+            self._converter()
+
+    def _converter(self):
+        if self._registros:
+            with metricas.fase("despesas", "dataframe"):
+                self._partes.append(montar_despesas(self._registros))
+            self._registros = []
+
+    def dataframe(self):
+        self._converter()
+        if not self._partes:
+            return montar_despesas([])
+        return self._partes[0] if len(self._partes) == 1 else pd.concat(self._partes, ignore_index=True)
+
+def _juntar_despesas(partes):
+    partes = [parte for parte in partes if parte is not None and len(parte) > 0]
+    if not partes:
+        return montar_despesas([])
+    return pd.concat(partes, ignore_index=True)
+
+def extrair_despesas_deputado(id, ano, landing=None, meses=None):
+    """DataFrame com as despesas do ano (ou só dos meses informados) do deputado (None quando a extração falha)."""
+    logging.info(f"Buscando despesas do deputado {id}")
+    url = f"{URL_BASE}/deputados/{id}/despesas"
+    # Páginas de 100 itens: um deputado com 1.500 despesas no ano passa de 100 para 15 requisições
+    params = {"ano": ano, "ordem": "ASC", "ordenarPor": "ano", "idLegislatura": LEGISLATURA, "itens": ITENS_POR_PAGINA}
+    if meses:
+        # A API aceita o parâmetro mes repetido: uma única sequência de páginas para todos os meses
+        params["mes"] = list(meses)
+
+    # Erros de um deputado não interrompem a extração dos demais
+    try:
+        lote = LoteDespesas()
+        # Cada página é descartada assim que suas despesas entram no lote
+        for pagina in buscar_paginas(url, "despesas", params=params, landing=landing, id_deputado=id):
+            lote.acrescentar(pagina, id)
+        despesas = lote.dataframe()
+    except Exception as e:
+        logging.error(f"Ocorreu um erro inesperado: {e}")
+        return None
+
+    if len(despesas) == 0:
+        logging.info(f"Não há dados para o deputado {id}")
+    else:
+        logging.info(f"Despesas do deputado {id} processadas com sucesso")
+    return despesas
+
+def extrair_despesas(ids, ano, paralelo=1, landing=None, meses=None):
+    """DataFrame com as despesas do ano de todos os deputados (com a coluna id_deputado) e os ids cuja extração falhou."""
+    por_deputado = _para_cada_id(lambda id: extrair_despesas_deputado(id, ano, landing, meses), ids, paralelo)
+    ids_com_falha = [id for id, despesas in zip(ids, por_deputado) if despesas is None]
+    return _juntar_despesas(por_deputado), ids_com_falha
+
+# ### Reprocessamento a partir da zona de pouso (sem acessar a API)
+
+def reler_deputados():
+    return [deputado for registro in ler_landing("deputados", particao_legislatura())
+            for deputado in registro["resposta"]["dados"]]
+
+def reler_detalhes():
+    return [registro["resposta"]["dados"] for registro in ler_landing("detalhes", particao_legislatura())]
+
+def _reler_arquivo_despesas(ano, caminho):
+    # Páginas de deputados diferentes podem estar intercaladas (extração em paralelo);
+    # as despesas são reagrupadas por deputado mantendo a ordem das páginas
+    por_deputado = {}
+    for registro in ler_landing("despesas", particao_ano(ano), caminho):
+        id = registro["id_deputado"]
+        por_deputado.setdefault(id, LoteDespesas()).acrescentar(registro["resposta"]["dados"], id)
+    return _juntar_despesas(lote.dataframe() for lote in por_deputado.values())
+
+def reler_despesas(ano):
+    """DataFrame com as despesas guardadas na zona de pouso, lidas em lotes como na extração.
+
+    Cargas de alguns meses (--meses) gravadas depois da última carga do ano inteiro substituem esses meses, na
+    ordem em que foram feitas; as anteriores a ela já estão contidas no ano inteiro.
+    """
+    caminho = arquivo_mais_recente("despesas", particao_ano(ano))
+    df_gastos = _reler_arquivo_despesas(ano, caminho)
+
+    cargas_meses = []
+    for nome, caminho_meses in subparticoes("despesas", particao_ano(ano)).items():
+        if nome.startswith("meses=") and momento_arquivo(caminho_meses) > momento_arquivo(caminho):
+            meses = [int(mes) for mes in nome[len("meses="):].split("-")]
+            cargas_meses.append((momento_arquivo(caminho_meses), meses, caminho_meses))
+    for _, meses, caminho_meses in sorted(cargas_meses):
+        logging.info(f"Meses {meses} de {ano} substituídos pela carga parcial {caminho_meses}")
+        df_meses = _reler_arquivo_despesas(ano, caminho_meses)
+        df_gastos = _juntar_despesas([df_gastos[~df_gastos["mes"].isin(meses)], df_meses])
+    return df_gastos
@@ -0,0 +1,73 @@
+import pandas as pd
+
+# Função para normalizar o CNPJ/CPF mantendo apenas os dígitos
+def normalizar_documento(serie):
+    return serie.fillna("").astype(str).str.replace(r"\D", "", regex=True)
+
+# Função para normalizar o nome do fornecedor (maiúsculas, sem acentos e sem pontuação)
+def normalizar_nome(serie):
+    return (serie.fillna("").astype(str).str.upper()
+            .str.normalize("NFKD")
+            .str.encode("ascii", errors="ignore")
+            .str.decode("ascii")
+            .str.replace(r"[^A-Z0-9 ]", " ", regex=True)
+            .str.replace(r"\s+", " ", regex=True)
+            .str.strip())
+
+# Chave natural do fornecedor: documento normalizado ou, sem documento (ex.: exterior), o nome normalizado
+def chave_fornecedor(documento, nome):
+    documento = normalizar_documento(documento)
+    return documento.where(documento != "", "NOME:" + normalizar_nome(nome))
+
+# Função para montar a dimensão de fornecedores e trocar as colunas do fornecedor por uma chave inteira
+# Com a dimensão já gravada, os fornecedores conhecidos mantêm o id e os novos recebem ids a partir do maior
+def criar_dimensao_fornecedores(df_gastos, df_dimensao_anterior=None):
+    nome = df_gastos["nomeFornecedor"].fillna("").astype(str).str.strip()
+    chave = chave_fornecedor(df_gastos["cnpjCpfFornecedor"], nome)
+
+    if df_dimensao_anterior is None or len(df_dimensao_anterior) == 0:
+        df_dimensao_anterior = pd.DataFrame(columns=["id_fornecedor", "cnpjCpfFornecedor", "nomeFornecedor"])
+    ids_anteriores = pd.Series(
+        df_dimensao_anterior["id_fornecedor"].to_numpy(dtype="int64"),
+        index=chave_fornecedor(df_dimensao_anterior["cnpjCpfFornecedor"], df_dimensao_anterior["nomeFornecedor"])
+    )
+    novas = pd.Index(chave.unique()).difference(ids_anteriores.index).sort_values()
+    proximo_id = int(ids_anteriores.max()) + 1 if len(ids_anteriores) else 1
+    ids = pd.concat([ids_anteriores, pd.Series(range(proximo_id, proximo_id + len(novas)), index=novas, dtype="int64")])
+    id_fornecedor = pd.Series(chave.map(ids).to_numpy(), index=df_gastos.index, name="id_fornecedor")
+
+    # Nome canônico: a grafia mais frequente de cada fornecedor
+    nomes = (pd.DataFrame({"id_fornecedor": id_fornecedor, "nomeFornecedor": nome})
+             .value_counts()
+             .reset_index(name="qtd")
+             .sort_values(["id_fornecedor", "qtd"], ascending=[True, False])
+             .drop_duplicates(subset="id_fornecedor")
+             .set_index("id_fornecedor")["nomeFornecedor"])
+
+    # Fornecedores já conhecidos mantêm o nome gravado; os novos usam a grafia mais frequente do lote
+    df_dimensao = pd.DataFrame({
+        "id_fornecedor": ids.to_numpy(),
+        "cnpjCpfFornecedor": [c if not c.startswith("NOME:") else "" for c in ids.index],
+    })
+    nomes_anteriores = df_dimensao_anterior.set_index("id_fornecedor")["nomeFornecedor"]
+    df_dimensao["nomeFornecedor"] = df_dimensao["id_fornecedor"].map(nomes_anteriores).fillna(df_dimensao["id_fornecedor"].map(nomes))
+    tamanho_documento = df_dimensao["cnpjCpfFornecedor"].str.len()
+    df_dimensao["tipoFornecedor"] = "Sem documento"
+    df_dimensao.loc[tamanho_documento == 11, "tipoFornecedor"] = "PF"
+    df_dimensao.loc[tamanho_documento == 14, "tipoFornecedor"] = "PJ"
+
+    # Tabela fato passa a guardar apenas a chave inteira do fornecedor
+    df_fato = df_gastos.drop(columns=["nomeFornecedor", "cnpjCpfFornecedor"])
+    df_fato["id_fornecedor"] = id_fornecedor
+
+    # Totais pré-calculados por fornecedor, deputado, tipo de despesa e mês
+    df_totais = (df_fato.groupby(["id_fornecedor", "id_deputado", "tipoDespesa", "ano", "mes"], as_index=False)
+                 .agg(valorDocumento=("valorDocumento", "sum"), qtdDocumentos=("valorDocumento", "size")))
+
+    totais_gerais = df_totais.groupby("id_fornecedor").agg(
+        qtdDocumentos=("qtdDocumentos", "sum"),
+        valorTotal=("valorDocumento", "sum")
+    )
+    df_dimensao = df_dimensao.join(totais_gerais, on="id_fornecedor")
+
+    return df_dimensao, df_fato, df_totais
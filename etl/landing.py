@@ -0,0 +1,112 @@
+import io
+import os
+import glob
+import gzip
+import json
+import logging
+import threading
+from datetime import datetime
+
+from etl.api import ler_json
+
+# Zona de pouso: respostas brutas da API em JSONL comprimido, uma pasta por entidade e partição
+# (ex.: landing/despesas/ano=2022/20250101_120000_000000.jsonl.gz). Cada execução grava um arquivo novo;
+# o arquivo só recebe o nome final quando a extração termina sem erro.
+PASTA_LANDING = os.getenv("LANDING_PATH_ENV") or "./landing"
+
+# gzip por padrão; zstd quando pedido e o pacote zstandard estiver instalado
+COMPRESSAO = (os.getenv("LANDING_COMPRESSAO_ENV") or "gzip").strip().lower()
+
+SUFIXO_PARCIAL = ".parcial"
+
+def _extensao():
+    if COMPRESSAO == "zstd":
+        try:
+            import zstandard  # noqa: F401
+            return ".jsonl.zst"
+        except ImportError:
+            logging.warning("Pacote zstandard não instalado; usando gzip na zona de pouso.")
+    return ".jsonl.gz"
+
+def _abrir(caminho, modo):
+    if caminho.endswith(".zst") or caminho.endswith(".zst" + SUFIXO_PARCIAL):
+        import zstandard
+        if modo == "wb":
+            return zstandard.ZstdCompressor(level=3).stream_writer(open(caminho, "wb"), closefd=True)
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(caminho, "rb"), closefd=True))
+    return gzip.open(caminho, modo, compresslevel=5) if modo == "wb" else gzip.open(caminho, modo)
+
+def pasta_particao(entidade, particao):
+    return os.path.join(PASTA_LANDING, entidade, particao)
+
+class GravadorLanding:
+    """Grava, de forma segura entre threads, as respostas brutas de uma entidade/partição."""
+
+    def __init__(self, entidade, particao):
+        pasta = pasta_particao(entidade, particao)
+        os.makedirs(pasta, exist_ok=True)
+        self.caminho = os.path.join(pasta, f"{datetime.now():%Y%m%d_%H%M%S_%f}{_extensao()}")
+        self._arquivo = _abrir(self.caminho + SUFIXO_PARCIAL, "wb")
+        self._trava = threading.Lock()
+        self.registros = 0
+        self.bytes = 0
+
+    def gravar(self, url, params, conteudo, **contexto):
+        """Acrescenta uma resposta; o corpo (bytes JSON) é gravado como veio da API, sem reserializar."""
+        envelope = json.dumps(dict(contexto, url=url, params=params, recebido_em=datetime.now().isoformat(timespec="seconds")))
+        # Quebras de linha fora de strings são só espaço em JSON (dentro de strings elas vêm escapadas)
+        linha = envelope[:-1].encode("utf-8") + b', "resposta": ' + conteudo.replace(b"\n", b" ") + b"}\n"
+        with self._trava:
+            self._arquivo.write(linha)
+            self.registros += 1
+            self.bytes += len(linha)
+
+    def fechar(self, sucesso=True):
+        self._arquivo.close()
+        if sucesso:
+            os.replace(self.caminho + SUFIXO_PARCIAL, self.caminho)
+            logging.info(f"Zona de pouso: {self.registros} respostas gravadas em {self.caminho}")
+        else:
+            logging.warning(f"Zona de pouso: extração incompleta mantida em {self.caminho + SUFIXO_PARCIAL}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, rastro):
+        self.fechar(sucesso=tipo is None)
+
+def arquivo_mais_recente(entidade, particao):
+    """Último arquivo completo da partição (arquivos parciais são ignorados)."""
+    arquivos = sorted(
+        glob.glob(os.path.join(pasta_particao(entidade, particao), "*.jsonl.gz")) +
+        glob.glob(os.path.join(pasta_particao(entidade, particao), "*.jsonl.zst"))
+    )
+    if not arquivos:
+        raise FileNotFoundError(f"Nenhum dado de '{entidade}/{particao}' na zona de pouso {PASTA_LANDING}")
+    return max(arquivos, key=os.path.basename)
+
+def subparticoes(entidade, particao):
+    """Último arquivo completo de cada subpasta da partição (ex.: {"meses=10-12": caminho})."""
+    pasta = pasta_particao(entidade, particao)
+    if not os.path.isdir(pasta):
+        return {}
+    recentes = {}
+    for nome in sorted(os.listdir(pasta)):
+        if os.path.isdir(os.path.join(pasta, nome)):
+            try:
+                recentes[nome] = arquivo_mais_recente(entidade, os.path.join(particao, nome))
+            except FileNotFoundError:
+                continue
+    return recentes
+
+def momento_arquivo(caminho):
+    # Os arquivos são nomeados pela data e hora da gravação (ex.: 20250101_120000_000000.jsonl.gz)
+    return os.path.basename(caminho).split(".")[0]
+
+def ler_landing(entidade, particao, caminho=None):
+    """Percorre as respostas gravadas na execução mais recente da entidade/partição (ou no arquivo informado)."""
+    caminho = caminho or arquivo_mais_recente(entidade, particao)
+    logging.info(f"Lendo respostas da zona de pouso: {caminho}")
+    with _abrir(caminho, "rb") as arquivo:
+        for linha in arquivo:
+            yield ler_json(linha)
@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+# Limites (em segundos) do histograma de latência das requisições
+LIMITES_LATENCIA = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Tempos acumulados por fase dentro de cada etapa
+FASES = ("http", "json", "landing", "dataframe", "validacao", "leitura_db", "analise", "escrita_db")
+
+def _nova_etapa():
+    return {
+        "duracao_s": 0.0,
+        "requisicoes": 0,
+        "erros_http": 0,
+        "retentativas": 0,
+        "bytes": 0,
+        "linhas": 0,
+        "tempos_s": {fase: 0.0 for fase in FASES},
+        "latencia": {"contagem": [0] * (len(LIMITES_LATENCIA) + 1), "soma_s": 0.0, "max_s": 0.0},
+    }
+
+class MetricasEtl:
+    """Métricas estruturadas por etapa de uma execução do ETL (seguras para uso em várias threads)."""
+
+    def __init__(self):
+        self.inicio = datetime.now()
+        self.etapas = {}
+        self._trava = threading.Lock()
+
+    def reiniciar(self):
+        """Descarta as métricas acumuladas, no início de uma nova execução."""
+        with self._trava:
+            self.inicio = datetime.now()
+            self.etapas = {}
+
+    def _etapa(self, nome):
+        with self._trava:
+            if nome not in self.etapas:
+                self.etapas[nome] = _nova_etapa()
+            return self.etapas[nome]
+
+    @contextmanager
+    def etapa(self, nome):
+        """Mede a duração total de uma etapa (deputados, detalhes, despesas...)."""
+        etapa = self._etapa(nome)
+        inicio = time.perf_counter()
+        try:
+            yield etapa
+        finally:
+            with self._trava:
+                etapa["duracao_s"] += time.perf_counter() - inicio
+
+    @contextmanager
+    def fase(self, nome_etapa, fase):
+        """Acumula o tempo de uma fase (json, dataframe, escrita_db) dentro da etapa."""
+        etapa = self._etapa(nome_etapa)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._trava:
+                etapa["tempos_s"][fase] += time.perf_counter() - inicio
+
+    def registrar_requisicao(self, nome_etapa, duracao, tamanho, status):
+        etapa = self._etapa(nome_etapa)
+        posicao = next((i for i, limite in enumerate(LIMITES_LATENCIA) if duracao <= limite), len(LIMITES_LATENCIA))
+        with self._trava:
+            etapa["requisicoes"] += 1
+            etapa["bytes"] += tamanho
+            etapa["tempos_s"]["http"] += duracao
+            if status is None or status >= 400:
+                etapa["erros_http"] += 1
+
+            latencia = etapa["latencia"]
+            latencia["contagem"][posicao] += 1
+            latencia["soma_s"] += duracao
+            latencia["max_s"] = max(latencia["max_s"], duracao)
+
+    def registrar_retentativa(self, nome_etapa):
+        etapa = self._etapa(nome_etapa)
+        with self._trava:
+            etapa["retentativas"] += 1
+
+    def registrar_linhas(self, nome_etapa, linhas):
+        etapa = self._etapa(nome_etapa)
+        with self._trava:
+            etapa["linhas"] += linhas
+
+    def relatorio(self):
+        """Relatório da execução em formato de dicionário (serializável em JSON)."""
+        etapas = {}
+        for nome, etapa in self.etapas.items():
+            contagem = etapa["latencia"]["contagem"]
+            acumulado = [sum(contagem[:i + 1]) for i in range(len(contagem))]
+            etapas[nome] = {
+                "duracao_s": round(etapa["duracao_s"], 4),
+                "requisicoes": etapa["requisicoes"],
+                "erros_http": etapa["erros_http"],
+                "retentativas": etapa["retentativas"],
+                "bytes": etapa["bytes"],
+                "linhas": etapa["linhas"],
+                "tempos_s": {fase: round(valor, 4) for fase, valor in etapa["tempos_s"].items()},
+                "latencia": {
+                    "buckets": dict(zip([str(limite) for limite in LIMITES_LATENCIA] + ["+Inf"], acumulado)),
+                    "soma_s": round(etapa["latencia"]["soma_s"], 4),
+                    "max_s": round(etapa["latencia"]["max_s"], 4),
+                },
+            }
+        return {
+            "inicio": self.inicio.isoformat(timespec="seconds"),
+            "duracao_total_s": round(sum(etapa["duracao_s"] for etapa in self.etapas.values()), 4),
+            "etapas": etapas,
+        }
+
+    def prometheus(self):
+        """Relatório no formato texto de exposição do Prometheus."""
+        relatorio = self.relatorio()
+        linhas = []
+
+        def metrica(nome, tipo, ajuda, valores):
+            linhas.append(f"# HELP etl_{nome} {ajuda}")
+            linhas.append(f"# TYPE etl_{nome} {tipo}")
+            for rotulos, valor in valores:
+                linhas.append(f"etl_{nome}{{{rotulos}}} {valor}")
+
+        etapas = relatorio["etapas"].items()
+        metrica("etapa_duracao_segundos", "gauge", "Duração total da etapa",
+                [(f'etapa="{nome}"', etapa["duracao_s"]) for nome, etapa in etapas])
+        metrica("requisicoes_total", "counter", "Requisições HTTP realizadas",
+                [(f'etapa="{nome}"', etapa["requisicoes"]) for nome, etapa in etapas])
+        metrica("erros_http_total", "counter", "Requisições com erro HTTP ou de conexão",
+                [(f'etapa="{nome}"', etapa["erros_http"]) for nome, etapa in etapas])
+        metrica("retentativas_total", "counter", "Requisições repetidas após erro",
+                [(f'etapa="{nome}"', etapa["retentativas"]) for nome, etapa in etapas])
+        metrica("bytes_baixados_total", "counter", "Bytes recebidos da API",
+                [(f'etapa="{nome}"', etapa["bytes"]) for nome, etapa in etapas])
+        metrica("linhas_total", "counter", "Linhas produzidas pela etapa",
+                [(f'etapa="{nome}"', etapa["linhas"]) for nome, etapa in etapas])
+        metrica("fase_segundos", "gauge", "Tempo acumulado por fase da etapa",
+                [(f'etapa="{nome}",fase="{fase}"', valor) for nome, etapa in etapas for fase, valor in etapa["tempos_s"].items()])
+
+        linhas.append("# HELP etl_requisicao_latencia_segundos Latência das requisições HTTP")
+        linhas.append("# TYPE etl_requisicao_latencia_segundos histogram")
+        for nome, etapa in etapas:
+            for limite, contagem in etapa["latencia"]["buckets"].items():
+                linhas.append(f'etl_requisicao_latencia_segundos_bucket{{etapa="{nome}",le="{limite}"}} {contagem}')
+            linhas.append(f'etl_requisicao_latencia_segundos_sum{{etapa="{nome}"}} {etapa["latencia"]["soma_s"]}')
+            linhas.append(f'etl_requisicao_latencia_segundos_count{{etapa="{nome}"}} {etapa["requisicoes"]}')
+        return "\n".join(linhas) + "\n"
+
+    def salvar(self, pasta):
+        """Grava o relatório em JSON e em texto Prometheus na pasta de logs."""
+        os.makedirs(pasta, exist_ok=True)
+        caminho_json = os.path.join(pasta, "metricas_etl.json")
+        with open(caminho_json, "w", encoding="utf-8") as arquivo:
+            json.dump(self.relatorio(), arquivo, indent=2, ensure_ascii=False)
+        with open(os.path.join(pasta, "metricas_etl.prom"), "w", encoding="utf-8") as arquivo:
+            arquivo.write(self.prometheus())
+        return caminho_json
+
+    def dataframe(self):
+        """Uma linha por etapa, no formato da tabela etl_metricas."""
+        relatorio = self.relatorio()
+        registros = []
+        for nome, etapa in relatorio["etapas"].items():
+            registros.append({
+                "inicio_execucao": self.inicio,
+                "etapa": nome,
+                "duracao_s": etapa["duracao_s"],
+                "requisicoes": etapa["requisicoes"],
+                "erros_http": etapa["erros_http"],
+                "retentativas": etapa["retentativas"],
+                "bytes": etapa["bytes"],
+                "linhas": etapa["linhas"],
+                **{f"tempo_{fase}_s": valor for fase, valor in etapa["tempos_s"].items()},
+                "latencia_max_s": etapa["latencia"]["max_s"],
+            })
+        return pd.DataFrame(registros)
+
+# Instância compartilhada pelas etapas de uma execução
+metricas = MetricasEtl()
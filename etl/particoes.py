@@ -0,0 +1,174 @@
+import re
+import logging
+
+import pandas as pd
+from sqlalchemy import inspect, text
+
+from etl.carga import salvar_tabela
+from etl.transformacao import ESQUEMA_DESPESAS, aplicar_esquema
+
+# Despesas particionadas por ano (e mês no MySQL). No MySQL, deputados_despesas é uma tabela com partições nativas
+# RANGE (ano) e subpartições HASH (mes); nos demais bancos cada ano fica em deputados_despesas_<ano> e
+# deputados_despesas é uma view com a união dos anos. Recarregar um ano só apaga e grava as linhas desse ano.
+TABELA_DESPESAS = "deputados_despesas"
+
+def tabela_ano(ano):
+    return f"{TABELA_DESPESAS}_{int(ano)}"
+
+def existe_tabela(engine, nome):
+    """Tabela ou view existente no banco."""
+    inspetor = inspect(engine)
+    return inspetor.has_table(nome) or nome in inspetor.get_view_names()
+
+def anos_particionados(engine):
+    """Anos com tabela própria (bancos sem partições nativas)."""
+    padrao = re.compile(rf"{TABELA_DESPESAS}_(\d{{4}})")
+    anos = []
+    for nome in inspect(engine).get_table_names():
+        encontrado = padrao.fullmatch(nome)
+        if encontrado:
+            anos.append(int(encontrado.group(1)))
+    return sorted(anos)
+
+def _particionamento_nativo(engine):
+    return engine.dialect.name == "mysql"
+
+# ### MySQL: partições nativas
+
+def _particoes_mysql(connection):
+    consulta = text(
+        "SELECT DISTINCT PARTITION_NAME FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :tabela AND PARTITION_NAME IS NOT NULL"
+    )
+    return {int(nome[1:]) for (nome,) in connection.execute(consulta, {"tabela": TABELA_DESPESAS})}
+
+def _definicao_particao(ano):
+    return f"PARTITION p{ano} VALUES LESS THAN ({ano + 1})"
+
+def _preparar_particao_mysql(engine, df, ano):
+    with engine.begin() as connection:
+        if not inspect(connection).has_table(TABELA_DESPESAS):
+            df.head(0).to_sql(name=TABELA_DESPESAS, con=connection, index=False)
+
+        anos = _particoes_mysql(connection)
+        if not anos:
+            # Tabela ainda sem partições (inclusive a tabela única de versões anteriores): uma partição por ano existente
+            existentes = {int(ano) for (ano,) in connection.execute(
+                text(f"SELECT DISTINCT ano FROM {TABELA_DESPESAS} WHERE ano IS NOT NULL"))}
+            definicoes = ", ".join(_definicao_particao(a) for a in sorted(existentes | {ano}))
+            logging.info(f"Particionando {TABELA_DESPESAS} por ano e mês")
+            connection.execute(text(
+                f"ALTER TABLE {TABELA_DESPESAS} PARTITION BY RANGE (ano) "
+                f"SUBPARTITION BY HASH (mes) SUBPARTITIONS 12 ({definicoes})"
+            ))
+        elif ano > max(anos):
+            connection.execute(text(f"ALTER TABLE {TABELA_DESPESAS} ADD PARTITION ({_definicao_particao(ano)})"))
+        elif ano not in anos:
+            # Ano anterior a partições existentes: divide a partição seguinte
+            seguinte = min(a for a in anos if a > ano)
+            connection.execute(text(
+                f"ALTER TABLE {TABELA_DESPESAS} REORGANIZE PARTITION p{seguinte} INTO "
+                f"({_definicao_particao(ano)}, {_definicao_particao(seguinte)})"
+            ))
+        connection.execute(text(f"ALTER TABLE {TABELA_DESPESAS} TRUNCATE PARTITION p{ano}"))
+
+# ### SQLite e DuckDB: uma tabela por ano e view com a união
+
+def _migrar_tabela_unica(engine):
+    # Bancos gravados antes do particionamento têm deputados_despesas como tabela única: separa por ano
+    if TABELA_DESPESAS not in inspect(engine).get_table_names():
+        return
+    logging.info(f"Separando a tabela {TABELA_DESPESAS} em tabelas por ano")
+    with engine.begin() as connection:
+        anos = [int(ano) for (ano,) in connection.execute(
+            text(f"SELECT DISTINCT ano FROM {TABELA_DESPESAS} WHERE ano IS NOT NULL"))]
+        for ano in anos:
+            connection.execute(text(f"CREATE TABLE {tabela_ano(ano)} AS SELECT * FROM {TABELA_DESPESAS} WHERE ano = {ano}"))
+        connection.execute(text(f"DROP TABLE {TABELA_DESPESAS}"))
+
+def recriar_view_despesas(engine):
+    """Recria a view deputados_despesas com a união das tabelas por ano (todas as colunas de todos os anos)."""
+    anos = anos_particionados(engine)
+    inspetor = inspect(engine)
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP VIEW IF EXISTS {TABELA_DESPESAS}"))
+        if not anos:
+            return
+        # Colunas na ordem da tabela mais recente, seguidas das que só existem em anos anteriores
+        colunas_ano = {ano: [coluna["name"] for coluna in inspetor.get_columns(tabela_ano(ano))] for ano in anos}
+        colunas = list(dict.fromkeys(coluna for ano in reversed(anos) for coluna in colunas_ano[ano]))
+        selects = []
+        for ano in anos:
+            # Anos gravados com outro esquema recebem nulos nas colunas que não tinham
+            existentes = set(colunas_ano[ano])
+            lista = ", ".join(coluna if coluna in existentes else f"NULL AS {coluna}" for coluna in colunas)
+            selects.append(f"SELECT {lista} FROM {tabela_ano(ano)}")
+        connection.execute(text(f"CREATE VIEW {TABELA_DESPESAS} AS\n" + "\nUNION ALL\n".join(selects)))
+
+# ### Gravação
+
+def salvar_despesas_ano(df_gastos, engine, ano, etapa):
+    """Substitui apenas as despesas do ano, mantendo os demais anos carregados."""
+    try:
+        if _particionamento_nativo(engine):
+            _preparar_particao_mysql(engine, df_gastos, ano)
+            salvar_tabela(df_gastos, TABELA_DESPESAS, engine, etapa, if_exists="append")
+        else:
+            _migrar_tabela_unica(engine)
+            salvar_tabela(df_gastos, tabela_ano(ano), engine, etapa)
+            recriar_view_despesas(engine)
+    except Exception as e:
+        logging.error(f"Erro ao gravar a partição {ano} das despesas: {e}")
+        raise
+
+def substituir_ano(df, nome, engine, ano, etapa, coluna="ano"):
+    """Apaga as linhas do ano na tabela e grava as novas (cria a tabela quando ainda não existe).
+
+    Tabelas gravadas antes de ter a coluna do ano são substituídas por inteiro.
+    """
+    inspetor = inspect(engine)
+    if not inspetor.has_table(nome) or coluna not in {c["name"] for c in inspetor.get_columns(nome)}:
+        salvar_tabela(df, nome, engine, etapa)
+        return
+    try:
+        with engine.begin() as connection:
+            connection.execute(text(f"DELETE FROM {nome} WHERE {coluna} = :ano"), {"ano": int(ano)})
+    except Exception as e:
+        logging.error(f"Erro ao apagar o ano {ano} da tabela {nome}: {e}")
+        raise
+    salvar_tabela(df, nome, engine, etapa, if_exists="append")
+
+def ler_dimensao_fornecedores(engine):
+    """Dimensão de fornecedores já gravada (vazia na primeira carga), para manter os ids entre anos."""
+    if not inspect(engine).has_table("dim_fornecedores"):
+        return None
+    return pd.read_sql("SELECT id_fornecedor, cnpjCpfFornecedor, nomeFornecedor FROM dim_fornecedores", engine)
+
+def ler_despesas_mantidas(engine, ano, meses):
+    """Despesas já gravadas do ano fora dos meses informados, no formato da extração (None sem carga anterior).
+
+    Usadas ao recarregar só alguns meses: as colunas do fornecedor voltam da dimensão, o que mantém os mesmos
+    ids de fornecedor ao montar a dimensão novamente.
+    """
+    if not existe_tabela(engine, TABELA_DESPESAS) or not inspect(engine).has_table("dim_fornecedores"):
+        return None
+    lista_meses = ", ".join(str(int(mes)) for mes in meses)
+    try:
+        df = pd.read_sql(
+            text(f"SELECT d.*, f.cnpjCpfFornecedor, f.nomeFornecedor FROM {TABELA_DESPESAS} d "
+                 "LEFT JOIN dim_fornecedores f ON f.id_fornecedor = d.id_fornecedor "
+                 f"WHERE d.ano = :ano AND d.mes NOT IN ({lista_meses})"),
+            engine, params={"ano": int(ano)}
+        )
+    except Exception as e:
+        logging.error(f"Erro ao ler as despesas já gravadas do ano {ano}: {e}")
+        raise
+    return aplicar_esquema(df, ESQUEMA_DESPESAS)
+
+def totais_dimensao(engine):
+    """Quantidade de documentos e valor total por fornecedor em todos os anos carregados."""
+    return pd.read_sql(
+        "SELECT id_fornecedor, SUM(qtdDocumentos) AS qtdDocumentos, SUM(valorDocumento) AS valorTotal "
+        "FROM fornecedores_totais GROUP BY id_fornecedor",
+        engine
+    ).set_index("id_fornecedor")
@@ -0,0 +1,75 @@
+import pandas as pd
+
+# Níveis das séries mensais e a coluna que identifica cada série ("geral" tem uma única série)
+NIVEIS = {
+    "geral": None,
+    "partido": "siglaPartido",
+    "deputado": "id_deputado",
+    "tipo": "tipoDespesa",
+}
+
+# Chave da série do nível geral
+CHAVE_GERAL = "Todos"
+
+# Meses da média móvel
+JANELA_MEDIA_MOVEL = 3
+
+def _totais_mensais(df, nivel, coluna):
+    chave = df[coluna].astype(str) if coluna else CHAVE_GERAL
+    return (df.assign(chave=chave)
+            .groupby(["chave", "periodo"], as_index=False, observed=True)
+            .agg(valor=("valorDocumento", "sum"), qtdDocumentos=("valorDocumento", "size"))
+            .assign(nivel=nivel))
+
+def calcular_series_mensais(df_gastos, df_deputados):
+    """Séries mensais por deputado, partido, tipo de despesa e geral, em formato longo.
+
+    Cada série tem todos os meses entre o primeiro e o último mês carregados (meses sem gasto valem zero),
+    o que permite calcular o acumulado no ano, a média móvel e a variação em relação ao mesmo mês do ano
+    anterior com operações de grupo deslocadas, sem laços por série.
+    """
+    partidos = df_deputados.drop_duplicates(subset="id", keep="last").set_index("id")["siglaPartido"]
+    df = df_gastos[df_gastos["mes"].between(1, 12)]
+    df = pd.DataFrame({
+        "id_deputado": df["id_deputado"],
+        "siglaPartido": df["id_deputado"].map(partidos).fillna("Sem partido"),
+        "tipoDespesa": df["tipoDespesa"],
+        # Mês como inteiro contínuo entre anos (ano * 12 + mês - 1)
+        "periodo": (df["ano"] * 12 + df["mes"] - 1).astype("int64"),
+        "valorDocumento": df["valorDocumento"],
+    })
+    if len(df) == 0:
+        return pd.DataFrame()
+
+    mensal = pd.concat([_totais_mensais(df, nivel, coluna) for nivel, coluna in NIVEIS.items()], ignore_index=True)
+
+    # Grade completa: todas as séries em todos os meses do intervalo carregado
+    periodos = pd.DataFrame({"periodo": range(df["periodo"].min(), df["periodo"].max() + 1)})
+    series = (mensal[["nivel", "chave"]].drop_duplicates()
+              .merge(periodos, how="cross")
+              .merge(mensal, on=["nivel", "chave", "periodo"], how="left")
+              .sort_values(["nivel", "chave", "periodo"], ignore_index=True))
+    series["valor"] = series["valor"].fillna(0.0)
+    series["qtdDocumentos"] = series["qtdDocumentos"].fillna(0).astype("int64")
+    series["ano"] = series["periodo"] // 12
+    series["mes"] = series["periodo"] % 12 + 1
+
+    por_serie = series.groupby(["nivel", "chave"], sort=False)["valor"]
+    series["valor_acumulado_ano"] = series.groupby(["nivel", "chave", "ano"], sort=False)["valor"].cumsum()
+    series["media_movel"] = (por_serie.rolling(JANELA_MEDIA_MOVEL, min_periods=1).mean()
+                             .reset_index(level=[0, 1], drop=True))
+    series["valor_ano_anterior"] = por_serie.shift(12)
+    anterior = series["valor_ano_anterior"].where(series["valor_ano_anterior"] > 0)
+    series["variacao_ano_anterior"] = (series["valor"] - anterior) / anterior
+
+    # Deputados de cada série, para comparar médias por deputado entre níveis
+    total_deputados = len(partidos)
+    deputados_partido = partidos.value_counts()
+    series["qtdDeputados"] = total_deputados
+    series.loc[series["nivel"] == "deputado", "qtdDeputados"] = 1
+    eh_partido = series["nivel"] == "partido"
+    series.loc[eh_partido, "qtdDeputados"] = series.loc[eh_partido, "chave"].map(deputados_partido).fillna(0).astype("int64")
+    series["media_por_deputado"] = series["valor"] / series["qtdDeputados"].where(series["qtdDeputados"] > 0)
+
+    return series[["nivel", "chave", "ano", "mes", "valor", "qtdDocumentos", "valor_acumulado_ano", "media_movel",
+                   "valor_ano_anterior", "variacao_ano_anterior", "qtdDeputados", "media_por_deputado"]]
@@ -0,0 +1,120 @@
+import pandas as pd
+
+from etl.fornecedores import criar_dimensao_fornecedores
+
+# Esquemas explícitos (coluna -> tipo) das tabelas montadas a partir da API.
+# Colunas ausentes na resposta viram nulas e campos não listados são descartados.
+ESQUEMA_DEPUTADOS = {
+    "id": "Int64",
+    "uri": "object",
+    "nome": "object",
+    "siglaPartido": "object",
+    "uriPartido": "object",
+    "siglaUf": "object",
+    "idLegislatura": "Int64",
+    "urlFoto": "object",
+    "email": "object",
+}
+
+ESQUEMA_DEPUTADO_DETALHADO = {
+    "id": "Int64",
+    "uri": "object",
+    "nomeCivil": "object",
+    "cpf": "object",
+    "sexo": "object",
+    "dataNascimento": "object",
+    "dataFalecimento": "object",
+    "ufNascimento": "object",
+    "municipioNascimento": "object",
+    "escolaridade": "object",
+}
+
+ESQUEMA_ULTIMO_STATUS = {
+    "id": "Int64",
+    "uri": "object",
+    "nome": "object",
+    "siglaPartido": "object",
+    "uriPartido": "object",
+    "siglaUf": "object",
+    "idLegislatura": "Int64",
+    "urlFoto": "object",
+    "email": "object",
+    "data": "object",
+    "nomeEleitoral": "object",
+    "situacao": "object",
+    "condicaoEleitoral": "object",
+    "descricaoStatus": "object",
+    "id_deputado": "Int64",
+}
+
+ESQUEMA_ULTIMO_GABINETE = {
+    "nome": "object",
+    "predio": "object",
+    "sala": "object",
+    "andar": "object",
+    "telefone": "object",
+    "email": "object",
+    "id_deputado": "Int64",
+}
+
+ESQUEMA_DESPESAS = {
+    "ano": "Int64",
+    "mes": "Int64",
+    "tipoDespesa": "object",
+    "codDocumento": "Int64",
+    "tipoDocumento": "object",
+    "codTipoDocumento": "Int64",
+    "dataDocumento": "object",
+    "numDocumento": "object",
+    "valorDocumento": "float64",
+    "urlDocumento": "object",
+    "nomeFornecedor": "object",
+    "cnpjCpfFornecedor": "object",
+    "valorLiquido": "float64",
+    "valorGlosa": "float64",
+    "numRessarcimento": "object",
+    "codLote": "Int64",
+    "parcela": "Int64",
+    "id_deputado": "Int64",
+}
+
+def aplicar_esquema(df, esquema):
+    """Seleciona as colunas do esquema, na ordem, convertendo as numéricas para o tipo definido."""
+    df = df.reindex(columns=list(esquema))
+    for coluna, tipo in esquema.items():
+        if tipo != "object":
+            df[coluna] = pd.to_numeric(df[coluna], errors="coerce").astype(tipo)
+    return df
+
+def _subcampos(plano, prefixo, esquema):
+    # Colunas achatadas pelo json_normalize (ex.: "ultimoStatus.gabinete.sala" -> "sala")
+    colunas = {f"{prefixo}.{coluna}": coluna for coluna in esquema if coluna != "id_deputado"}
+    return plano.reindex(columns=list(colunas)).rename(columns=colunas).assign(id_deputado=plano["id"])
+
+def transformar_deputados(registros):
+    return aplicar_esquema(pd.DataFrame.from_records(registros), ESQUEMA_DEPUTADOS)
+
+def transformar_detalhes(detalhes):
+    """DataFrames de dados pessoais, último status e último gabinete dos deputados, em uma única passada."""
+    plano = pd.json_normalize(detalhes)
+    if len(plano) == 0:
+        plano = pd.DataFrame(columns=["id"])
+
+    df_deputado = aplicar_esquema(plano, ESQUEMA_DEPUTADO_DETALHADO)
+    df_ultimo_status = aplicar_esquema(_subcampos(plano, "ultimoStatus", ESQUEMA_ULTIMO_STATUS), ESQUEMA_ULTIMO_STATUS)
+    df_ultimo_gabinete = aplicar_esquema(_subcampos(plano, "ultimoStatus.gabinete", ESQUEMA_ULTIMO_GABINETE), ESQUEMA_ULTIMO_GABINETE)
+    return df_deputado, df_ultimo_status, df_ultimo_gabinete
+
+def montar_despesas(registros):
+    return aplicar_esquema(pd.DataFrame.from_records(registros, columns=list(ESQUEMA_DESPESAS)), ESQUEMA_DESPESAS)
+
+def transformar_despesas(df_gastos, df_dimensao_anterior=None):
+    """Despesas com a chave inteira do fornecedor, dimensão de fornecedores e totais pré-calculados."""
+    if len(df_gastos) == 0:
+        # Ano sem despesas: tabela fato vazia com o esquema de sempre (chave do fornecedor no lugar das colunas brutas)
+        df_fato = aplicar_esquema(df_gastos, ESQUEMA_DESPESAS).drop(columns=["nomeFornecedor", "cnpjCpfFornecedor"])
+        df_fato["id_fornecedor"] = pd.Series(dtype="int64")
+        return df_fato, pd.DataFrame(), pd.DataFrame()
+
+    df_fornecedores, df_gastos, df_fornecedores_totais = criar_dimensao_fornecedores(df_gastos, df_dimensao_anterior)
+    return df_gastos, df_fornecedores, df_fornecedores_totais
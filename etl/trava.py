@@ -0,0 +1,109 @@
+import os
+import socket
+import logging
+import threading
+from uuid import uuid4
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+# Trava de execução guardada no próprio banco (uma linha por nome na tabela etl_trava): execuções manuais e o
+# agendador, inclusive em máquinas diferentes apontando para o mesmo banco, nunca gravam as tabelas ao mesmo tempo.
+TABELA_TRAVA = "etl_trava"
+
+# Validade da trava em segundos. É renovada enquanto a execução está em andamento; se o processo morrer sem
+# liberá-la, a próxima execução assume a trava depois que ela expira.
+VALIDADE_TRAVA = int(os.getenv("ETL_TRAVA_VALIDADE") or "600")
+
+CREATE_TRAVA_SQL = f"""
+CREATE TABLE IF NOT EXISTS {TABELA_TRAVA} (
+    nome VARCHAR(50) PRIMARY KEY,
+    dono VARCHAR(200) NOT NULL,
+    adquirida_em VARCHAR(32) NOT NULL,
+    expira_em VARCHAR(32) NOT NULL
+)
+"""
+
+def _data_texto(data):
+    # Datas ISO gravadas como texto: a comparação de textos segue a ordem das datas em qualquer banco
+    return data.isoformat(timespec="seconds")
+
+class TravaExecucao:
+    """Trava exclusiva do ETL no banco, renovada em segundo plano enquanto está adquirida."""
+
+    def __init__(self, engine, nome="etl", validade=VALIDADE_TRAVA):
+        self.engine = engine
+        self.nome = nome
+        self.validade = validade
+        self.dono = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._parar = threading.Event()
+        self._renovacao = None
+
+    def _expiracao(self):
+        return _data_texto(datetime.now() + timedelta(seconds=self.validade))
+
+    def adquirir(self):
+        """Tenta adquirir a trava; retorna False quando outra execução a detém."""
+        agora = datetime.now()
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(text(CREATE_TRAVA_SQL))
+                # Trava deixada por uma execução que terminou sem liberá-la
+                connection.execute(
+                    text(f"DELETE FROM {TABELA_TRAVA} WHERE nome = :nome AND expira_em < :agora"),
+                    {"nome": self.nome, "agora": _data_texto(agora)}
+                )
+                # A chave primária garante que só uma execução consegue inserir a linha
+                connection.execute(
+                    text(f"INSERT INTO {TABELA_TRAVA} (nome, dono, adquirida_em, expira_em) "
+                         "VALUES (:nome, :dono, :adquirida_em, :expira_em)"),
+                    {"nome": self.nome, "dono": self.dono, "adquirida_em": _data_texto(agora),
+                     "expira_em": self._expiracao()}
+                )
+        except IntegrityError:
+            return False
+        except Exception as e:
+            logging.error(f"Erro ao adquirir a trava do ETL: {e}")
+            raise
+
+        self._parar.clear()
+        self._renovacao = threading.Thread(target=self._renovar, name="renovacao-trava-etl", daemon=True)
+        self._renovacao.start()
+        logging.info(f"Trava do ETL adquirida por {self.dono}")
+        return True
+
+    def detentor(self):
+        """Dono e expiração da trava atual (None quando está livre)."""
+        with self.engine.connect() as connection:
+            linha = connection.execute(
+                text(f"SELECT dono, expira_em FROM {TABELA_TRAVA} WHERE nome = :nome"), {"nome": self.nome}
+            ).first()
+        return tuple(linha) if linha else None
+
+    def _renovar(self):
+        while not self._parar.wait(self.validade / 3):
+            try:
+                with self.engine.begin() as connection:
+                    connection.execute(
+                        text(f"UPDATE {TABELA_TRAVA} SET expira_em = :expira_em WHERE nome = :nome AND dono = :dono"),
+                        {"nome": self.nome, "dono": self.dono, "expira_em": self._expiracao()}
+                    )
+            except Exception as e:
+                # Nova tentativa na próxima renovação; a trava só expira se todas falharem até a validade
+                logging.error(f"Erro ao renovar a trava do ETL: {e}")
+
+    def liberar(self):
+        self._parar.set()
+        if self._renovacao is not None:
+            self._renovacao.join()
+            self._renovacao = None
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(
+                    text(f"DELETE FROM {TABELA_TRAVA} WHERE nome = :nome AND dono = :dono"),
+                    {"nome": self.nome, "dono": self.dono}
+                )
+            logging.info("Trava do ETL liberada")
+        except Exception as e:
+            logging.error(f"Erro ao liberar a trava do ETL (expira em {self.validade}s): {e}")
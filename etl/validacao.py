@@ -0,0 +1,135 @@
+import os
+import json
+import logging
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import text
+
+from etl.particoes import existe_tabela
+
+# Colunas obrigatórias das despesas: linhas com nulos nelas vão para a quarentena
+COLUNAS_OBRIGATORIAS_DESPESAS = ["id_deputado", "ano", "mes", "tipoDespesa", "valorDocumento"]
+
+# Chave de um documento: o mesmo documento (e parcela) de um deputado não pode aparecer duas vezes
+CHAVE_DOCUMENTO = ["id_deputado", "codDocumento", "parcela"]
+
+# Valores acima de Q3 + FATOR_OUTLIER * IQR do tipo de despesa são apontados como atípicos
+FATOR_OUTLIER = float(os.getenv("ETL_FATOR_OUTLIER") or "10")
+
+# Queda máxima aceita no número de despesas em relação à carga anterior (fração); acima disso a carga é interrompida
+LIMITE_QUEDA_LINHAS = float(os.getenv("ETL_LIMITE_QUEDA_LINHAS") or "0.5")
+
+# Relatórios das validações feitas na execução, por entidade
+relatorios = {}
+
+def contar_linhas_tabela(engine, tabela, ano=None):
+    """Linhas da tabela (ou view) já carregada, opcionalmente só do ano (None quando ela ainda não existe)."""
+    if not existe_tabela(engine, tabela):
+        return None
+    with engine.connect() as connection:
+        if ano is None:
+            return connection.execute(text(f"SELECT COUNT(*) FROM {tabela}")).scalar()
+        return connection.execute(text(f"SELECT COUNT(*) FROM {tabela} WHERE ano = :ano"), {"ano": int(ano)}).scalar()
+
+def validar_despesas(df_gastos, ano, linhas_anteriores=None, ids=None, ids_com_falha=()):
+    """Valida as despesas em lote e separa as linhas que vão para a quarentena.
+
+    Devolve (despesas válidas, quarentena com a coluna motivo, relatório da validação).
+    """
+    relatorio = {"linhas": len(df_gastos), "erros": {}, "avisos": {}}
+
+    faltantes = [coluna for coluna in COLUNAS_OBRIGATORIAS_DESPESAS + CHAVE_DOCUMENTO if coluna not in df_gastos.columns]
+    if faltantes:
+        raise ValueError(f"Colunas obrigatórias ausentes nas despesas: {faltantes}")
+
+    # Cada regra é uma máscara booleana sobre o lote inteiro; a primeira regra violada vira o motivo
+    regras = {}
+    for coluna in COLUNAS_OBRIGATORIAS_DESPESAS:
+        regras[f"nulo:{coluna}"] = df_gastos[coluna].isna()
+    regras["mes_invalido"] = ~df_gastos["mes"].between(1, 12)
+    regras["ano_diferente"] = df_gastos["ano"] != ano
+    documento_informado = df_gastos["codDocumento"].notna() & (df_gastos["codDocumento"] != 0)
+    regras["documento_duplicado"] = documento_informado & df_gastos.duplicated(subset=CHAVE_DOCUMENTO, keep="first")
+
+    motivo = pd.Series(pd.NA, index=df_gastos.index, dtype="object")
+    for nome, mascara in regras.items():
+        mascara = mascara.fillna(False).astype(bool)
+        relatorio["erros"][nome] = int(mascara.sum())
+        motivo = motivo.mask(motivo.isna() & mascara, nome)
+
+    em_quarentena = motivo.notna()
+    df_validas = df_gastos[~em_quarentena]
+    df_quarentena = df_gastos[em_quarentena].assign(
+        motivo=motivo[em_quarentena],
+        data_validacao=datetime.now()
+    )
+
+    # Avisos não bloqueiam a carga: ficam no relatório para análise
+    if len(df_validas) > 0:
+        valor = df_validas["valorDocumento"]
+        quartis = df_validas.groupby("tipoDespesa")["valorDocumento"].quantile([0.25, 0.75]).unstack()
+        limite = (quartis[0.75] + FATOR_OUTLIER * (quartis[0.75] - quartis[0.25])).reindex(df_validas["tipoDespesa"]).to_numpy()
+        relatorio["avisos"]["valor_negativo"] = int((valor < 0).sum())
+        relatorio["avisos"]["valor_atipico"] = int((valor > limite).sum())
+        relatorio["avisos"]["data_invalida"] = int(pd.to_datetime(df_validas["dataDocumento"], errors="coerce").isna().sum())
+    if ids is not None:
+        relatorio["avisos"]["deputados_sem_despesas"] = len(set(ids) - set(df_validas["id_deputado"].dropna().unique()))
+    relatorio["avisos"]["deputados_com_falha_na_extracao"] = len(ids_com_falha)
+    relatorio["ids_com_falha_na_extracao"] = sorted(ids_com_falha)
+
+    relatorio["linhas_validas"] = len(df_validas)
+    relatorio["linhas_quarentena"] = len(df_quarentena)
+
+    # Variação em relação à carga anterior
+    relatorio["linhas_anteriores"] = linhas_anteriores
+    if linhas_anteriores:
+        variacao = (len(df_validas) - linhas_anteriores) / linhas_anteriores
+        relatorio["variacao_linhas"] = round(variacao, 4)
+        if variacao < -LIMITE_QUEDA_LINHAS:
+            mensagem = (
+                f"Queda de {abs(variacao):.0%} no número de despesas ({linhas_anteriores} -> {len(df_validas)}); "
+                f"limite configurado em {LIMITE_QUEDA_LINHAS:.0%} (ETL_LIMITE_QUEDA_LINHAS). Carga interrompida."
+            )
+            logging.error(mensagem)
+            raise ValueError(mensagem)
+
+    return df_validas, df_quarentena, relatorio
+
+def validar_detalhes(df_deputado, df_ultimo_status, df_ultimo_gabinete):
+    """Remove deputados sem id ou repetidos (mantendo o último) e aponta quem está sem status ou gabinete."""
+    relatorio = {"linhas": len(df_deputado), "erros": {}, "avisos": {}}
+
+    validos = df_deputado["id"].notna()
+    relatorio["erros"]["nulo:id"] = int((~validos).sum())
+    repetidos = df_deputado["id"].duplicated(keep="last") & validos
+    relatorio["erros"]["id_duplicado"] = int(repetidos.sum())
+    manter = validos & ~repetidos
+
+    # As três tabelas são montadas na mesma ordem, uma linha por deputado
+    df_deputado = df_deputado[manter]
+    df_ultimo_status = df_ultimo_status[manter.to_numpy()]
+    df_ultimo_gabinete = df_ultimo_gabinete[manter.to_numpy()]
+
+    colunas_gabinete = [coluna for coluna in df_ultimo_gabinete.columns if coluna != "id_deputado"]
+    relatorio["avisos"]["sem_ultimo_status"] = int(df_ultimo_status["situacao"].isna().sum())
+    relatorio["avisos"]["sem_gabinete"] = int(df_ultimo_gabinete[colunas_gabinete].isna().all(axis=1).sum())
+    relatorio["linhas_validas"] = len(df_deputado)
+
+    return df_deputado, df_ultimo_status, df_ultimo_gabinete, relatorio
+
+def salvar_relatorio_validacao(pasta):
+    """Grava o resultado das validações da execução em validacao.json na pasta de logs."""
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, "validacao.json")
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorios, arquivo, indent=2, ensure_ascii=False, default=str)
+
+    for entidade, relatorio in relatorios.items():
+        erros = {nome: total for nome, total in relatorio["erros"].items() if total}
+        avisos = {nome: total for nome, total in relatorio["avisos"].items() if total}
+        if erros:
+            logging.warning(f"Validação de {entidade}: linhas em quarentena/removidas {erros}")
+        if avisos:
+            logging.info(f"Validação de {entidade}: avisos {avisos}")
+    return caminho
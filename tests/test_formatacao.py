@@ -0,0 +1,36 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Os módulos do dashboard são importados pelo nome, como nas páginas
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dashboard"))
+
+from formatacao import formatar_moeda, formatar_moeda_vetor
+
+# Meio centavo, zero negativo, infinitos, nulos e valores grandes demais para centavos inteiros
+VALORES_LIMITE = [0.015, 0.005, 0.125, 2.675, -999.995, -0.0, 0.0, -0.004, float("inf"), -float("inf"),
+                  float("nan"), 1234567.891, 999999.999, 1e15, 1e17, 1e300, 5e-324]
+
+def test_valores_limite_iguais_a_formatar_moeda():
+    assert list(formatar_moeda_vetor(np.array(VALORES_LIMITE))) == [formatar_moeda(valor) for valor in VALORES_LIMITE]
+
+def test_valores_aleatorios_iguais_a_formatar_moeda():
+    rng = np.random.default_rng(0)
+    valores = np.concatenate([
+        rng.normal(0, 1e4, 20000).round(3),
+        rng.integers(-10 ** 9, 10 ** 9, 20000) / 200,
+        rng.integers(-10 ** 7, 10 ** 7, 20000) / 1000,
+    ])
+    assert list(formatar_moeda_vetor(valores)) == [formatar_moeda(valor) for valor in valores]
+
+def test_series_mantem_indice_e_nome():
+    serie = pd.Series([1.5, -2.25], index=[10, 20], name="valorDocumento")
+    resultado = formatar_moeda_vetor(serie)
+    assert resultado.index.tolist() == [10, 20]
+    assert resultado.name == "valorDocumento"
+    assert resultado.tolist() == ["R$ 1,50", "R$ -2,25"]
+
+def test_vazio():
+    assert len(formatar_moeda_vetor(pd.Series([], dtype="float64"))) == 0
@@ -0,0 +1,33 @@
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl import landing
+from etl.extracao import particao_ano, reler_despesas
+
+def _gravar(ano, despesas, meses=None):
+    with landing.GravadorLanding("despesas", particao_ano(ano, meses)) as gravador:
+        gravador.gravar("url", {}, json.dumps({"dados": despesas}).encode(), id_deputado=10)
+
+def _despesa(mes, valor):
+    return {"ano": 2024, "mes": mes, "codDocumento": mes, "valorDocumento": valor, "nomeFornecedor": "A"}
+
+def test_reprocessamento_aplica_cargas_de_meses_recentes(tmp_path, monkeypatch):
+    monkeypatch.setattr(landing, "PASTA_LANDING", str(tmp_path))
+    # Carga parcial anterior à carga do ano inteiro: já contida nela
+    _gravar(2024, [_despesa(2, 1.0)], meses=[2])
+    _gravar(2024, [_despesa(1, 10.0), _despesa(2, 20.0), _despesa(3, 30.0)])
+    _gravar(2024, [_despesa(2, 25.0), _despesa(3, 35.0)], meses=[2, 3])
+    _gravar(2024, [_despesa(3, 36.0)], meses=[3])
+
+    df_gastos = reler_despesas(2024).sort_values("mes")
+    assert df_gastos["mes"].tolist() == [1, 2, 3]
+    assert df_gastos["valorDocumento"].tolist() == [10.0, 25.0, 36.0]
+    assert df_gastos["id_deputado"].tolist() == [10, 10, 10]
+
+def test_reprocessamento_sem_cargas_de_meses(tmp_path, monkeypatch):
+    monkeypatch.setattr(landing, "PASTA_LANDING", str(tmp_path))
+    _gravar(2024, [_despesa(1, 10.0)])
+    assert reler_despesas(2024)["valorDocumento"].tolist() == [10.0]
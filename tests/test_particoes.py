@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pandas as pd
+from sqlalchemy import create_engine, inspect
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.carga import ler_despesas_carregadas
+from etl.particoes import TABELA_DESPESAS, salvar_despesas_ano, recriar_view_despesas, substituir_ano
+from etl.transformacao import montar_despesas, transformar_despesas
+
+def _despesa(ano):
+    return {"ano": ano, "mes": 3, "tipoDespesa": "COMBUSTÍVEIS E LUBRIFICANTES.", "codDocumento": 1,
+            "dataDocumento": f"{ano}-03-10", "valorDocumento": 150.0, "nomeFornecedor": "POSTO A",
+            "cnpjCpfFornecedor": "12.345.678/0001-90", "id_deputado": 10}
+
+def test_ano_sem_despesas_mantem_id_fornecedor_na_view(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'despesas.db'}")
+    df_gastos, _, _ = transformar_despesas(montar_despesas([_despesa(2022)]))
+    salvar_despesas_ano(df_gastos, engine, 2022, "despesas")
+
+    # Ano mais recente sem nenhuma despesa extraída
+    df_vazio, df_fornecedores, _ = transformar_despesas(montar_despesas([]))
+    assert "id_fornecedor" in df_vazio.columns and "nomeFornecedor" not in df_vazio.columns
+    assert len(df_fornecedores) == 0
+    salvar_despesas_ano(df_vazio, engine, 2023, "despesas")
+
+    colunas = {coluna["name"] for coluna in inspect(engine).get_columns(TABELA_DESPESAS)}
+    assert "id_fornecedor" in colunas
+    df_carregadas = ler_despesas_carregadas(engine, "anomalias")
+    assert df_carregadas["id_fornecedor"].tolist() == [1]
+
+def test_view_une_colunas_de_todos_os_anos(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'despesas.db'}")
+    df_gastos, _, _ = transformar_despesas(montar_despesas([_despesa(2022)]))
+    salvar_despesas_ano(df_gastos, engine, 2022, "despesas")
+    # Ano gravado com o formato bruto da extração (sem id_fornecedor), como em versões anteriores
+    montar_despesas([_despesa(2023)]).to_sql(name="deputados_despesas_2023", con=engine, index=False)
+    recriar_view_despesas(engine)
+
+    df_view = pd.read_sql(f"SELECT ano, id_fornecedor FROM {TABELA_DESPESAS} ORDER BY ano", engine)
+    assert df_view["ano"].tolist() == [2022, 2023]
+    assert df_view["id_fornecedor"].iloc[0] == 1 and pd.isna(df_view["id_fornecedor"].iloc[1])
+
+def test_quarentena_substitui_so_o_ano_carregado(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'despesas.db'}")
+    for ano in (2022, 2023):
+        df_quarentena = montar_despesas([_despesa(ano)]).assign(motivo="documento_duplicado", ano_carga=ano)
+        substituir_ano(df_quarentena, "quarentena_despesas", engine, ano, "despesas", coluna="ano_carga")
+    # Recarga de 2023 sem linhas reprovadas mantém a quarentena de 2022
+    substituir_ano(montar_despesas([]).assign(motivo=None, ano_carga=2023), "quarentena_despesas", engine, 2023,
+                   "despesas", coluna="ano_carga")
+
+    assert pd.read_sql("SELECT ano_carga FROM quarentena_despesas", engine)["ano_carga"].tolist() == [2022]